@@ -7,13 +7,13 @@ from urllib.parse import urlencode
 
 from app.models.user import UserRegister, UserLogin, TokenResponse, UserResponse, TokenData
 from app.utils.security import (
-    hash_password, 
-    verify_password, 
     create_access_token, 
     create_refresh_token,
     get_current_user
 )
 from app.core.database import db
+from app.core.outbound_metrics import outbound_timer
+from app.services.password_hasher import password_hasher
 from app.config import settings
 
 router = APIRouter(prefix="/api", tags=["Authentication"])
@@ -79,7 +79,7 @@ async def register(user_data: UserRegister, invitation_token: Optional[str] = Qu
             
             elif status == 'user_deactivated':
                 # 用戶自主停用的，允許重新啟用（保留舊帳號，不刪除）
-                hashed_pw = hash_password(user_data.password)
+                hashed_pw = await password_hasher.hash(user_data.password)
                 
                 await conn.execute("""
                     UPDATE users 
@@ -154,7 +154,7 @@ async def register(user_data: UserRegister, invitation_token: Optional[str] = Qu
                 invitation_id = invitation["id"]
         
         # 加密密碼
-        hashed_pw = hash_password(user_data.password)
+        hashed_pw = await password_hasher.hash(user_data.password)
         
         # 創建用戶（如果有邀請，使用邀請的角色）
         user = await conn.fetchrow("""
@@ -223,8 +223,11 @@ async def login(credentials: UserLogin):
                 detail="Email 或密碼錯誤"
             )
         
-        # 驗證密碼
-        if not verify_password(credentials.password, user["hashed_password"]):
+        # 驗證密碼（cost factor 調整過時順便產生新 hash）
+        password_ok, new_hash = await password_hasher.verify_and_update(
+            credentials.password, user["hashed_password"]
+        )
+        if not password_ok:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Email 或密碼錯誤"
@@ -237,11 +240,17 @@ async def login(credentials: UserLogin):
                 detail="帳號已被停用"
             )
         
-        # 更新最後登入時間
-        await conn.execute(
-            "UPDATE users SET last_login_at = NOW() WHERE id = $1",
-            user["id"]
-        )
+        # 更新最後登入時間（以及 rehash 後的密碼）
+        if new_hash:
+            await conn.execute(
+                "UPDATE users SET last_login_at = NOW(), hashed_password = $2 WHERE id = $1",
+                user["id"], new_hash
+            )
+        else:
+            await conn.execute(
+                "UPDATE users SET last_login_at = NOW() WHERE id = $1",
+                user["id"]
+            )
         
         # 生成 tokens
         token_data = {
@@ -332,16 +341,18 @@ async def google_callback(code: str):
     
     async with httpx.AsyncClient() as client:
         # Step 1: 用 code 換取 access token
-        token_response = await client.post(
-            "https://oauth2.googleapis.com/token",
-            data={
-                "code": code,
-                "client_id": GOOGLE_CLIENT_ID,
-                "client_secret": GOOGLE_CLIENT_SECRET,
-                "redirect_uri": GOOGLE_REDIRECT_URI,
-                "grant_type": "authorization_code"
-            }
-        )
+        with outbound_timer("google_oauth", "token") as timer:
+            token_response = await client.post(
+                "https://oauth2.googleapis.com/token",
+                data={
+                    "code": code,
+                    "client_id": GOOGLE_CLIENT_ID,
+                    "client_secret": GOOGLE_CLIENT_SECRET,
+                    "redirect_uri": GOOGLE_REDIRECT_URI,
+                    "grant_type": "authorization_code"
+                }
+            )
+            timer.outcome = token_response.status_code
         
         if token_response.status_code != 200:
             raise HTTPException(
@@ -353,10 +364,12 @@ async def google_callback(code: str):
         access_token_google = tokens.get("access_token")
         
         # Step 2: 用 access token 獲取用戶資料
-        user_info_response = await client.get(
-            "https://www.googleapis.com/oauth2/v2/userinfo",
-            headers={"Authorization": f"Bearer {access_token_google}"}
-        )
+        with outbound_timer("google_oauth", "userinfo") as timer:
+            user_info_response = await client.get(
+                "https://www.googleapis.com/oauth2/v2/userinfo",
+                headers={"Authorization": f"Bearer {access_token_google}"}
+            )
+            timer.outcome = user_info_response.status_code
         
         if user_info_response.status_code != 200:
             raise HTTPException(
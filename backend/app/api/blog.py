@@ -1,22 +1,61 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import List, Optional
 import math
 
 from ..core.database import db
+from ..core.http_cache import http_date, is_not_modified, watermark_etag
 from ..models.blog import BlogPost, BlogPostList
+from ..services.blog_search import SEARCH_CONFIG
+from ..services.image_variants import image_variants, build_srcset
+from ..utils.pagination import (
+    TOTAL_MODE_PATTERN, count_total, decode_cursor, encode_cursor, keyset_condition,
+    resolve_total_mode
+)
 
 router = APIRouter(prefix="/blog")
 
+# 列表 / 單篇回應的資料水位：文章（新增 / 刪除 / updated_at）+ 封面縮圖（背景產生後 srcset 會改變）
+VARIANTS_WATERMARK = "(SELECT COUNT(*) FROM media_variants), (SELECT MAX(created_at) FROM media_variants)"
+LIST_WATERMARK_SQL = f"SELECT COUNT(*), MAX(updated_at), {VARIANTS_WATERMARK} FROM blog_posts"
+POST_WATERMARK_SQL = f"SELECT updated_at, {VARIANTS_WATERMARK} FROM blog_posts WHERE slug = $1"
+
+BLOG_CURSOR_KIND = "blog"
+
 
 @router.get("/posts", response_model=BlogPostList)
 async def get_blog_posts(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
     category: Optional[str] = None,
     status: str = Query("published", pattern="^(draft|published|archived|all)$"),
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    pagination: str = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: Optional[str] = None,
+    total_mode: Optional[str] = Query(None, pattern=TOTAL_MODE_PATTERN)
 ):
-    """取得 Blog 文章列表（分頁）"""
+    """
+    取得 Blog 文章列表（分頁）
+    
+    有 search 時使用全文搜尋（blog_search_index），依相關度排序並回傳 highlight 片段
+    
+    分頁模式：
+    - offset（預設）：page / page_size
+    - cursor：依 (published_at, id) 的 keyset 分頁，帶上一頁回傳的 next_cursor 取下一頁
+      （infinite scroll 用，成本與翻到第幾頁無關；不支援與 search 併用）
+    
+    total_mode：exact = COUNT(*)、estimated = 查詢計畫估計值、none = 不計算總數
+    （未指定時 offset 為 exact、cursor 為 none）
+    
+    ETag 由資料水位 + 查詢參數產生，If-None-Match 相符時不查詢文章直接回 304
+    """
+    cursor_mode = pagination == "cursor" or cursor is not None
+    total_mode = resolve_total_mode(total_mode, cursor_mode)
+    search = search.strip() if search else None
+    
+    if cursor_mode and search:
+        raise HTTPException(status_code=400, detail="Cursor pagination is not supported with search")
     
     # 計算 offset
     offset = (page - 1) * page_size
@@ -27,66 +66,188 @@ async def get_blog_posts(
     param_count = 1
     
     if status != "all":
-        conditions.append(f"status = ${param_count}")
+        conditions.append(f"p.status = ${param_count}")
         params.append(status)
         param_count += 1
     
     if category:
-        conditions.append(f"category = ${param_count}")
+        conditions.append(f"p.category = ${param_count}")
         params.append(category)
         param_count += 1
     
     if search:
-        conditions.append(f"(title ILIKE ${param_count} OR content ILIKE ${param_count})")
-        params.append(f"%{search}%")
+        # websearch_to_tsquery 支援 "quoted phrase"、OR、-exclude 等語法，且不會因語法錯誤報錯
+        search_from = f"""
+            JOIN blog_search_index s ON s.post_id = p.id
+            CROSS JOIN websearch_to_tsquery('{SEARCH_CONFIG}', ${param_count}) AS q
+        """
+        conditions.append("s.document @@ q")
+        params.append(search)
         param_count += 1
+    else:
+        search_from = ""
     
     where_clause = " AND ".join(conditions) if conditions else "TRUE"
     
     async with db.pool.acquire() as conn:
+        # 資料水位未變 → 直接回 304（不查詢、不序列化）
+        etag = watermark_etag(tuple(await conn.fetchrow(LIST_WATERMARK_SQL)), request.url.query)
+        if is_not_modified(request.headers, etag, None):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        
         # 取得總數
-        total = await conn.fetchval(
-            f"SELECT COUNT(*) FROM blog_posts WHERE {where_clause}",
-            *params
+        total = await count_total(
+            conn,
+            f"FROM blog_posts p {search_from} WHERE {where_clause}",
+            params,
+            total_mode
         )
         
         # 取得文章
-        rows = await conn.fetch(
-            f"""
-            SELECT * FROM blog_posts 
-            WHERE {where_clause}
-            ORDER BY published_at DESC NULLS LAST, created_at DESC
-            LIMIT ${param_count} OFFSET ${param_count + 1}
-            """,
-            *params, page_size, offset
-        )
+        if cursor_mode:
+            return await _get_blog_posts_by_cursor(
+                conn, where_clause, params, param_count, page_size, cursor, total, total_mode
+            )
+        
+        if search:
+            # 先排序分頁，再只對該頁文章產生 highlight（ts_headline 成本高）
+            rows = await conn.fetch(
+                f"""
+                SELECT ranked.*,
+                       ts_headline(
+                           '{SEARCH_CONFIG}',
+                           regexp_replace(coalesce(ranked.content, ''), '<[^>]+>', ' ', 'g'),
+                           websearch_to_tsquery('{SEARCH_CONFIG}', ${param_count - 1}),
+                           'StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2'
+                       ) AS search_headline
+                FROM (
+                    SELECT p.*, ts_rank_cd(s.document, q) AS search_rank
+                    FROM blog_posts p {search_from}
+                    WHERE {where_clause}
+                    ORDER BY search_rank DESC, p.published_at DESC NULLS LAST, p.id DESC
+                    LIMIT ${param_count} OFFSET ${param_count + 1}
+                ) AS ranked
+                ORDER BY ranked.search_rank DESC, ranked.published_at DESC NULLS LAST, ranked.id DESC
+                """,
+                *params, page_size, offset
+            )
+        else:
+            rows = await conn.fetch(
+                f"""
+                SELECT p.* FROM blog_posts p
+                WHERE {where_clause}
+                ORDER BY p.published_at DESC NULLS LAST, p.created_at DESC
+                LIMIT ${param_count} OFFSET ${param_count + 1}
+                """,
+                *params, page_size, offset
+            )
+        
+        posts = await _with_image_srcset(conn, rows)
     
-    posts = [dict(row) for row in rows]
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
+    total_pages = math.ceil(total / page_size) if total is not None else None
     
     return {
         "posts": posts,
         "total": total,
         "page": page,
         "page_size": page_size,
-        "total_pages": total_pages
+        "total_pages": total_pages,
+        "total_estimated": total_mode == "estimated"
+    }
+
+
+async def _get_blog_posts_by_cursor(
+    conn,
+    where_clause: str,
+    params: list,
+    param_count: int,
+    page_size: int,
+    cursor: Optional[str],
+    total: Optional[int],
+    total_mode: str
+):
+    """Keyset 分頁：ORDER BY published_at DESC NULLS LAST, id DESC"""
+    params = list(params)
+    
+    if cursor:
+        published_at, last_id = decode_cursor(cursor, BLOG_CURSOR_KIND)
+        condition, cursor_params = keyset_condition(
+            "p.published_at", "p.id", published_at, last_id, param_count
+        )
+        where_clause = f"{where_clause} AND {condition}"
+        params.extend(cursor_params)
+        param_count += len(cursor_params)
+    
+    # 多取一筆判斷是否還有下一頁
+    rows = await conn.fetch(
+        f"""
+        SELECT p.* FROM blog_posts p
+        WHERE {where_clause}
+        ORDER BY p.published_at DESC NULLS LAST, p.id DESC
+        LIMIT ${param_count}
+        """,
+        *params, page_size + 1
+    )
+    
+    posts = await _with_image_srcset(conn, rows[:page_size])
+    next_cursor = None
+    if len(rows) > page_size:
+        last = posts[-1]
+        next_cursor = encode_cursor(BLOG_CURSOR_KIND, last['published_at'], last['id'])
+    
+    return {
+        "posts": posts,
+        "total": total,
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+        "total_estimated": total_mode == "estimated"
     }
 
 
 @router.get("/posts/{slug}", response_model=BlogPost)
-async def get_blog_post(slug: str):
-    """取得單篇 Blog 文章（通過 slug）"""
+async def get_blog_post(slug: str, request: Request, response: Response):
+    """
+    取得單篇 Blog 文章（通過 slug）- 以 updated_at 作為 Last-Modified
+    
+    先只查 updated_at 等資料水位，條件式請求相符時不讀取整篇內容直接回 304
+    """
     
     async with db.pool.acquire() as conn:
+        watermark = await conn.fetchrow(POST_WATERMARK_SQL, slug)
+        if watermark:
+            etag = watermark_etag(slug, tuple(watermark))
+            last_modified = http_date(watermark['updated_at']) if watermark['updated_at'] else None
+            if is_not_modified(request.headers, etag, last_modified):
+                headers = {"ETag": etag}
+                if last_modified:
+                    headers["Last-Modified"] = last_modified
+                return Response(status_code=304, headers=headers)
+            response.headers["ETag"] = etag
+        
         row = await conn.fetchrow(
             "SELECT * FROM blog_posts WHERE slug = $1",
             slug
         )
+        
+        if not row:
+            raise HTTPException(status_code=404, detail="Blog post not found")
+        
+        post = (await _with_image_srcset(conn, [row]))[0]
     
-    if not row:
-        raise HTTPException(status_code=404, detail="Blog post not found")
+    if row['updated_at']:
+        response.headers["Last-Modified"] = http_date(row['updated_at'])
     
-    return dict(row)
+    return post
+
+
+async def _with_image_srcset(conn, rows) -> List[dict]:
+    """附上封面圖的 responsive srcset（整頁一次查詢）"""
+    posts = [dict(row) for row in rows]
+    variants = await image_variants.variants_for_urls(conn, [post.get('image_url') for post in posts])
+    for post in posts:
+        post['image_srcset'] = build_srcset(variants.get(post.get('image_url'), []))
+    return posts
 
 
 @router.get("/categories")
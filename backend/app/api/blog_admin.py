@@ -1,7 +1,7 @@
-from fastapi import APIRouter, HTTPException, Header, Depends
+from fastapi import APIRouter, HTTPException, Header, Depends, Query, Response
+from typing import List, Optional
 from slugify import slugify
 from datetime import datetime
-import httpx
 import re
 import logging
 
@@ -9,11 +9,30 @@ from ..core.database import db
 from ..models.blog import BlogPostCreate, BlogPostUpdate, BlogPost, NotionBlogSync
 from ..config import settings
 from ..services.r2_storage import r2_storage
+from ..services.blog_search import backfill_search_index
+from ..services.notion_images import NotionImage, ingest_images
+from ..services.notion_blocks import NotionBlockFetcher, block_hash, page_hash
+from ..services.notion_gateway import notion_gateway, NotionAPIError, parse_notion_time
+from ..services.notion_sync_queue import notion_sync_queue
+from ..services.notion_backfill import notion_backfill, DEFAULT_STATUSES
+from ..services.image_variants import image_variants
 from ..utils.security import require_admin
+from ..utils.pagination import (
+    TOTAL_MODE_PATTERN, count_total, decode_cursor, encode_cursor, keyset_condition,
+    resolve_total_mode
+)
 
 router = APIRouter(prefix="/blog")
 logger = logging.getLogger(__name__)
 
+ADMIN_BLOG_CURSOR_KIND = "admin_blog"
+
+# 同步完成後的 Notion Status
+NOTION_DONE_STATUSES = ("Published", "Updated")
+
+# 後端自己寫回 Notion 的 properties（不列入頁面內容 hash）
+NOTION_WRITTEN_PROPERTIES = ("Status", "Article URL")
+
 
 @router.get("/posts")
 async def list_admin_blog_posts(
@@ -21,10 +40,21 @@ async def list_admin_blog_posts(
     page_size: int = 50,
     status: str = "all",
     search: str = "",
+    pagination: str = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: Optional[str] = None,
+    total_mode: Optional[str] = Query(None, pattern=TOTAL_MODE_PATTERN),
     current_user=Depends(require_admin)
 ):
-    """取得所有 Blog 文章列表（Admin 專用，支援全部狀態）"""
+    """
+    取得所有 Blog 文章列表（Admin 專用，支援全部狀態）
+    
+    pagination=cursor（或帶 cursor）時改用 (updated_at, id) keyset 分頁，
+    依 updated_at DESC 排序（不依狀態分組），回傳 next_cursor
+    total_mode 未指定時 offset 為 exact、cursor 為 none（每頁不重跑 COUNT(*)）
+    """
     offset = (page - 1) * page_size
+    cursor_mode = pagination == "cursor" or cursor is not None
+    total_mode = resolve_total_mode(total_mode, cursor_mode)
 
     conditions = []
     params: list = []
@@ -41,33 +71,72 @@ async def list_admin_blog_posts(
         param_count += 1
 
     where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    columns = """
+        id, title, slug, category, author, status,
+        read_time, image_url, published_at, created_at, updated_at,
+        notion_page_id, sync_source
+    """
 
     async with db.pool.acquire() as conn:
-        total = await conn.fetchval(
-            f"SELECT COUNT(*) FROM blog_posts {where_clause}",
-            *params
-        )
-        rows = await conn.fetch(
-            f"""
-            SELECT id, title, slug, category, author, status,
-                   read_time, image_url, published_at, created_at, updated_at,
-                   notion_page_id, sync_source
-            FROM blog_posts
-            {where_clause}
-            ORDER BY
-                CASE status WHEN 'published' THEN 1 WHEN 'draft' THEN 2 ELSE 3 END,
-                updated_at DESC
-            LIMIT ${param_count} OFFSET ${param_count + 1}
-            """,
-            *params, page_size, offset
-        )
+        total = await count_total(conn, f"FROM blog_posts {where_clause}", params, total_mode)
+
+        if cursor_mode:
+            if cursor:
+                updated_at, last_id = decode_cursor(cursor, ADMIN_BLOG_CURSOR_KIND)
+                condition, cursor_params = keyset_condition(
+                    "updated_at", "id", updated_at, last_id, param_count
+                )
+                conditions.append(condition)
+                params.extend(cursor_params)
+                param_count += len(cursor_params)
+                where_clause = f"WHERE {' AND '.join(conditions)}"
+
+            # 多取一筆判斷是否還有下一頁
+            rows = await conn.fetch(
+                f"""
+                SELECT {columns}
+                FROM blog_posts
+                {where_clause}
+                ORDER BY updated_at DESC NULLS LAST, id DESC
+                LIMIT ${param_count}
+                """,
+                *params, page_size + 1
+            )
+        else:
+            rows = await conn.fetch(
+                f"""
+                SELECT {columns}
+                FROM blog_posts
+                {where_clause}
+                ORDER BY
+                    CASE status WHEN 'published' THEN 1 WHEN 'draft' THEN 2 ELSE 3 END,
+                    updated_at DESC
+                LIMIT ${param_count} OFFSET ${param_count + 1}
+                """,
+                *params, page_size, offset
+            )
+
+    if cursor_mode:
+        posts = [dict(r) for r in rows[:page_size]]
+        next_cursor = None
+        if len(rows) > page_size:
+            next_cursor = encode_cursor(ADMIN_BLOG_CURSOR_KIND, posts[-1]['updated_at'], posts[-1]['id'])
+
+        return {
+            "posts": posts,
+            "total": total,
+            "page_size": page_size,
+            "next_cursor": next_cursor,
+            "total_estimated": total_mode == "estimated",
+        }
 
     return {
         "posts": [dict(r) for r in rows],
         "total": total,
         "page": page,
         "page_size": page_size,
-        "total_pages": max(1, (total + page_size - 1) // page_size),
+        "total_pages": max(1, (total + page_size - 1) // page_size) if total is not None else None,
+        "total_estimated": total_mode == "estimated",
     }
 
 
@@ -130,6 +199,7 @@ async def create_blog_post(post: BlogPostCreate, current_user=Depends(require_ad
             datetime.now() if post.status == "published" else None
         )
     
+    await db.notify_content_change("blog_posts")
     return dict(row)
 
 
@@ -182,6 +252,7 @@ async def update_blog_post(post_id: int, post: BlogPostUpdate, current_user=Depe
     if not row:
         raise HTTPException(status_code=404, detail="Blog post not found")
     
+    await db.notify_content_change("blog_posts")
     result = dict(row)
     
     # 如果狀態有變更且文章來自 Notion，同步更新 Notion 狀態
@@ -233,10 +304,32 @@ async def delete_blog_post(post_id: int, current_user=Depends(require_admin)):
             "DELETE FROM blog_posts WHERE id = $1",
             post_id
         )
+        await db.notify_content_change("blog_posts", conn=conn)
     
     return None
 
 
+@router.post("/search/reindex")
+async def reindex_blog_search(rebuild: bool = False, current_user=Depends(require_admin)):
+    """
+    補建 / 重建 Blog 全文搜尋索引
+    
+    - rebuild=false：只補建缺少索引的文章（新增/修改文章時 trigger 會自動維護）
+    - rebuild=true：重建所有文章（調整搜尋權重或語言設定後使用）
+    """
+    async with db.pool.acquire() as conn:
+        processed = await backfill_search_index(conn, rebuild=rebuild)
+    
+    # 搜尋結果快取需一併失效
+    await db.notify_content_change("blog_posts")
+    
+    return {
+        "success": True,
+        "processed": processed,
+        "rebuild": rebuild
+    }
+
+
 @router.post("/posts/{post_id}/export-to-notion")
 async def export_post_to_notion(post_id: int, current_user=Depends(require_admin)):
     """
@@ -339,24 +432,14 @@ async def export_post_to_notion(post_id: int, current_user=Depends(require_admin
             }
         
         # 呼叫 Notion API 建立 page
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.post(
-                "https://api.notion.com/v1/pages",
-                headers={
-                    "Authorization": f"Bearer {settings.NOTION_API_KEY}",
-                    "Notion-Version": "2022-06-28",
-                    "Content-Type": "application/json"
-                },
-                json=page_data
-            )
-        
-        if response.status_code != 200:
+        try:
+            notion_page = await notion_gateway.create_page(page_data)
+        except NotionAPIError as notion_err:
             raise HTTPException(
                 status_code=500,
-                detail=f"Notion 建立 page 失敗: {response.text}"
+                detail=f"Notion 建立 page 失敗: {notion_err.message}"
             )
         
-        notion_page = response.json()
         notion_page_id = notion_page["id"]
         notion_url = notion_page.get("url", "")
         
@@ -373,6 +456,7 @@ async def export_post_to_notion(post_id: int, current_user=Depends(require_admin
                 notion_page_id,
                 post_id
             )
+            await db.notify_content_change("blog_posts", conn=conn)
         
         logger.info(f"✅ 文章 {post_id} 已匯出到 Notion: {notion_page_id}")
         
@@ -391,9 +475,11 @@ async def export_post_to_notion(post_id: int, current_user=Depends(require_admin
         raise HTTPException(status_code=500, detail=f"匯出失敗: {str(e)}")
 
 
-@router.post("/sync-from-notion")
+@router.post("/sync-from-notion", status_code=202)
 async def sync_from_notion(
     payload: NotionBlogSync,
+    response: Response,
+    wait: bool = False,
     x_notion_webhook_secret: str = Header(None, alias="X-Notion-Webhook-Secret")
 ):
     """
@@ -403,7 +489,11 @@ async def sync_from_notion(
     Processing Status 和 Update database page 節點均可從 N8N 移除，
     由後端統一處理，避免 N8N 提前改寫 Notion status 導致後端讀不到原始狀態。
 
-    回傳欄位：
+    同步在背景 job queue 執行，本端點立即回傳 202 + job（用 GET /sync-jobs/{job_id} 查詢結果）。
+    頁面已有尚未開始的 job 時併入該 job（deduplicated=true）；頁面正在同步時排入新 job，
+    在目前的同步完成後執行（同步期間的編輯不會遺失）。
+
+    wait=true：等待同步完成（最多 NOTION_SYNC_WAIT_TIMEOUT 秒），完成時回傳 200 + 同步結果：
       _sync_action: "created" | "updated" | "archived"
       article_url:  文章完整 URL
       notion_page_id: 頁面 ID
@@ -414,281 +504,334 @@ async def sync_from_notion(
     if x_notion_webhook_secret != settings.NOTION_WEBHOOK_SECRET:
         raise HTTPException(status_code=403, detail="Invalid webhook secret")
 
-    try:
-        from notion_client import Client
+    job, created = await notion_sync_queue.enqueue(payload.notion_page_id, payload.last_edited_time)
 
-        notion = Client(auth=settings.NOTION_API_KEY)
-        frontend_url = settings.FRONTEND_URL.rstrip('/')
+    if wait:
+        job = await notion_sync_queue.wait_for(job['id'], timeout=settings.NOTION_SYNC_WAIT_TIMEOUT)
+        if job['status'] == 'succeeded':
+            response.status_code = 200
+            return job['result']
+        if job['status'] == 'failed':
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to sync from Notion: {job['last_error']}"
+            )
 
-        # 2. 讀取 Notion 頁面（此時 N8N 尚未改寫任何狀態，讀到的是真實觸發狀態）
-        page = notion.pages.retrieve(page_id=payload.notion_page_id)
-        props = page['properties']
-        notion_status = props.get('Status', {}).get('select', {}).get('name', '')
+    return {
+        "job_id": job['id'],
+        "status": job['status'],
+        "notion_page_id": job['notion_page_id'],
+        "deduplicated": not created,
+    }
 
-        # 3. 立即把 Notion 狀態改為 Processing...（讓使用者知道後端已接收並正在處理）
-        await _sync_status_to_notion(payload.notion_page_id, "Processing...")
 
-        # ── 分支一：Archive ──────────────────────────────────────────
-        if notion_status == 'Archive':
-            async with db.pool.acquire() as conn:
-                existing = await conn.fetchrow(
-                    "SELECT id, slug, title FROM blog_posts WHERE notion_page_id = $1",
-                    payload.notion_page_id
-                )
-                if not existing:
-                    # 找不到對應文章：可能已從網站刪除但 Notion 未更新
-                    # 直接把 Notion 標為 Archived 完成流程，不卡在 Processing...
-                    await _sync_status_to_notion(payload.notion_page_id, "Archived")
-                    return {
-                        "notion_page_id": payload.notion_page_id,
-                        "_sync_action": "archived",
-                        "note": "DB 中無對應文章，Notion 已直接設為 Archived",
-                    }
-                await conn.execute(
-                    "UPDATE blog_posts SET status = 'archived', updated_at = NOW() WHERE id = $1",
-                    existing['id']
-                )
+@router.get("/sync-jobs/{job_id}")
+async def get_notion_sync_job(
+    job_id: int,
+    x_notion_webhook_secret: str = Header(None, alias="X-Notion-Webhook-Secret")
+):
+    """查詢 Notion 同步 job 狀態（N8N 使用 webhook secret）"""
+    if x_notion_webhook_secret != settings.NOTION_WEBHOOK_SECRET:
+        raise HTTPException(status_code=403, detail="Invalid webhook secret")
 
-            # 後端自行更新 Notion 狀態為 Archived + 清空 Article URL
-            await _sync_status_to_notion(payload.notion_page_id, "Archived")
+    job = await notion_sync_queue.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return job
 
-            return {
-                "id": existing['id'],
-                "slug": existing['slug'],
-                "title": existing['title'],
-                "notion_page_id": payload.notion_page_id,
-                "_sync_action": "archived",
-                "article_url": f"{frontend_url}/blog/{existing['slug']}",
-            }
 
-        # ── 分支二：Publish / Update（同步完整內容）────────────────────
+@router.get("/sync-jobs")
+async def list_notion_sync_jobs(
+    status: Optional[str] = Query(None, pattern="^(queued|running|succeeded|failed)$"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user=Depends(require_admin)
+):
+    """最近的 Notion 同步 jobs（Admin 專用）"""
+    return {"jobs": await notion_sync_queue.list_jobs(status=status, limit=limit)}
+
+
+@router.post("/notion-backfill", status_code=202)
+async def start_notion_backfill(
+    dry_run: bool = False,
+    statuses: str = Query(",".join(DEFAULT_STATUSES), description="逗號分隔的 Notion Status（Published / Updated）"),
+    current_user=Depends(require_admin)
+):
+    """
+    批次回填 Notion 資料庫（Admin 專用）
+    
+    比對 Notion 與 blog_posts 的 last_edited_time，只同步新增或有變更的頁面；
+    頁面排入 Notion 同步 queue（與 webhook 共用 worker），在背景執行，用 GET /notion-backfill 查詢進度。
+    同步會發布頁面，因此只能回填已上線的 Status。
+    """
+    if not settings.NOTION_DATABASE_ID:
+        raise HTTPException(status_code=400, detail="NOTION_DATABASE_ID is not configured")
+    
+    try:
+        progress = notion_backfill.start(
+            statuses=[s.strip() for s in statuses.split(",") if s.strip()],
+            dry_run=dry_run
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError:
+        raise HTTPException(status_code=409, detail="Notion backfill is already running")
+    
+    return progress.to_dict()
+
 
-        # 提取頁面欄位
-        title = props.get('Title', {}).get('title', [{}])[0].get('plain_text', 'Untitled')
-        pillar = props.get('Pillar', {}).get('select', {}).get('name', 'Industry News')
+@router.get("/notion-backfill")
+async def get_notion_backfill_progress(current_user=Depends(require_admin)):
+    """Notion 回填進度（Admin 專用）"""
+    if notion_backfill.progress is None:
+        return {"state": "idle"}
+    return notion_backfill.progress.to_dict()
 
-        meta_desc_array = props.get('Meta Description', {}).get('rich_text', [])
-        meta_description = ''.join([t.get('plain_text', '') for t in meta_desc_array])
 
-        author_array = props.get('Author', {}).get('rich_text', [])
-        author = ''.join([t.get('plain_text', '') for t in author_array]) or 'VortixPR Team'
+async def run_notion_sync(notion_page_id: str) -> dict:
+    """
+    同步單一 Notion 頁面（由 notion_sync_queue 的 worker 執行）
 
-        # Cover Image → 上傳到 R2
-        cover_files = props.get('Cover Image', {}).get('files', [])
-        cover_image_url = ''
-        if cover_files:
-            original_cover_url = (
-                cover_files[0].get('file', {}).get('url')
-                or cover_files[0].get('external', {}).get('url', '')
+    失敗時直接拋出例外，由 queue 記錄並退避重試
+    """
+    frontend_url = settings.FRONTEND_URL.rstrip('/')
+
+    # 2. 讀取 Notion 頁面（此時 N8N 尚未改寫任何狀態，讀到的是真實觸發狀態）
+    page = await notion_gateway.retrieve_page(notion_page_id)
+    props = page['properties']
+    notion_status = props.get('Status', {}).get('select', {}).get('name', '')
+    page_edited_at = parse_notion_time(page.get('last_edited_time'))
+
+    # 已發布的對應文章 + 上次同步的 block 轉換結果 / 內容 hash
+    synced = None
+    blocks: List[dict] = []
+    source_hash = None
+    if notion_status != 'Archive':
+        async with db.pool.acquire() as conn:
+            synced = await conn.fetchrow(
+                """
+                SELECT p.id, p.slug, p.title, c.blocks, c.source_hash
+                FROM blog_posts p
+                LEFT JOIN notion_render_cache c ON c.notion_page_id = p.notion_page_id
+                WHERE p.notion_page_id = $1 AND p.status = 'published'
+                """,
+                notion_page_id
             )
-            if original_cover_url:
-                try:
-                    async with httpx.AsyncClient(timeout=30.0) as client:
-                        response = await client.get(original_cover_url)
-                        if response.status_code == 200:
-                            content_type = response.headers.get('content-type', 'image/jpeg')
-                            ext = {'image/jpeg': 'jpg', 'image/png': 'png',
-                                   'image/gif': 'gif', 'image/webp': 'webp'}.get(content_type, 'jpg')
-                            filename = f"notion-blog-{payload.notion_page_id[:8]}-cover.{ext}"
-                            upload_result = r2_storage.upload_file(
-                                file_content=response.content,
-                                filename=filename,
-                                folder="blog-covers",
-                                content_type=content_type
-                            )
-                            cover_image_url = upload_result['url']
-                        else:
-                            cover_image_url = original_cover_url
-                except Exception as img_err:
-                    cover_image_url = original_cover_url
-                    logger.warning(f"⚠️ 封面圖上傳失敗: {img_err}")
-
-        # Publish Date
-        publish_date_obj = props.get('Publish Date', {}).get('date', {})
-        published_at = datetime.now()
-        if publish_date_obj and publish_date_obj.get('start'):
-            try:
-                dt = datetime.fromisoformat(publish_date_obj['start'].replace('Z', '+00:00'))
-                published_at = dt.replace(tzinfo=None)
-            except Exception:
-                pass
 
-        # Tags
-        tags_array = props.get('tag', {}).get('multi_select', [])
-        tags = [t.get('name', '') for t in tags_array]
+        # 取得頁面所有 blocks（分頁 + 巢狀 children）
+        # 整頁 blocks 先讀進記憶體再轉換：必須先算出內容 hash，才能在寫入 Notion 前決定是否略過
+        # （blocks 只是 JSON，圖片仍由 ingest_images 串流下載）
+        fetcher = NotionBlockFetcher(notion_gateway.list_block_children)
+        blocks = await fetcher.fetch_all(notion_page_id)
+        source_hash = page_hash(props, [block_hash(block) for block in blocks], ignore=NOTION_WRITTEN_PROPERTIES)
 
-        # 取得頁面 blocks 並轉換 HTML
-        blocks_response = notion.blocks.children.list(
-            block_id=payload.notion_page_id, page_size=100
-        )
-        html_content = await _convert_blocks_to_html_and_upload_images(
-            blocks_response['results'], payload.notion_page_id
-        )
+        # 內容（properties + blocks）與上次同步相同 → 略過（N8N 重送、批次回填時常見）
+        # 不改成 Processing...；只有停在觸發狀態（例如 Ready to Publish）時才改回 Updated
+        if synced and synced['source_hash'] == source_hash:
+            restore_status = None if notion_status in NOTION_DONE_STATUSES else "Updated"
+            return await _skip_unchanged_page(notion_page_id, synced, restore_status)
 
-        read_time = _calculate_read_time(html_content)
-        meta_title = f"{title} | VortixPR"
-        excerpt = meta_description[:160] if meta_description else title[:160]
-        meta_description = meta_description[:160] if meta_description else title[:160]
+    # 3. 立即把 Notion 狀態改為 Processing...（讓使用者知道後端已接收並正在處理）
+    await _sync_status_to_notion(notion_page_id, "Processing...")
 
-        # 寫入資料庫
+    # ── 分支一：Archive ──────────────────────────────────────────
+    if notion_status == 'Archive':
         async with db.pool.acquire() as conn:
             existing = await conn.fetchrow(
-                "SELECT id, slug FROM blog_posts WHERE notion_page_id = $1",
-                payload.notion_page_id
+                "SELECT id, slug, title FROM blog_posts WHERE notion_page_id = $1",
+                notion_page_id
+            )
+            if not existing:
+                # 找不到對應文章：可能已從網站刪除但 Notion 未更新
+                # 直接把 Notion 標為 Archived 完成流程，不卡在 Processing...
+                await _sync_status_to_notion(notion_page_id, "Archived")
+                return {
+                    "notion_page_id": notion_page_id,
+                    "_sync_action": "archived",
+                    "note": "DB 中無對應文章，Notion 已直接設為 Archived",
+                }
+            await conn.execute(
+                "UPDATE blog_posts SET status = 'archived', updated_at = NOW() WHERE id = $1",
+                existing['id']
             )
+            await db.notify_content_change("blog_posts", conn=conn)
 
-            if existing:
-                row = await conn.fetchrow(
-                    """
-                    UPDATE blog_posts
-                    SET title=$1, category=$2, excerpt=$3, content=$4, author=$5,
-                        image_url=$6, read_time=$7, meta_title=$8, meta_description=$9,
-                        tags=$10, status='published',
-                        notion_last_edited_time=$11, updated_at=NOW()
-                    WHERE id=$12
-                    RETURNING *
-                    """,
-                    title, pillar, excerpt, html_content, author,
-                    cover_image_url, read_time, meta_title, meta_description,
-                    tags, datetime.now(), existing['id']
-                )
-                action = "updated"
-            else:
-                slug = slugify(title)
-                if await conn.fetchval("SELECT id FROM blog_posts WHERE slug=$1", slug):
-                    slug = f"{slug}-{int(datetime.now().timestamp())}"
-
-                row = await conn.fetchrow(
-                    """
-                    INSERT INTO blog_posts (
-                        notion_page_id, notion_last_edited_time, sync_source,
-                        title, slug, category, excerpt, content, author,
-                        image_url, read_time, meta_title, meta_description,
-                        tags, status, published_at
-                    ) VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11,$12,$13,$14,$15,$16,$17)
-                    RETURNING *
-                    """,
-                    payload.notion_page_id, datetime.now(), 'notion',
-                    title, slug, pillar, excerpt, html_content, author,
-                    cover_image_url, read_time, meta_title, meta_description,
-                    tags, 'published', published_at
-                )
-                action = "created"
+        # 後端自行更新 Notion 狀態為 Archived + 清空 Article URL
+        await _sync_status_to_notion(notion_page_id, "Archived")
 
-        article_url = f"{frontend_url}/blog/{row['slug']}"
+        return {
+            "id": existing['id'],
+            "slug": existing['slug'],
+            "title": existing['title'],
+            "notion_page_id": notion_page_id,
+            "_sync_action": "archived",
+            "article_url": f"{frontend_url}/blog/{existing['slug']}",
+        }
 
-        # 後端自行更新 Notion 狀態 + Article URL（N8N 不需要再做）
-        # created → Published（新文章上線）
-        # updated → Updated（已發布的文章更新內容）
-        notion_done_status = "Published" if action == "created" else "Updated"
-        await _sync_status_to_notion(payload.notion_page_id, notion_done_status)
+    # ── 分支二：Publish / Update（同步完整內容）────────────────────
+
+    # 提取頁面欄位
+    title = props.get('Title', {}).get('title', [{}])[0].get('plain_text', 'Untitled')
+    pillar = props.get('Pillar', {}).get('select', {}).get('name', 'Industry News')
+
+    meta_desc_array = props.get('Meta Description', {}).get('rich_text', [])
+    meta_description = ''.join([t.get('plain_text', '') for t in meta_desc_array])
+
+    author_array = props.get('Author', {}).get('rich_text', [])
+    author = ''.join([t.get('plain_text', '') for t in author_array]) or 'VortixPR Team'
+
+    # Cover Image（與內文圖片一起上傳到 R2）
+    cover_files = props.get('Cover Image', {}).get('files', [])
+    original_cover_url = ''
+    if cover_files:
+        original_cover_url = (
+            cover_files[0].get('file', {}).get('url')
+            or cover_files[0].get('external', {}).get('url', '')
+        )
+
+    # Publish Date
+    publish_date_obj = props.get('Publish Date', {}).get('date', {})
+    published_at = datetime.now()
+    if publish_date_obj and publish_date_obj.get('start'):
         try:
-            notion.pages.update(
-                page_id=payload.notion_page_id,
-                properties={"Article URL": {"url": article_url}}
+            dt = datetime.fromisoformat(publish_date_obj['start'].replace('Z', '+00:00'))
+            published_at = dt.replace(tzinfo=None)
+        except Exception:
+            pass
+
+    # Tags
+    tags_array = props.get('tag', {}).get('multi_select', [])
+    tags = [t.get('name', '') for t in tags_array]
+
+    # 轉換 HTML（上次同步的 block 轉換結果中，未變更的 block 直接沿用）
+    html_content, cover_image_url, render_cache, images_complete = await _convert_blocks_to_html_and_upload_images(
+        blocks,
+        notion_page_id,
+        cover_url=original_cover_url,
+        render_cache=synced['blocks'] if synced else None
+    )
+
+    read_time = _calculate_read_time(html_content)
+    meta_title = f"{title} | VortixPR"
+    excerpt = meta_description[:160] if meta_description else title[:160]
+    meta_description = meta_description[:160] if meta_description else title[:160]
+
+    # 寫入資料庫
+    async with db.pool.acquire() as conn:
+        existing = await conn.fetchrow(
+            "SELECT id, slug FROM blog_posts WHERE notion_page_id = $1",
+            notion_page_id
+        )
+
+        if existing:
+            row = await conn.fetchrow(
+                """
+                UPDATE blog_posts
+                SET title=$1, category=$2, excerpt=$3, content=$4, author=$5,
+                    image_url=$6, read_time=$7, meta_title=$8, meta_description=$9,
+                    tags=$10, status='published',
+                    notion_last_edited_time=$11, updated_at=NOW()
+                WHERE id=$12
+                RETURNING *
+                """,
+                title, pillar, excerpt, html_content, author,
+                cover_image_url, read_time, meta_title, meta_description,
+                tags, page_edited_at or datetime.utcnow(), existing['id']
             )
-        except Exception as url_err:
-            logger.warning(f"⚠️ 回填 Article URL 失敗: {url_err}")
+            action = "updated"
+        else:
+            slug = slugify(title)
+            if await conn.fetchval("SELECT id FROM blog_posts WHERE slug=$1", slug):
+                slug = f"{slug}-{int(datetime.now().timestamp())}"
 
-        result = dict(row)
-        result['_sync_action'] = action
-        result['article_url'] = article_url
-        result['notion_page_id'] = payload.notion_page_id
-        return result
+            row = await conn.fetchrow(
+                """
+                INSERT INTO blog_posts (
+                    notion_page_id, notion_last_edited_time, sync_source,
+                    title, slug, category, excerpt, content, author,
+                    image_url, read_time, meta_title, meta_description,
+                    tags, status, published_at
+                ) VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,$11,$12,$13,$14,$15,$16)
+                RETURNING *
+                """,
+                notion_page_id, page_edited_at or datetime.utcnow(), 'notion',
+                title, slug, pillar, excerpt, html_content, author,
+                cover_image_url, read_time, meta_title, meta_description,
+                tags, 'published', published_at
+            )
+            action = "created"
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to sync from Notion: {str(e)}"
+        await conn.execute(
+            """
+            INSERT INTO notion_render_cache (notion_page_id, blocks, source_hash, updated_at)
+            VALUES ($1, $2, $3, NOW())
+            ON CONFLICT (notion_page_id) DO UPDATE
+            SET blocks = EXCLUDED.blocks, source_hash = EXCLUDED.source_hash, updated_at = NOW()
+            """,
+            # 有圖片未上傳到 R2 時不記錄內容 hash，下次同步即使內容未變也會重試
+            notion_page_id, render_cache, source_hash if images_complete else None
         )
 
+        await db.notify_content_change("blog_posts", conn=conn)
 
-async def _convert_blocks_to_html_and_upload_images(blocks, page_id: str):
-    """轉換 Notion blocks 為 HTML，並上傳圖片到 R2"""
-    
-    def get_text(rich_text_array):
-        if not rich_text_array:
-            return ''
-        return ''.join([t.get('plain_text', '') for t in rich_text_array])
-    
-    html_parts = []
-    image_count = 0
-    
-    for block in blocks:
-        block_type = block['type']
-        
-        if block_type == 'heading_1':
-            html_parts.append(f"<h1>{get_text(block['heading_1']['rich_text'])}</h1>")
-        elif block_type == 'heading_2':
-            html_parts.append(f"<h2>{get_text(block['heading_2']['rich_text'])}</h2>")
-        elif block_type == 'heading_3':
-            html_parts.append(f"<h3>{get_text(block['heading_3']['rich_text'])}</h3>")
-        elif block_type == 'paragraph':
-            text = get_text(block['paragraph']['rich_text'])
-            if text:
-                html_parts.append(f"<p>{text}</p>")
-        elif block_type == 'bulleted_list_item':
-            html_parts.append(f"<li>{get_text(block['bulleted_list_item']['rich_text'])}</li>")
-        elif block_type == 'numbered_list_item':
-            html_parts.append(f"<li>{get_text(block['numbered_list_item']['rich_text'])}</li>")
-        elif block_type == 'image':
-            original_url = block['image'].get('external', {}).get('url') or block['image'].get('file', {}).get('url', '')
-            if original_url:
-                # 如果是 Notion 的臨時 URL，下載並上傳到 R2
-                if 'prod-files-secure.s3' in original_url or 'amazonaws.com' in original_url:
-                    try:
-                        # 下載圖片
-                        async with httpx.AsyncClient() as client:
-                            response = await client.get(original_url)
-                            if response.status_code == 200:
-                                image_count += 1
-                                # 生成檔名
-                                filename = f"notion-blog-{page_id[:8]}-img-{image_count}.jpg"
-                                
-                                # 上傳到 R2
-                                upload_result = r2_storage.upload_file(
-                                    file_content=response.content,
-                                    filename=filename,
-                                    folder="blog-images",
-                                    content_type=response.headers.get('content-type', 'image/jpeg')
-                                )
-                                
-                                # 使用 R2 的永久 URL
-                                final_url = upload_result['url']
-                            else:
-                                final_url = original_url  # 下載失敗，用原始 URL
-                    except Exception as e:
-                        final_url = original_url  # 出錯，用原始 URL
-                else:
-                    final_url = original_url  # 已經是外部 URL，直接使用
-                
-                html_parts.append(f'<img src="{final_url}" alt="Image" />')
-        elif block_type == 'divider':
-            html_parts.append('<hr />')
-        # 可以之後再加更多類型（quote, code, callout 等）
-    
-    return '\n'.join(html_parts)
+    # 封面圖的 responsive 縮圖在背景產生（已產生過的直接沿用；不佔用同步 job，失敗不影響同步）
+    if cover_image_url and r2_storage.key_from_url(cover_image_url):
+        image_variants.schedule(cover_image_url)
 
+    article_url = f"{frontend_url}/blog/{row['slug']}"
 
-async def _convert_blocks_to_html_and_upload_images(blocks, page_id: str):
+    # 後端自行更新 Notion 狀態 + Article URL（N8N 不需要再做）
+    # created → Published（新文章上線）
+    # updated → Updated（已發布的文章更新內容）
+    await _mark_notion_page_done(
+        notion_page_id, row['id'], "Published" if action == "created" else "Updated", article_url
+    )
+
+    result = dict(row)
+    result['_sync_action'] = action
+    result['article_url'] = article_url
+    result['notion_page_id'] = notion_page_id
+    return result
+
+
+async def _convert_blocks_to_html_and_upload_images(
+    blocks,
+    page_id: str,
+    cover_url: str = '',
+    render_cache: Optional[dict] = None
+):
     """
-    轉換 Notion blocks 為 HTML，並上傳 Notion 圖片到 R2
+    轉換 Notion blocks 為 HTML，並上傳 Notion 圖片（含封面）到 R2
     
-    Notion 的圖片 URL 會過期，需要下載並上傳到我們的 R2
+    Notion 的圖片 URL 會過期，需要下載並上傳到我們的 R2。
+    先轉換 HTML 並收集所有圖片，再一次並行下載/上傳，最後依序填回圖片 URL。
+    
+    Args:
+        blocks: block list（NotionBlockFetcher.fetch_all）；巢狀內容放在 block['children']
+        render_cache: 上次同步的 {block hash: HTML 片段}；內容未變的頂層 block 直接沿用
+    
+    Returns:
+        (HTML, 封面最終 URL, 這次的 {block hash: HTML 片段}, 所有圖片是否都已在 R2)
     """
+    render_cache = render_cache or {}
+    new_cache = {}
+    # 這次重新轉換的頂層 block：(hash, html_parts 起點, 終點)
+    rendered_segments = []
     
     def get_text(rich_text_array):
         if not rich_text_array:
             return ''
         return ''.join([t.get('plain_text', '') for t in rich_text_array])
     
+    # html_parts 中的 int 代表 images 的索引（圖片上傳後再填回）
     html_parts = []
-    image_count = 0
+    images = []
     
-    for block in blocks:
+    if cover_url:
+        images.append(NotionImage(cover_url, "blog-covers", f"notion-blog-{page_id[:8]}-cover"))
+    
+    def render(block):
         block_type = block['type']
+        children = block.get('children') or []
         
         if block_type == 'heading_1':
             html_parts.append(f"<h1>{get_text(block['heading_1']['rich_text'])}</h1>")
@@ -700,62 +843,127 @@ async def _convert_blocks_to_html_and_upload_images(blocks, page_id: str):
             text = get_text(block['paragraph']['rich_text'])
             if text:
                 html_parts.append(f"<p>{text}</p>")
-        elif block_type == 'bulleted_list_item':
-            html_parts.append(f"<li>{get_text(block['bulleted_list_item']['rich_text'])}</li>")
-        elif block_type == 'numbered_list_item':
-            html_parts.append(f"<li>{get_text(block['numbered_list_item']['rich_text'])}</li>")
+        elif block_type in ('bulleted_list_item', 'numbered_list_item'):
+            text = get_text(block[block_type]['rich_text'])
+            if children:
+                # 巢狀清單
+                list_tag = 'ul' if block_type == 'bulleted_list_item' else 'ol'
+                html_parts.append(f"<li>{text}<{list_tag}>")
+                for child in children:
+                    render(child)
+                html_parts.append(f"</{list_tag}></li>")
+                return
+            html_parts.append(f"<li>{text}</li>")
         elif block_type == 'image':
             original_url = block['image'].get('external', {}).get('url') or block['image'].get('file', {}).get('url', '')
             
             if original_url:
                 # 所有圖片都上傳到 R2（完全掌控）
-                try:
-                    # 下載圖片
-                    async with httpx.AsyncClient(timeout=30.0) as client:
-                        response = await client.get(original_url)
-                        
-                        if response.status_code == 200:
-                            image_count += 1
-                            
-                            # 從 content-type 判斷副檔名
-                            content_type = response.headers.get('content-type', 'image/jpeg')
-                            ext_map = {
-                                'image/jpeg': 'jpg',
-                                'image/png': 'png',
-                                'image/gif': 'gif',
-                                'image/webp': 'webp'
-                            }
-                            ext = ext_map.get(content_type, 'jpg')
-                            
-                            filename = f"notion-blog-{page_id[:8]}-img-{image_count}.{ext}"
-                            
-                            # 上傳到 R2
-                            upload_result = r2_storage.upload_file(
-                                file_content=response.content,
-                                filename=filename,
-                                folder="blog-images",
-                                content_type=content_type
-                            )
-                            
-                            final_url = upload_result['url']
-                            import logging
-                            logging.getLogger(__name__).info(f"✅ 圖片已上傳到 R2: {filename} (原始: {original_url[:50]}...)")
-                        else:
-                            final_url = original_url  # 下載失敗，fallback
-                            import logging
-                            logging.getLogger(__name__).warning(f"⚠️ 下載圖片失敗 {response.status_code}: {original_url[:80]}")
-                
-                except Exception as e:
-                    final_url = original_url  # 出錯，fallback
-                    import logging
-                    logging.getLogger(__name__).warning(f"⚠️ 圖片處理失敗: {e}")
-                
-                html_parts.append(f'<img src="{final_url}" alt="Image" />')
+                image_number = len(images) + (0 if cover_url else 1)
+                html_parts.append(len(images))
+                images.append(NotionImage(original_url, "blog-images", f"notion-blog-{page_id[:8]}-img-{image_number}"))
         
         elif block_type == 'divider':
             html_parts.append('<hr />')
+        elif block_type in ('toggle', 'quote', 'callout'):
+            text = get_text(block[block_type].get('rich_text'))
+            if text:
+                html_parts.append(f"<p>{text}</p>")
+        
+        # 其他容器（column_list / column / synced_block / toggle ...）的內容依序展開
+        for child in children:
+            render(child)
+    
+    def render_top_level(block):
+        digest = block_hash(block)
+        cached = render_cache.get(digest)
+        if cached is not None:
+            new_cache[digest] = cached
+            if cached:
+                html_parts.append(cached)
+            return
+        
+        start = len(html_parts)
+        render(block)
+        rendered_segments.append((digest, start, len(html_parts)))
+    
+    for block in blocks:
+        render_top_level(block)
+    
+    final_urls = await ingest_images(images)
     
-    return '\n'.join(html_parts)
+    # 上傳失敗的圖片保留會過期的 Notion URL：含這類圖片的片段不快取，下次同步重新上傳
+    # （block_hash 不含 URL 簽章，快取後就不會再重新轉換）
+    failed_images = {
+        index for index, url in enumerate(final_urls)
+        if r2_storage.key_from_url(url) is None
+    }
+    uncached = {
+        digest for digest, start, end in rendered_segments
+        if any(isinstance(part, int) and part in failed_images for part in html_parts[start:end])
+    }
+    
+    html_parts = [
+        part if isinstance(part, str) else f'<img src="{final_urls[part]}" alt="Image" />'
+        for part in html_parts
+    ]
+    for digest, start, end in rendered_segments:
+        if digest not in uncached:
+            new_cache[digest] = '\n'.join(html_parts[start:end])
+    
+    if uncached:
+        logger.warning(f"⚠️ {len(uncached)} 個 block 的圖片未上傳到 R2，不快取，下次同步重試")
+    if render_cache:
+        logger.info(f"♻️ Notion blocks: {len(render_cache.keys() & new_cache.keys())} 未變更, {len(rendered_segments)} 重新轉換")
+    
+    return '\n'.join(html_parts), (final_urls[0] if cover_url else ''), new_cache, not failed_images
+
+
+async def _skip_unchanged_page(notion_page_id: str, synced, restore_status: Optional[str]) -> dict:
+    """
+    頁面沒有變更：不重新同步，但仍把 Notion 狀態改為 restore_status（None = 不更新）
+
+    觸發 webhook 的狀態（例如 Ready to Publish）或 Processing... 不應停留在 Notion 上
+    """
+    logger.info(f"⏭️ Notion 頁面未變更，略過同步: {notion_page_id}")
+    article_url = f"{settings.FRONTEND_URL.rstrip('/')}/blog/{synced['slug']}"
+
+    if restore_status:
+        await _mark_notion_page_done(notion_page_id, synced['id'], restore_status, article_url)
+
+    return {
+        "id": synced['id'],
+        "slug": synced['slug'],
+        "title": synced['title'],
+        "notion_page_id": notion_page_id,
+        "_sync_action": "unchanged",
+        "article_url": article_url,
+    }
+
+
+async def _mark_notion_page_done(notion_page_id: str, post_id: int, notion_status: str, article_url: str):
+    """同步完成：更新 Notion 狀態 + Article URL（失敗不影響同步結果）"""
+    try:
+        updated_page = await notion_gateway.update_page(
+            notion_page_id,
+            {
+                "Status": {"select": {"name": notion_status}},
+                "Article URL": {"url": article_url}
+            }
+        )
+        logger.info(f"✅ Notion 狀態已同步為 {notion_status}: {notion_page_id}")
+
+        # 我們自己的更新也會改變 Notion 的 last_edited_time，記錄下來避免下次誤判為有變更
+        done_edited_at = parse_notion_time(updated_page.get('last_edited_time'))
+        if done_edited_at:
+            async with db.pool.acquire() as conn:
+                await conn.execute(
+                    # 一併更新 updated_at：公開 API 的 ETag 以 updated_at 為資料水位
+                    "UPDATE blog_posts SET notion_last_edited_time = $1, updated_at = NOW() WHERE id = $2",
+                    done_edited_at, post_id
+                )
+    except Exception as notion_err:
+        logger.warning(f"⚠️ 回填 Notion 狀態 / Article URL 失敗: {notion_err}")
 
 
 def _calculate_read_time(html_content: str) -> int:
@@ -786,37 +994,16 @@ async def _sync_status_to_notion(notion_page_id: str, notion_status: str) -> boo
         bool: True = 成功，False = 失敗
     """
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.patch(
-                f"https://api.notion.com/v1/pages/{notion_page_id}",
-                headers={
-                    "Authorization": f"Bearer {settings.NOTION_API_KEY}",
-                    "Notion-Version": "2022-06-28",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "properties": {
-                        "Status": {
-                            "select": {
-                                "name": notion_status
-                            }
-                        }
-                    }
-                }
-            )
-            
-            if response.status_code == 200:
-                logger.info(f"✅ Notion 狀態已同步為 {notion_status}: {notion_page_id}")
-                return True
-            else:
-                logger.warning(f"⚠️ Notion 狀態更新失敗 HTTP {response.status_code}: {notion_page_id}")
-                return False
+        await notion_gateway.update_page(
+            notion_page_id,
+            {"Status": {"select": {"name": notion_status}}}
+        )
+        logger.info(f"✅ Notion 狀態已同步為 {notion_status}: {notion_page_id}")
+        return True
     
+    except NotionAPIError as e:
+        logger.warning(f"⚠️ Notion 狀態更新失敗 HTTP {e.status_code}: {notion_page_id}")
+        return False
     except Exception as e:
         logger.warning(f"⚠️ Notion 狀態同步失敗（不影響網站操作）: {e}")
         return False
-
-
-
-
-
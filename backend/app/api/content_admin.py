@@ -6,7 +6,7 @@ from typing import List
 import asyncpg
 from datetime import datetime
 
-from ..core.database import Database
+from ..core.database import Database, db
 from ..utils.security import get_current_user, require_admin
 from ..models.content import (
     FAQCreate, FAQUpdate, FAQResponse,
@@ -59,6 +59,7 @@ async def create_faq(
         RETURNING *
     """, faq.question, faq.answer, faq.display_order, faq.is_active)
     
+    await db.notify_content_change("faqs", conn=conn)
     return dict(row)
 
 
@@ -104,6 +105,7 @@ async def update_faq(
     """
     
     row = await conn.fetchrow(query, *values)
+    await db.notify_content_change("faqs", conn=conn)
     return dict(row)
 
 
@@ -119,6 +121,7 @@ async def delete_faq(
     if result == "DELETE 0":
         raise HTTPException(status_code=404, detail="FAQ not found")
     
+    await db.notify_content_change("faqs", conn=conn)
     return {"message": "FAQ deleted successfully"}
 
 
@@ -151,6 +154,7 @@ async def create_testimonial(
         testimonial.author_company, testimonial.author_avatar_url, 
         testimonial.display_order, testimonial.is_active)
     
+    await db.notify_content_change("testimonials", conn=conn)
     return dict(row)
 
 
@@ -196,6 +200,7 @@ async def update_testimonial(
     """
     
     row = await conn.fetchrow(query, *values)
+    await db.notify_content_change("testimonials", conn=conn)
     return dict(row)
 
 
@@ -211,6 +216,7 @@ async def delete_testimonial(
     if result == "DELETE 0":
         raise HTTPException(status_code=404, detail="Testimonial not found")
     
+    await db.notify_content_change("testimonials", conn=conn)
     return {"message": "Testimonial deleted successfully"}
 
 
@@ -242,6 +248,7 @@ async def create_team_member(
     """, member.name, member.position, member.avatar_url, member.bio,
         member.linkedin_url, member.twitter_url, member.display_order, member.is_active)
     
+    await db.notify_content_change("team_members", conn=conn)
     return dict(row)
 
 
@@ -286,6 +293,7 @@ async def update_team_member(
     """
     
     row = await conn.fetchrow(query, *values)
+    await db.notify_content_change("team_members", conn=conn)
     return dict(row)
 
 
@@ -301,6 +309,7 @@ async def delete_team_member(
     if result == "DELETE 0":
         raise HTTPException(status_code=404, detail="Team member not found")
     
+    await db.notify_content_change("team_members", conn=conn)
     return {"message": "Team member deleted successfully"}
 
 
@@ -356,6 +365,7 @@ async def update_setting(
         RETURNING *
     """, setting.value, datetime.utcnow(), current_user.user_id, setting_key)
     
+    await db.notify_content_change("system_settings", conn=conn)
     return dict(row)
 
 
@@ -386,6 +396,7 @@ async def create_differentiator(
         RETURNING *
     """, item.text, item.display_order, item.is_active)
     
+    await db.notify_content_change("differentiators", conn=conn)
     return dict(row)
 
 
@@ -430,6 +441,7 @@ async def update_differentiator(
     """
     
     row = await conn.fetchrow(query, *values)
+    await db.notify_content_change("differentiators", conn=conn)
     return dict(row)
 
 
@@ -445,6 +457,7 @@ async def delete_differentiator(
     if result == "DELETE 0":
         raise HTTPException(status_code=404, detail="Differentiator not found")
     
+    await db.notify_content_change("differentiators", conn=conn)
     return {"message": "Differentiator deleted successfully"}
 
 
@@ -475,6 +488,7 @@ async def create_stat(
         RETURNING *
     """, item.label, item.value, item.suffix, item.description, item.display_order, item.is_active)
     
+    await db.notify_content_change("stats", conn=conn)
     return dict(row)
 
 
@@ -519,6 +533,7 @@ async def update_stat(
     """
     
     row = await conn.fetchrow(query, *values)
+    await db.notify_content_change("stats", conn=conn)
     return dict(row)
 
 
@@ -534,6 +549,7 @@ async def delete_stat(
     if result == "DELETE 0":
         raise HTTPException(status_code=404, detail="Stat not found")
     
+    await db.notify_content_change("stats", conn=conn)
     return {"message": "Stat deleted successfully"}
 
 
@@ -565,6 +581,7 @@ async def create_carousel_logo(
     """, item.name, item.logo_url, item.alt_text, item.website_url, 
         item.display_order, item.is_active)
     
+    await db.notify_content_change("carousel_logos", conn=conn)
     return dict(row)
 
 
@@ -609,6 +626,7 @@ async def update_carousel_logo(
     """
     
     row = await conn.fetchrow(query, *values)
+    await db.notify_content_change("carousel_logos", conn=conn)
     return dict(row)
 
 
@@ -624,5 +642,6 @@ async def delete_carousel_logo(
     if result == "DELETE 0":
         raise HTTPException(status_code=404, detail="Carousel logo not found")
     
+    await db.notify_content_change("carousel_logos", conn=conn)
     return {"message": "Carousel logo deleted successfully"}
 
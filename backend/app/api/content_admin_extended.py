@@ -6,7 +6,7 @@ from typing import List
 import asyncpg
 from datetime import datetime
 
-from ..core.database import Database
+from ..core.database import Database, db
 from ..utils.security import get_current_user, require_admin
 from ..models.content import (
     ClientLogoCreate, ClientLogoUpdate, ClientLogoResponse,
@@ -40,6 +40,7 @@ async def get_all_clients(conn: asyncpg.Connection = Depends(get_db_conn)):
 async def create_client(item: ClientLogoCreate, conn: asyncpg.Connection = Depends(get_db_conn), current_user = Depends(get_current_user)):
     row = await conn.fetchrow("INSERT INTO client_logos (name, logo_url, website_url, display_order, is_active) VALUES ($1, $2, $3, $4, $5) RETURNING *", 
         item.name, item.logo_url, item.website_url, item.display_order, item.is_active)
+    await db.notify_content_change("client_logos", conn=conn)
     return dict(row)
 
 
@@ -70,6 +71,7 @@ async def update_client(item_id: int, item: ClientLogoUpdate, conn: asyncpg.Conn
     values.append(item_id)
     
     row = await conn.fetchrow(f"UPDATE client_logos SET {', '.join(update_fields)} WHERE id = ${param_count} RETURNING *", *values)
+    await db.notify_content_change("client_logos", conn=conn)
     return dict(row)
 
 
@@ -78,6 +80,7 @@ async def delete_client(item_id: int, conn: asyncpg.Connection = Depends(get_db_
     result = await conn.execute("DELETE FROM client_logos WHERE id = $1", item_id)
     if result == "DELETE 0":
         raise HTTPException(status_code=404, detail="Not found")
+    await db.notify_content_change("client_logos", conn=conn)
     return {"message": "Deleted"}
 
 
@@ -95,6 +98,7 @@ async def create_publisher_feature(item: PublisherFeatureCreate, conn: asyncpg.C
         INSERT INTO publisher_features (title, description, display_order, is_active)
         VALUES ($1, $2, $3, $4) RETURNING *
     """, item.title, item.description, item.display_order, item.is_active)
+    await db.notify_content_change("publisher_features", conn=conn)
     return dict(row)
 
 
@@ -125,6 +129,7 @@ async def update_publisher_feature(item_id: int, item: PublisherFeatureUpdate, c
     values.append(item_id)
     
     row = await conn.fetchrow(f"UPDATE publisher_features SET {', '.join(update_fields)} WHERE id = ${param_count} RETURNING *", *values)
+    await db.notify_content_change("publisher_features", conn=conn)
     return dict(row)
 
 
@@ -133,6 +138,7 @@ async def delete_publisher_feature(item_id: int, conn: asyncpg.Connection = Depe
     result = await conn.execute("DELETE FROM publisher_features WHERE id = $1", item_id)
     if result == "DELETE 0":
         raise HTTPException(status_code=404, detail="Feature not found")
+    await db.notify_content_change("publisher_features", conn=conn)
     return {"message": "Feature deleted successfully"}
 
 
@@ -150,6 +156,7 @@ async def create_hero_section(item: HeroSectionCreate, conn: asyncpg.Connection
         INSERT INTO hero_sections (page, title, subtitle, description, cta_primary_text, cta_primary_url, cta_secondary_text, cta_secondary_url, background_image_url, is_active)
         VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10) RETURNING *
     """, item.page, item.title, item.subtitle, item.description, item.cta_primary_text, item.cta_primary_url, item.cta_secondary_text, item.cta_secondary_url, item.background_image_url, item.is_active)
+    await db.notify_content_change("hero_sections", conn=conn)
     return dict(row)
 
 
@@ -180,6 +187,7 @@ async def update_hero_section(page: str, item: HeroSectionUpdate, conn: asyncpg.
     values.append(page)
     
     row = await conn.fetchrow(f"UPDATE hero_sections SET {', '.join(update_fields)} WHERE page = ${param_count} RETURNING *", *values)
+    await db.notify_content_change("hero_sections", conn=conn)
     return dict(row)
 
 
@@ -232,6 +240,7 @@ async def update_section_content(
         RETURNING id, section_key, created_at, updated_at
     """, section_key, json.dumps(item.content))
     
+    await db.notify_content_change("section_contents", conn=conn)
     return {
         "id": row['id'],
         "section_key": row['section_key'],
@@ -253,6 +262,7 @@ async def create_section_content(
         RETURNING *
     """, item.section_key, json.dumps(item.content))
     
+    await db.notify_content_change("section_contents", conn=conn)
     return dict(row)
 
 
@@ -270,6 +280,7 @@ async def create_hero_logo(page: str, item: HeroMediaLogoCreate, conn: asyncpg.C
         INSERT INTO hero_media_logos (hero_page, name, logo_url, website_url, opacity, size, position_top, position_left, position_right, position_bottom, animation_speed, display_order, is_active)
         VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13) RETURNING *
     """, page, item.name, item.logo_url, item.website_url, item.opacity, item.size, item.position_top, item.position_left, item.position_right, item.position_bottom, item.animation_speed, item.display_order, item.is_active)
+    await db.notify_content_change("hero_media_logos", conn=conn)
     return dict(row)
 
 
@@ -300,6 +311,7 @@ async def update_hero_logo(logo_id: int, item: HeroMediaLogoUpdate, conn: asyncp
     values.append(logo_id)
     
     row = await conn.fetchrow(f"UPDATE hero_media_logos SET {', '.join(update_fields)} WHERE id = ${param_count} RETURNING *", *values)
+    await db.notify_content_change("hero_media_logos", conn=conn)
     return dict(row)
 
 
@@ -308,6 +320,7 @@ async def delete_hero_logo(logo_id: int, conn: asyncpg.Connection = Depends(get_
     result = await conn.execute("DELETE FROM hero_media_logos WHERE id = $1", logo_id)
     if result == "DELETE 0":
         raise HTTPException(status_code=404, detail="Logo not found")
+    await db.notify_content_change("hero_media_logos", conn=conn)
     return {"message": "Logo deleted"}
 
 
@@ -340,6 +353,7 @@ async def update_lyro(item: LyroSectionUpdate, conn: asyncpg.Connection = Depend
     values.append(row['id'])
     
     result = await conn.fetchrow(f"UPDATE lyro_section SET {', '.join(update_fields)} WHERE id = ${param_count} RETURNING *", *values)
+    await db.notify_content_change("lyro_section", conn=conn)
     return dict(result)
 
 
@@ -353,6 +367,7 @@ async def get_all_lyro_features(conn: asyncpg.Connection = Depends(get_db_conn))
 async def create_lyro_feature(item: LyroFeatureCreate, conn: asyncpg.Connection = Depends(get_db_conn), current_user = Depends(get_current_user)):
     row = await conn.fetchrow("INSERT INTO lyro_features (text, display_order, is_active) VALUES ($1, $2, $3) RETURNING *", 
         item.text, item.display_order, item.is_active)
+    await db.notify_content_change("lyro_features", conn=conn)
     return dict(row)
 
 
@@ -383,6 +398,7 @@ async def update_lyro_feature(feat_id: int, item: LyroFeatureUpdate, conn: async
     values.append(feat_id)
     
     row = await conn.fetchrow(f"UPDATE lyro_features SET {', '.join(update_fields)} WHERE id = ${param_count} RETURNING *", *values)
+    await db.notify_content_change("lyro_features", conn=conn)
     return dict(row)
 
 
@@ -391,5 +407,6 @@ async def delete_lyro_feature(feat_id: int, conn: asyncpg.Connection = Depends(g
     result = await conn.execute("DELETE FROM lyro_features WHERE id = $1", feat_id)
     if result == "DELETE 0":
         raise HTTPException(status_code=404, detail="Not found")
+    await db.notify_content_change("lyro_features", conn=conn)
     return {"message": "Deleted"}
 
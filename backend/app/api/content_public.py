@@ -1,12 +1,18 @@
 """
 內容管理 - 公開 API（前台讀取）
 """
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
+from typing import Any, Awaitable, Callable, List, Literal, Optional, Tuple, Type
+import asyncio
 import asyncpg
+import hashlib
 import json
+from pydantic import BaseModel
 
 from ..core.database import Database
+from ..core.cache import content_cache
+from ..core.http_cache import is_not_modified
 from ..config import settings
 from ..models.content import (
     FAQResponse,
@@ -19,6 +25,8 @@ from ..models.content import (
     PublisherFeatureResponse,
     HeroSectionResponse,
     HeroMediaLogoResponse,
+    ClientLogoResponse,
+    CarouselLogoResponse,
     LyroSectionResponse,
     LyroFeatureResponse,
     SectionContentResponse
@@ -26,60 +34,80 @@ from ..models.content import (
 
 router = APIRouter(prefix="/public/content", tags=["Public Content"])
 
-# 資料庫依賴
-async def get_db_conn():
-    from ..main import app
-    db: Database = app.state.db
-    async with db.pool.acquire() as conn:
-        yield conn
+# 支援的語系（同時是快取 key 的一部分，未知值直接回 422）
+Lang = Literal['en', 'zh', 'ja']
+
+# ==================== Cache Helpers ====================
+# 公開內容一週只改幾次，查詢結果放在 in-process 快取，
+# 命中時完全不需要向連線池取連線；Admin 寫入時依資料表失效（db.notify_content_change）
+
+async def _cached(
+    key: Tuple,
+    tables: Tuple[str, ...],
+    loader: Callable[[asyncpg.Connection], Awaitable[Any]]
+) -> Any:
+    """快取 miss 時才取連線執行 loader"""
+    async def load():
+        from ..main import app
+        db: Database = app.state.db
+        async with db.pool.acquire() as conn:
+            return await loader(conn)
+
+    return await content_cache.get_or_load(key, load, tags=tables)
+
+
+async def _cached_rows(key: Tuple, tables: Tuple[str, ...], query: str, *args) -> List[dict]:
+    """快取 conn.fetch() 結果（list of dict）"""
+    async def loader(conn: asyncpg.Connection):
+        rows = await conn.fetch(query, *args)
+        return [dict(row) for row in rows]
+
+    return await _cached(key, tables, loader)
+
+
+async def _cached_row(key: Tuple, tables: Tuple[str, ...], query: str, *args) -> Optional[dict]:
+    """快取 conn.fetchrow() 結果（dict 或 None）"""
+    async def loader(conn: asyncpg.Connection):
+        row = await conn.fetchrow(query, *args)
+        return dict(row) if row else None
+
+    return await _cached(key, tables, loader)
 
 
 # ==================== FAQs ====================
 
 @router.get("/faqs", response_model=List[FAQResponse])
-async def get_faqs(
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_faqs():
     """取得所有啟用的 FAQs（按順序）"""
-    rows = await conn.fetch("""
+    return await _cached_rows(("faqs",), ("faqs",), """
         SELECT * FROM faqs 
         WHERE is_active = true 
         ORDER BY display_order ASC, id ASC
     """)
-    
-    return [dict(row) for row in rows]
 
 
 # ==================== Testimonials ====================
 
 @router.get("/testimonials", response_model=List[TestimonialResponse])
-async def get_testimonials(
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_testimonials():
     """取得所有啟用的客戶評價（按順序）"""
-    rows = await conn.fetch("""
+    return await _cached_rows(("testimonials",), ("testimonials",), """
         SELECT * FROM testimonials 
         WHERE is_active = true 
         ORDER BY display_order ASC, id ASC
     """)
-    
-    return [dict(row) for row in rows]
 
 
 # ==================== Team Members ====================
 
 @router.get("/team", response_model=List[TeamMemberResponse])
-async def get_team_members(
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_team_members():
     """取得所有啟用的團隊成員（按順序）"""
-    rows = await conn.fetch("""
+    return await _cached_rows(("team_members",), ("team_members",), """
         SELECT * FROM team_members 
         WHERE is_active = true 
         ORDER BY display_order ASC, id ASC
     """)
-    
-    return [dict(row) for row in rows]
 
 
 # ==================== Services ====================
@@ -90,10 +118,13 @@ async def get_team_members(
 # ==================== Site Settings ====================
 
 @router.get("/settings", response_model=dict)
-async def get_site_settings(
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_site_settings():
     """取得所有網站設定（key-value 格式）"""
+    return await _cached(("site_settings",), ("system_settings",), _load_site_settings)
+
+
+async def _load_site_settings(conn: asyncpg.Connection) -> dict:
+    """讀取公開網站設定並做類型轉換"""
     rows = await conn.fetch("""
         SELECT setting_key, setting_value, setting_type 
         FROM system_settings 
@@ -129,77 +160,58 @@ async def get_site_settings(
 # ==================== Differentiators ====================
 
 @router.get("/differentiators", response_model=List[DifferentiatorResponse])
-async def get_differentiators(
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_differentiators():
     """取得所有啟用的特點項目（按順序）"""
-    rows = await conn.fetch("""
+    return await _cached_rows(("differentiators",), ("differentiators",), """
         SELECT * FROM differentiators 
         WHERE is_active = true 
         ORDER BY display_order ASC, id ASC
     """)
-    
-    return [dict(row) for row in rows]
 
 
 # ==================== Stats ====================
 
 @router.get("/stats", response_model=List[StatResponse])
-async def get_stats(
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_stats():
     """取得所有啟用的統計數據（按順序）"""
-    rows = await conn.fetch("""
+    return await _cached_rows(("stats",), ("stats",), """
         SELECT * FROM stats 
         WHERE is_active = true 
         ORDER BY display_order ASC, id ASC
     """)
-    
-    return [dict(row) for row in rows]
 
 
 # ==================== Client Logos ====================
 # 顯示在首頁 "Trusted by industry leaders" 區塊
 
 @router.get("/clients")
-async def get_client_logos(
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_client_logos():
     """取得所有啟用的客戶 Logo（按順序）- 顯示在首頁 "Trusted by industry leaders" 區塊"""
-    rows = await conn.fetch("""
+    return await _cached_rows(("client_logos",), ("client_logos",), """
         SELECT * FROM client_logos 
         WHERE is_active = true 
         ORDER BY display_order ASC, id ASC
     """)
-    
-    return [dict(row) for row in rows]
 
 
 # ==================== Publisher Features ====================
 
 @router.get("/publisher-features", response_model=List[PublisherFeatureResponse])
-async def get_publisher_features(
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_publisher_features():
     """取得所有啟用的 Publisher 功能（按順序）"""
-    rows = await conn.fetch("""
+    return await _cached_rows(("publisher_features",), ("publisher_features",), """
         SELECT * FROM publisher_features 
         WHERE is_active = true 
         ORDER BY display_order ASC, id ASC
     """)
-    
-    return [dict(row) for row in rows]
 
 
 # ==================== Hero Sections ====================
 
 @router.get("/hero/{page}", response_model=HeroSectionResponse)
-async def get_hero_section(
-    page: str,
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_hero_section(page: str):
     """取得指定頁面的 Hero 區塊內容"""
-    row = await conn.fetchrow("""
+    row = await _cached_row(("hero_section", page), ("hero_sections",), """
         SELECT * FROM hero_sections 
         WHERE page = $1 AND is_active = true
     """, page)
@@ -207,34 +219,27 @@ async def get_hero_section(
     if not row:
         raise HTTPException(status_code=404, detail="Hero section not found")
     
-    return dict(row)
+    return row
 
 
 # ==================== Hero Media Logos ====================
 
 @router.get("/hero/{page}/logos", response_model=List[HeroMediaLogoResponse])
-async def get_hero_media_logos(
-    page: str,
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_hero_media_logos(page: str):
     """取得指定頁面 Hero 的 Media Cloud Logos"""
-    rows = await conn.fetch("""
+    return await _cached_rows(("hero_media_logos", page), ("hero_media_logos",), """
         SELECT * FROM hero_media_logos 
         WHERE hero_page = $1 AND is_active = true 
         ORDER BY display_order ASC, id ASC
     """, page)
-    
-    return [dict(row) for row in rows]
 
 
 # ==================== Lyro Section ====================
 
 @router.get("/lyro", response_model=LyroSectionResponse)
-async def get_lyro_section(
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_lyro_section():
     """取得 Lyro Section 內容"""
-    row = await conn.fetchrow("""
+    row = await _cached_row(("lyro_section",), ("lyro_section",), """
         SELECT * FROM lyro_section 
         WHERE is_active = true 
         LIMIT 1
@@ -243,47 +248,36 @@ async def get_lyro_section(
     if not row:
         raise HTTPException(status_code=404, detail="Lyro section not found")
     
-    return dict(row)
+    return row
 
 
 @router.get("/lyro/features", response_model=List[LyroFeatureResponse])
-async def get_lyro_features(
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_lyro_features():
     """取得 Lyro 功能列表"""
-    rows = await conn.fetch("""
+    return await _cached_rows(("lyro_features",), ("lyro_features",), """
         SELECT * FROM lyro_features 
         WHERE is_active = true 
         ORDER BY display_order ASC, id ASC
     """)
-    
-    return [dict(row) for row in rows]
 
 
 # ==================== Carousel Logos ====================
 # 顯示在首頁跑馬燈區塊
 
 @router.get("/carousel-logos")
-async def get_carousel_logos(
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_carousel_logos():
     """取得所有啟用的跑馬燈 Logo（按順序）- 顯示在首頁跑馬燈區塊"""
-    rows = await conn.fetch("""
+    return await _cached_rows(("carousel_logos",), ("carousel_logos",), """
         SELECT * FROM carousel_logos 
         WHERE is_active = true 
         ORDER BY display_order ASC, id ASC
     """)
-    
-    return [dict(row) for row in rows]
 
 
 # ==================== Section Contents (JSONB) ====================
 
 @router.get("/sections/{section_key}")
-async def get_section_content(
-    section_key: str,
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_section_content(section_key: str):
     """
     取得指定 section 的內容（JSONB 格式）
     
@@ -291,7 +285,7 @@ async def get_section_content(
     - GET /public/content/sections/services
     - GET /public/content/sections/lyro
     """
-    row = await conn.fetchrow("""
+    row = await _cached_row(("section_content", section_key), ("section_contents",), """
         SELECT content 
         FROM section_contents 
         WHERE section_key = $1
@@ -311,12 +305,9 @@ async def get_section_content(
 # ==================== Navigation ====================
 
 @router.get("/navigation/items")
-async def get_navigation_items(
-    lang: str = 'en',
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_navigation_items(lang: Lang = 'en'):
     """取得 Navigation 選單項目"""
-    rows = await conn.fetch("""
+    return await _cached_rows(("navigation_items", lang), ("navigation_items",), """
         SELECT 
             id,
             CASE 
@@ -333,17 +324,12 @@ async def get_navigation_items(
         WHERE is_active = true 
         ORDER BY display_order ASC, id ASC
     """, lang)
-    
-    return [dict(row) for row in rows]
 
 
 @router.get("/navigation/cta")
-async def get_navigation_cta(
-    lang: str = 'en',
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_navigation_cta(lang: Lang = 'en'):
     """取得 Navigation CTA 按鈕"""
-    row = await conn.fetchrow("""
+    return await _cached_row(("navigation_cta", lang), ("navigation_cta",), """
         SELECT 
             CASE 
                 WHEN $1 = 'zh' THEN COALESCE(text_zh, text_en)
@@ -355,18 +341,22 @@ async def get_navigation_cta(
         WHERE is_active = true 
         LIMIT 1
     """, lang)
-    
-    return dict(row) if row else None
 
 
 # ==================== Footer ====================
 
 @router.get("/footer/sections")
-async def get_footer_sections(
-    lang: str = 'en',
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_footer_sections(lang: Lang = 'en'):
     """取得 Footer 區塊及連結"""
+    return await _cached(
+        ("footer_sections", lang),
+        ("footer_sections", "footer_links"),
+        lambda conn: _load_footer_sections(conn, lang)
+    )
+
+
+async def _load_footer_sections(conn: asyncpg.Connection, lang: str) -> List[dict]:
+    """讀取 Footer 區塊及其連結"""
     sections = await conn.fetch("""
         SELECT 
             id,
@@ -409,11 +399,17 @@ async def get_footer_sections(
 
 
 @router.get("/footer/text-settings")
-async def get_footer_text_settings(
-    lang: str = 'en',
-    conn: asyncpg.Connection = Depends(get_db_conn)
-):
+async def get_footer_text_settings(lang: Lang = 'en'):
     """取得 Footer 文字設定"""
+    return await _cached(
+        ("footer_text_settings", lang),
+        ("footer_text_settings",),
+        lambda conn: _load_footer_text_settings(conn, lang)
+    )
+
+
+async def _load_footer_text_settings(conn: asyncpg.Connection, lang: str) -> dict:
+    """讀取 Footer 文字設定（key-value 格式）"""
     rows = await conn.fetch("""
         SELECT 
             setting_key,
@@ -427,3 +423,137 @@ async def get_footer_text_settings(
     
     return {row['setting_key']: row['value'] for row in rows}
 
+
+# ==================== Bootstrap (Aggregated) ====================
+# 首頁首屏需要的所有內容一次回傳，取代前端十幾個 API 請求
+
+# bootstrap 文件依賴的所有資料表（任一變更都要重建）
+BOOTSTRAP_TABLES = (
+    "system_settings", "hero_sections", "hero_media_logos", "carousel_logos",
+    "stats", "differentiators", "testimonials", "faqs", "client_logos",
+    "navigation_items", "navigation_cta", "footer_sections", "footer_links",
+    "footer_text_settings", "section_contents",
+)
+
+
+@router.get("/bootstrap")
+async def get_bootstrap(request: Request, page: str = 'home', lang: Lang = 'en'):
+    """
+    取得頁面首屏所需的全部內容（單一請求）
+    
+    使用範例：
+    - GET /public/content/bootstrap?page=home&lang=en
+    
+    回傳已序列化的 JSON，`version` 為內容雜湊，內容不變時 version 不變；
+    `version` 同時作為 ETag，If-None-Match 相符時直接回 304；
+    page 必須是已建立的頁面（快取 key 不接受任意值）
+    """
+    if page not in await _get_known_pages():
+        raise HTTPException(status_code=404, detail=f"Page '{page}' not found")
+    
+    body, version = await content_cache.get_or_load(
+        ("bootstrap", page, lang),
+        lambda: _build_bootstrap(page, lang),
+        tags=BOOTSTRAP_TABLES
+    )
+    
+    etag = f'"{version}"'
+    if is_not_modified(request.headers, etag, None):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+async def _get_all_sections() -> dict:
+    """取得所有 JSONB section（section_key → content）"""
+    async def loader(conn: asyncpg.Connection):
+        rows = await conn.fetch("SELECT section_key, content FROM section_contents")
+        return {
+            row['section_key']: json.loads(row['content']) if isinstance(row['content'], str) else row['content']
+            for row in rows
+        }
+
+    return await _cached(("all_sections",), ("section_contents",), loader)
+
+
+async def _get_known_pages() -> frozenset:
+    """已建立 Hero 內容的頁面（home 一律可用）"""
+    async def loader(conn: asyncpg.Connection):
+        rows = await conn.fetch("""
+            SELECT page FROM hero_sections
+            UNION
+            SELECT hero_page FROM hero_media_logos
+        """)
+        return frozenset({'home'} | {row['page'] for row in rows})
+
+    return await _cached(("known_pages",), ("hero_sections", "hero_media_logos"), loader)
+
+
+def _project(model: Type[BaseModel], data: Any) -> Any:
+    """依區塊的 response_model 輸出欄位（與個別端點回傳的格式相同）"""
+    if data is None:
+        return None
+    if isinstance(data, list):
+        return [model.model_validate(item).model_dump(mode='json') for item in data]
+    return model.model_validate(data).model_dump(mode='json')
+
+
+async def _or_none(coro: Awaitable[Any]) -> Any:
+    """單一區塊不存在（404）時以 None 代替，不影響整份文件"""
+    try:
+        return await coro
+    except HTTPException as e:
+        if e.status_code == 404:
+            return None
+        raise
+
+
+async def _build_bootstrap(page: str, lang: str) -> Tuple[bytes, str]:
+    """並行讀取各區塊（各自走快取，miss 時各取一條連線），組成單一 JSON 文件"""
+    (
+        site_settings, hero, hero_logos, carousel_logos, stats, differentiators,
+        testimonials, faqs, clients, nav_items, nav_cta, footer_sections,
+        footer_text, sections
+    ) = await asyncio.gather(
+        get_site_settings(),
+        _or_none(get_hero_section(page)),
+        get_hero_media_logos(page),
+        get_carousel_logos(),
+        get_stats(),
+        get_differentiators(),
+        get_testimonials(),
+        get_faqs(),
+        get_client_logos(),
+        get_navigation_items(lang),
+        get_navigation_cta(lang),
+        get_footer_sections(lang),
+        get_footer_text_settings(lang),
+        _get_all_sections(),
+    )
+
+    document = jsonable_encoder({
+        "page": page,
+        "lang": lang,
+        "settings": site_settings,
+        "hero": _project(HeroSectionResponse, hero),
+        "hero_logos": _project(HeroMediaLogoResponse, hero_logos),
+        "carousel_logos": _project(CarouselLogoResponse, carousel_logos),
+        "stats": _project(StatResponse, stats),
+        "differentiators": _project(DifferentiatorResponse, differentiators),
+        "testimonials": _project(TestimonialResponse, testimonials),
+        "faqs": _project(FAQResponse, faqs),
+        "clients": _project(ClientLogoResponse, clients),
+        "navigation": {"items": nav_items, "cta": nav_cta},
+        "footer": {"sections": footer_sections, "text_settings": footer_text},
+        "sections": sections,
+    })
+
+    content = json.dumps(document, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    version = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+    body = json.dumps(
+        {"version": version, **document},
+        ensure_ascii=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+    return body, version
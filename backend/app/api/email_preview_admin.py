@@ -3,11 +3,12 @@ Admin Email Preview API
 """
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import HTMLResponse
-from typing import Literal
+from typing import Literal, Optional
 
 from app.utils.security import require_admin
 from app.models.user import TokenData
 from app.services.email_service import email_service
+from app.services.email_outbox import email_outbox
 from app.config import settings
 
 router = APIRouter(prefix="/api/admin/email-preview", tags=["Admin - Email Preview"])
@@ -26,7 +27,7 @@ SAMPLE_DATA = {
     'newsletter': {
         'email': 'subscriber@example.com',
         'blog_url': 'https://vortixpr.com/blog',
-        'unsubscribe_url': f"{settings.FRONTEND_URL}/newsletter/unsubscribe"
+        'unsubscribe_url': email_service.newsletter_unsubscribe_url('subscriber@example.com')
     },
     'template': {
         'template_title': 'Product Launch Pro',
@@ -104,6 +105,21 @@ async def list_email_templates(
     }
 
 
+@router.get("/outbox")
+async def list_outbox_emails(
+    status: Optional[Literal['queued', 'sending', 'sent', 'failed']] = None,
+    limit: int = 50,
+    current_user: TokenData = Depends(require_admin)
+):
+    """
+    List recent emails in the outbox (delivery status, attempts, last error)
+    """
+    return {
+        "emails": await email_outbox.list_emails(status, min(max(limit, 1), 200)),
+        "stats": email_outbox.stats()
+    }
+
+
 @router.get("/{template_type}", response_class=HTMLResponse)
 async def preview_email_template(
     template_type: Literal['contact', 'newsletter', 'template', 'invitation'],
@@ -100,25 +100,23 @@ async def create_invitation(
         # 設定過期時間（7 天）
         expires_at = datetime.utcnow() + timedelta(days=7)
         
-        # 創建邀請
-        inv = await conn.fetchrow("""
-            INSERT INTO user_invitations (email, role, token, invited_by, expires_at)
-            VALUES ($1, $2, $3, $4, $5)
-            RETURNING id, email, role, token, invited_by, status, expires_at, created_at, accepted_at
-        """, invitation.email, invitation.role, token, current_user.user_id, expires_at)
-        
-        # 發送邀請郵件
-        try:
+        async with conn.transaction():
+            # 創建邀請
+            inv = await conn.fetchrow("""
+                INSERT INTO user_invitations (email, role, token, invited_by, expires_at)
+                VALUES ($1, $2, $3, $4, $5)
+                RETURNING id, email, role, token, invited_by, status, expires_at, created_at, accepted_at
+            """, invitation.email, invitation.role, token, current_user.user_id, expires_at)
+            
+            # 邀請郵件寫入 outbox（與邀請一起 commit，由背景 worker 寄送）
             invitation_url = f"{settings.FRONTEND_URL}/register?invitation={token}"
             await email_service.send_invitation_email(
                 to_email=invitation.email,
                 inviter_name=current_user.email.split('@')[0],
                 invitation_url=invitation_url,
-                role=invitation.role
+                role=invitation.role,
+                conn=conn
             )
-        except Exception as e:
-            # 郵件發送失敗不影響邀請創建
-            logger.warning(f"Failed to send invitation email: {e}")
         
         return InvitationResponse(**dict(inv))
 
@@ -198,27 +196,29 @@ async def resend_invitation(
                 detail="只能重新發送待處理的邀請"
             )
         
-        # 延長過期時間
-        new_expires_at = datetime.utcnow() + timedelta(days=7)
-        await conn.execute("""
-            UPDATE user_invitations 
-            SET expires_at = $1
-            WHERE id = $2
-        """, new_expires_at, invitation_id)
-        
-        # 重新發送郵件
-        try:
+        async with conn.transaction():
+            # 延長過期時間
+            new_expires_at = datetime.utcnow() + timedelta(days=7)
+            await conn.execute("""
+                UPDATE user_invitations 
+                SET expires_at = $1
+                WHERE id = $2
+            """, new_expires_at, invitation_id)
+            
+            # 重新發送郵件（寫入 outbox）
             invitation_url = f"{settings.FRONTEND_URL}/register?invitation={invitation['token']}"
-            await email_service.send_invitation_email(
+            queued = await email_service.send_invitation_email(
                 to_email=invitation["email"],
                 inviter_name=current_user.email.split('@')[0],
                 invitation_url=invitation_url,
-                role=invitation["role"]
+                role=invitation["role"],
+                conn=conn
             )
-            return {"message": "Invitation email has been resent"}
-        except Exception as e:
+        
+        if not queued:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to send email: {str(e)}"
+                detail="Failed to send email: email service is not configured"
             )
+        return {"message": "Invitation email has been resent"}
 
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Form, Query, Request, Response
+from typing import List, Optional, Tuple
 from datetime import datetime
+import asyncio
 import logging
-import mimetypes
 from PIL import Image
-import io
 
 from ..core.database import db
 from ..models.media import MediaFile, MediaFileCreate, MediaFileUpdate
-from ..services.r2_storage import r2_storage
+from ..services.image_variants import image_variants, build_srcset
+from ..services.r2_storage import r2_storage, content_hash_from_key
+from ..services.r2_reconcile import reconcile_media_files
+from ..utils.streaming_upload import StreamedUpload, receive_upload
 
 router = APIRouter(prefix="/media")
 logger = logging.getLogger(__name__)
@@ -19,6 +21,16 @@ ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg'}
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB（合理的限制，支援高解析度圖片和動畫 GIF）
 
 
+async def _with_variants(conn, rows) -> List[dict]:
+    """附上每個檔案的衍生圖片與 srcset（一次查詢）"""
+    files = [dict(row) for row in rows]
+    variants = await image_variants.variants_for_urls(conn, [f['file_url'] for f in files])
+    for f in files:
+        f['variants'] = variants.get(f['file_url'], [])
+        f['srcset'] = build_srcset(f['variants'])
+    return files
+
+
 @router.post("/folders", status_code=201)
 async def create_folder(folder_name: str = Form(...)):
     """
@@ -47,11 +59,12 @@ async def create_folder(folder_name: str = Form(...)):
         keep_content = b"# This file is used to keep the folder in R2 storage"
         keep_key = f"{folder_name}/.keep"
         
-        upload_result = r2_storage.upload_file(
+        upload_result = await r2_storage.upload_file(
             file_content=keep_content,
             filename=".keep",
             folder=folder_name,
-            content_type="text/plain"
+            content_type="text/plain",
+            key=keep_key
         )
         
         # 儲存到資料庫
@@ -91,72 +104,112 @@ async def create_folder(folder_name: str = Form(...)):
         raise HTTPException(status_code=500, detail=f"創建資料夾失敗：{str(e)}")
 
 
-@router.post("/upload", response_model=MediaFile, status_code=201)
-async def upload_media(
-    file: UploadFile = File(...),
-    folder: str = Form("uploads"),
-    alt_text: Optional[str] = Form(None),
-    caption: Optional[str] = Form(None),
-):
+# upload_media 直接讀取 request stream（不使用 File/Form 參數），在此補上 OpenAPI 的 request body 說明
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "folder": {"type": "string", "default": "uploads"},
+                        "alt_text": {"type": "string"},
+                        "caption": {"type": "string"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+def probe_image_size(fileobj) -> Tuple[Optional[int], Optional[int]]:
+    """只讀取圖片 header 取得尺寸（PIL 的 Image.open 不會解碼像素資料）"""
+    try:
+        with Image.open(fileobj) as image:
+            return image.size
+    except Exception as e:
+        logger.warning(f"⚠️ Could not get image dimensions: {e}")
+        return None, None
+    finally:
+        fileobj.seek(0)
+
+
+@router.post("/upload", response_model=MediaFile, status_code=201, openapi_extra=UPLOAD_OPENAPI)
+async def upload_media(request: Request, response: Response):
     """
     上傳媒體檔案到 R2
     
+    表單欄位：file、folder（預設 uploads）、alt_text、caption
+    
     - 支援格式：jpg, jpeg, png, gif, webp, svg
-    - 最大大小：10MB
-    - 自動生成唯一檔名
+    - 最大大小：50MB（串流接收，超過時立即中止並回傳 413）
+    - 依內容 SHA-256 命名（content-addressed）
+    - 相同內容已上傳過時直接回傳既有記錄（200，不重新上傳）
+    - 大檔案以 multipart 分段上傳到 R2，不會整個載入記憶體
     - 儲存到資料庫
+    - responsive 縮圖在背景產生（回應中的 variants 為空，之後查詢時回傳）
     """
+    upload = await receive_upload(request, MAX_FILE_SIZE, allowed_extensions=ALLOWED_EXTENSIONS)
+    try:
+        return await _store_upload(upload, response)
+    finally:
+        upload.close()
+
+
+async def _store_upload(upload: StreamedUpload, response: Response) -> dict:
+    """上傳到 R2 並寫入 media_files"""
+    folder = upload.fields.get("folder") or "uploads"
+    alt_text = upload.fields.get("alt_text") or None
+    caption = upload.fields.get("caption") or None
+    digest = upload.content_hash
     
-    # 檢查檔案副檔名
-    file_ext = f".{file.filename.rsplit('.', 1)[-1].lower()}" if '.' in file.filename else ''
-    if file_ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"不支援的檔案格式。允許的格式：{', '.join(ALLOWED_EXTENSIONS)}"
-        )
-    
-    # 讀取檔案內容
-    content = await file.read()
-    file_size = len(content)
+    if upload.size == 0:
+        raise HTTPException(status_code=400, detail="檔案是空的")
     
-    # 檢查檔案大小
-    if file_size > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=400,
-            detail=f"檔案太大。最大允許大小：{MAX_FILE_SIZE / 1024 / 1024}MB"
+    # 相同內容已存在 → 直接回傳既有記錄
+    async with db.pool.acquire() as conn:
+        existing = await conn.fetchrow(
+            "SELECT * FROM media_files WHERE content_hash = $1",
+            digest
         )
-    
-    if file_size == 0:
-        raise HTTPException(status_code=400, detail="檔案是空的")
+        
+        if existing:
+            logger.info(f"♻️ Duplicate upload, reusing {existing['file_key']}")
+            response.status_code = 200
+            return (await _with_variants(conn, [existing]))[0]
     
     try:
         # 獲取圖片尺寸
-        width, height = None, None
-        try:
-            image = Image.open(io.BytesIO(content))
-            width, height = image.size
+        width, height = await asyncio.to_thread(probe_image_size, upload.file)
+        if width:
             logger.info(f"📐 Image dimensions: {width} x {height}")
-        except Exception as e:
-            logger.warning(f"⚠️ Could not get image dimensions: {e}")
         
-        # 上傳到 R2
-        upload_result = r2_storage.upload_file(
-            file_content=content,
-            filename=file.filename,
+        # 上傳到 R2（直接讀取暫存檔）
+        upload_result = await r2_storage.upload_file(
+            file_content=upload.file,
+            filename=upload.filename,
             folder=folder,
-            content_type=file.content_type
+            content_type=upload.content_type,
+            digest=digest
         )
         
         # 儲存記錄到資料庫（包含尺寸）
+        # 同時上傳相同檔案時，後到的請求取得先寫入的記錄
         async with db.pool.acquire() as conn:
             row = await conn.fetchrow(
                 """
                 INSERT INTO media_files (
                     filename, original_filename, file_key, file_url,
                     file_size, mime_type, folder, alt_text, caption, uploaded_by,
-                    width, height
+                    width, height, content_hash
                 )
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+                ON CONFLICT (content_hash) DO UPDATE
+                SET updated_at = media_files.updated_at
                 RETURNING *
                 """,
                 upload_result['key'].split('/')[-1],  # filename
@@ -170,15 +223,24 @@ async def upload_media(
                 caption,
                 "admin",
                 width,
-                height
+                height,
+                digest
             )
         
         logger.info(f"✅ Media file uploaded and saved: {upload_result['key']}")
-        return dict(row)
         
     except Exception as e:
         logger.error(f"❌ Failed to upload media: {e}")
         raise HTTPException(status_code=500, detail=f"上傳失敗：{str(e)}")
+    
+    # 在背景從 R2 讀取原圖產生 responsive 縮圖（不在請求中讀取整個檔案；完成前讀取時回傳原圖）
+    media_file = dict(row)
+    if upload.size <= image_variants.max_source_bytes:
+        image_variants.schedule(media_file['file_url'], media_file_id=media_file['id'])
+    
+    media_file['variants'] = []
+    media_file['srcset'] = {}
+    return media_file
 
 
 @router.get("/files", response_model=List[MediaFile])
@@ -216,8 +278,8 @@ async def get_media_files(
             """,
             *params, limit
         )
-    
-    return [dict(row) for row in rows]
+        
+        return await _with_variants(conn, rows)
 
 
 @router.get("/files/{file_id}", response_model=MediaFile)
@@ -229,11 +291,11 @@ async def get_media_file(file_id: int):
             "SELECT * FROM media_files WHERE id = $1",
             file_id
         )
-    
-    if not row:
-        raise HTTPException(status_code=404, detail="Media file not found")
-    
-    return dict(row)
+        
+        if not row:
+            raise HTTPException(status_code=404, detail="Media file not found")
+        
+        return (await _with_variants(conn, [row]))[0]
 
 
 @router.patch("/files/{file_id}", response_model=MediaFile)
@@ -270,21 +332,26 @@ async def update_media_file(file_id: int, update: MediaFileUpdate):
             """,
             *params
         )
-    
-    if not row:
-        raise HTTPException(status_code=404, detail="Media file not found")
-    
-    return dict(row)
+        
+        if not row:
+            raise HTTPException(status_code=404, detail="Media file not found")
+        
+        return (await _with_variants(conn, [row]))[0]
 
 
 @router.delete("/files/{file_id}", status_code=204)
 async def delete_media_file(file_id: int):
-    """刪除媒體檔案（從 R2 和資料庫）"""
+    """
+    刪除媒體檔案（從 R2 和資料庫）
+    
+    content-addressed 物件（相同內容共用一個 R2 物件）可能被文章 HTML、封面、Logo 等
+    直接以 URL 引用，無法可靠計算引用數，因此只刪除媒體庫記錄、保留 R2 物件與衍生圖片。
+    """
     
     async with db.pool.acquire() as conn:
         # 先獲取檔案資訊
         row = await conn.fetchrow(
-            "SELECT file_key FROM media_files WHERE id = $1",
+            "SELECT file_key, file_url FROM media_files WHERE id = $1",
             file_id
         )
         
@@ -293,8 +360,22 @@ async def delete_media_file(file_id: int):
         
         file_key = row['file_key']
         
-        # 從 R2 刪除
-        r2_storage.delete_file(file_key)
+        # 舊的非 content-addressed 物件：仍被 Notion 同步的文章或衍生圖片使用時保留
+        shared = content_hash_from_key(file_key) is not None
+        in_use = shared or await conn.fetchval(
+            """
+            SELECT EXISTS(SELECT 1 FROM notion_image_map WHERE r2_key = $1)
+                OR EXISTS(SELECT 1 FROM media_variants WHERE file_key = $1)
+            """,
+            file_key
+        )
+        
+        # 從 R2 刪除（連同衍生圖片）
+        if in_use:
+            logger.info(f"♻️ R2 object kept (shared / still referenced): {file_key}")
+        else:
+            await r2_storage.delete_file(file_key)
+            await image_variants.delete_variants(conn, row['file_url'])
         
         # 從資料庫刪除
         await conn.execute(
@@ -356,107 +437,18 @@ async def sync_from_r2():
     """
     掃描 R2 並匯入所有檔案到資料庫
     
-    - 掃描 R2 bucket 中的所有檔案
-    - 匯入到資料庫（已存在的會跳過）
+    - 分頁掃描 R2 bucket 中的所有檔案（不受單次 1000 筆限制）
+    - 匯入到資料庫（已存在的會跳過，衍生縮圖不匯入）
+    - 圖片尺寸只讀取檔頭（Range GET）
     - 返回匯入統計
     """
     try:
-        # 列出 R2 所有檔案
-        response = r2_storage.s3_client.list_objects_v2(
-            Bucket=r2_storage.bucket_name
-        )
-        
-        if 'Contents' not in response:
-            return {
-                "message": "R2 bucket 是空的",
-                "imported": 0,
-                "skipped": 0,
-                "total": 0
-            }
-        
-        total_files = len(response['Contents'])
-        imported_count = 0
-        skipped_count = 0
-        
-        async with db.pool.acquire() as conn:
-            for obj in response['Contents']:
-                file_key = obj['Key']
-                file_size = obj['Size']
-                last_modified = obj['LastModified']
-                
-                # 解析資料夾和檔名
-                if '/' in file_key:
-                    folder = '/'.join(file_key.split('/')[:-1])
-                    filename = file_key.split('/')[-1]
-                else:
-                    folder = 'uploads'
-                    filename = file_key
-                
-                # 跳過已存在的檔案
-                exists = await conn.fetchval(
-                    "SELECT id FROM media_files WHERE file_key = $1",
-                    file_key
-                )
-                
-                if exists:
-                    skipped_count += 1
-                    continue
-                
-                # 偵測 MIME 類型
-                mime_type, _ = mimetypes.guess_type(filename)
-                mime_type = mime_type or 'application/octet-stream'
-                
-                # 生成公開 URL
-                file_url = r2_storage.get_file_url(file_key)
-                
-                # 嘗試獲取圖片尺寸
-                width, height = None, None
-                if mime_type.startswith('image/'):
-                    try:
-                        obj_data = r2_storage.s3_client.get_object(
-                            Bucket=r2_storage.bucket_name,
-                            Key=file_key
-                        )
-                        content = obj_data['Body'].read()
-                        image = Image.open(io.BytesIO(content))
-                        width, height = image.size
-                    except:
-                        pass
-                
-                # 插入資料庫
-                await conn.execute(
-                    """
-                    INSERT INTO media_files (
-                        filename, original_filename, file_key, file_url,
-                        file_size, mime_type, folder, uploaded_by, created_at,
-                        width, height
-                    )
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-                    """,
-                    filename,
-                    filename,
-                    file_key,
-                    file_url,
-                    file_size,
-                    mime_type,
-                    folder,
-                    "synced",
-                    last_modified.replace(tzinfo=None),
-                    width,
-                    height
-                )
-                
-                imported_count += 1
-        
-        logger.info(f"✅ R2 sync completed: {imported_count} imported, {skipped_count} skipped")
-        
-        return {
-            "message": "同步完成",
-            "imported": imported_count,
-            "skipped": skipped_count,
-            "total": total_files
-        }
-        
+        stats = await reconcile_media_files()
     except Exception as e:
         logger.error(f"❌ R2 sync failed: {e}")
         raise HTTPException(status_code=500, detail=f"同步失敗：{str(e)}")
+    
+    if stats["total"] == 0:
+        return {"message": "R2 bucket 是空的", **stats}
+    
+    return {"message": "同步完成", **stats}
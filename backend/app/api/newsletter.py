@@ -1,9 +1,12 @@
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import HTMLResponse
+import html
 import logging
 
 from ..core.database import db
 from ..models.newsletter import NewsletterSubscribe
 from ..services.email_service import email_service
+from ..utils.security import verify_unsubscribe_token
 
 router = APIRouter(prefix="/newsletter")
 logger = logging.getLogger(__name__)
@@ -25,42 +28,35 @@ async def subscribe_newsletter(subscription: NewsletterSubscribe, request: Reque
         if existing:
             # 如果之前取消訂閱，重新啟用
             if existing["status"] == "unsubscribed":
-                await conn.execute(
-                    """
-                    UPDATE newsletter_subscribers
-                    SET status = 'active', unsubscribed_at = NULL
-                    WHERE email = $1
-                    """,
-                    subscription.email
-                )
-                
-                # 重新訂閱也發送歡迎郵件
-                try:
-                    await email_service.send_newsletter_welcome(subscription.email)
-                except Exception as e:
-                    logger.error(f"Failed to send welcome email: {e}")
+                async with conn.transaction():
+                    await conn.execute(
+                        """
+                        UPDATE newsletter_subscribers
+                        SET status = 'active', unsubscribed_at = NULL
+                        WHERE email = $1
+                        """,
+                        subscription.email
+                    )
+                    
+                    # 重新訂閱也發送歡迎郵件（寫入 outbox，與訂閱狀態一起 commit）
+                    await email_service.send_newsletter_welcome(subscription.email, conn=conn)
                 
                 return {"message": "Re-subscribed successfully"}
             else:
                 return {"message": "Already subscribed"}
         
-        # 新訂閱
-        await conn.execute(
-            """
-            INSERT INTO newsletter_subscribers (email, source, ip_address)
-            VALUES ($1, $2, $3)
-            """,
-            subscription.email,
-            subscription.source,
-            ip_address
-        )
-    
-    # 發送歡迎 Email
-    try:
-        await email_service.send_newsletter_welcome(subscription.email)
-    except Exception as e:
-        logger.error(f"Failed to send welcome email: {e}")
-        # 不影響訂閱，即使郵件發送失敗
+        # 新訂閱 + 歡迎 Email（寫入 outbox，由背景 worker 寄送）
+        async with conn.transaction():
+            await conn.execute(
+                """
+                INSERT INTO newsletter_subscribers (email, source, ip_address)
+                VALUES ($1, $2, $3)
+                """,
+                subscription.email,
+                subscription.source,
+                ip_address
+            )
+            await email_service.send_newsletter_welcome(subscription.email, conn=conn)
     
     return {"message": "Subscribed successfully"}
 
@@ -84,3 +80,74 @@ async def unsubscribe_newsletter(email: str):
     
     return {"message": "Unsubscribed successfully"}
 
+
+
+# ==================== 郵件退訂連結 ====================
+# List-Unsubscribe 與郵件內的退訂連結都指向 /unsubscribe/one-click?email=...&token=...
+# GET 只顯示確認頁（郵件掃描器會預先開啟連結，不能直接退訂），
+# POST 才退訂：確認頁的表單與 RFC 8058 one-click（List-Unsubscribe-Post）共用
+
+def _unsubscribe_page(title: str, message: str, form: bool = False, status_code: int = 200) -> HTMLResponse:
+    """退訂確認 / 結果頁"""
+    button = (
+        '<form method="post"><button type="submit" '
+        'style="background:#ea580c;color:#fff;border:0;border-radius:6px;padding:10px 20px;font-size:16px;cursor:pointer;">'
+        'Unsubscribe</button></form>'
+        if form else ''
+    )
+    return HTMLResponse(
+        content=(
+            '<!DOCTYPE html><html><head><meta charset="utf-8">'
+            '<meta name="viewport" content="width=device-width, initial-scale=1">'
+            f'<title>{title}</title></head>'
+            '<body style="font-family:sans-serif;max-width:480px;margin:80px auto;padding:0 20px;text-align:center;color:#333;">'
+            f'<h1 style="font-size:22px;">{title}</h1><p>{message}</p>{button}</body></html>'
+        ),
+        status_code=status_code
+    )
+
+
+def _invalid_unsubscribe_link() -> HTMLResponse:
+    return _unsubscribe_page(
+        "Invalid link",
+        "This unsubscribe link is invalid. Please use the link from the latest newsletter email.",
+        status_code=403
+    )
+
+
+@router.get("/unsubscribe/one-click", response_class=HTMLResponse)
+async def unsubscribe_confirm_page(email: str, token: str):
+    """郵件退訂連結：顯示確認頁"""
+    if not verify_unsubscribe_token(email, token):
+        return _invalid_unsubscribe_link()
+    
+    return _unsubscribe_page(
+        "Unsubscribe from VortixPR Newsletter",
+        f"Stop sending newsletter emails to <strong>{html.escape(email)}</strong>?",
+        form=True
+    )
+
+
+@router.post("/unsubscribe/one-click", response_class=HTMLResponse)
+async def unsubscribe_one_click(email: str, token: str):
+    """郵件退訂連結：確認退訂（重複退訂也回成功）"""
+    if not verify_unsubscribe_token(email, token):
+        return _invalid_unsubscribe_link()
+    
+    async with db.pool.acquire() as conn:
+        result = await conn.execute(
+            """
+            UPDATE newsletter_subscribers
+            SET status = 'unsubscribed', unsubscribed_at = NOW()
+            WHERE email = $1 AND status = 'active'
+            """,
+            email
+        )
+    
+    if result != "UPDATE 0":
+        logger.info(f"📭 Newsletter unsubscribed via email link: {email}")
+    
+    return _unsubscribe_page(
+        "You have been unsubscribed",
+        f"<strong>{html.escape(email)}</strong> will no longer receive VortixPR newsletter emails."
+    )
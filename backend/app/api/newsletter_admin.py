@@ -1,10 +1,16 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional
 
 from ..core.database import db
-from ..models.newsletter import NewsletterSubscriber
+from ..models.user import TokenData
+from ..models.newsletter import (
+    NewsletterSubscriber, NewsletterCampaignCreate, NewsletterCampaign, NewsletterCampaignRecipient
+)
+from ..services.newsletter_broadcast import newsletter_broadcast
+from ..utils.security import require_admin, require_super_admin
 
-router = APIRouter(prefix="/newsletter")
+# 所有端點需管理員權限；寄送 campaign 需超級管理員
+router = APIRouter(prefix="/newsletter", dependencies=[Depends(require_admin)])
 
 
 @router.get("/subscribers", response_model=List[NewsletterSubscriber])
@@ -122,6 +128,101 @@ async def get_newsletter_stats():
     return dict(stats)
 
 
+# ==================== 群發 Campaign ====================
 
+def _campaign_response(row) -> dict:
+    return {**dict(row), "is_running": newsletter_broadcast.is_running(row["id"])}
 
 
+@router.post("/campaigns", response_model=NewsletterCampaign, status_code=201)
+async def create_campaign(campaign: NewsletterCampaignCreate):
+    """建立群發（草稿，需另外呼叫 send 開始寄送）"""
+    
+    async with db.pool.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            INSERT INTO newsletter_campaigns (subject, content_html, segment_source)
+            VALUES ($1, $2, $3)
+            RETURNING *
+            """,
+            campaign.subject,
+            campaign.content_html,
+            campaign.segment_source
+        )
+    
+    return _campaign_response(row)
+
+
+@router.get("/campaigns", response_model=List[NewsletterCampaign])
+async def get_campaigns(limit: int = Query(50, ge=1, le=200)):
+    """取得群發列表（含寄送進度）"""
+    
+    async with db.pool.acquire() as conn:
+        rows = await conn.fetch(
+            "SELECT * FROM newsletter_campaigns ORDER BY created_at DESC LIMIT $1",
+            limit
+        )
+    
+    return [_campaign_response(row) for row in rows]
+
+
+@router.get("/campaigns/{campaign_id}", response_model=NewsletterCampaign)
+async def get_campaign(campaign_id: int):
+    """取得單個群發（含寄送進度）"""
+    
+    async with db.pool.acquire() as conn:
+        row = await conn.fetchrow("SELECT * FROM newsletter_campaigns WHERE id = $1", campaign_id)
+    
+    if not row:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    
+    return _campaign_response(row)
+
+
+@router.get("/campaigns/{campaign_id}/recipients", response_model=List[NewsletterCampaignRecipient])
+async def get_campaign_recipients(
+    campaign_id: int,
+    status: str = Query("failed", pattern="^(all|sent|failed)$"),
+    limit: int = Query(100, ge=1, le=500)
+):
+    """取得群發收件人的寄送結果（預設只列出失敗）"""
+    
+    async with db.pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT subscriber_id, email, status, provider_message_id, error, processed_at
+            FROM newsletter_campaign_recipients
+            WHERE campaign_id = $1 AND ($2 = 'all' OR status = $2)
+            ORDER BY processed_at DESC
+            LIMIT $3
+            """,
+            campaign_id, status, limit
+        )
+    
+    return [dict(row) for row in rows]
+
+
+@router.post("/campaigns/{campaign_id}/send", status_code=202)
+async def send_campaign(
+    campaign_id: int,
+    current_user: TokenData = Depends(require_super_admin)
+):
+    """開始 / 續傳寄送（已寄送的收件人會跳過，需超級管理員）"""
+    
+    if newsletter_broadcast.is_running(campaign_id):
+        raise HTTPException(status_code=409, detail="Campaign is already sending")
+    
+    if not await newsletter_broadcast.start(campaign_id):
+        raise HTTPException(status_code=400, detail="Campaign not found or already completed")
+    
+    return {"message": "Campaign sending started", "campaign_id": campaign_id}
+
+
+@router.post("/campaigns/{campaign_id}/pause")
+async def pause_campaign(campaign_id: int):
+    """暫停寄送（進行中的 batch 完成後停止）"""
+    
+    if not await newsletter_broadcast.pause(campaign_id):
+        raise HTTPException(status_code=400, detail="Campaign is not sending")
+    
+    return {"message": "Campaign paused", "campaign_id": campaign_id}
@@ -126,6 +126,7 @@ async def create_category(category: PRCategoryCreate):
         if isinstance(cat_dict['badges'], str):
             cat_dict['badges'] = json.loads(cat_dict['badges'])
         
+        await db.notify_content_change("pr_package_categories", conn=conn)
         return cat_dict
 
 
@@ -177,6 +178,7 @@ async def update_category(category_id: str, category: PRCategoryUpdate):
         if isinstance(cat_dict['badges'], str):
             cat_dict['badges'] = json.loads(cat_dict['badges'])
         
+        await db.notify_content_change("pr_package_categories", conn=conn)
         return cat_dict
 
 
@@ -206,6 +208,7 @@ async def delete_category(category_id: str):
         if result == "DELETE 0":
             raise HTTPException(status_code=404, detail="Category not found")
         
+        await db.notify_content_change("pr_package_categories", conn=conn)
         return None
 
 
@@ -1,133 +1,38 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import List, Literal, Optional
 import json
 
 from ..core.database import db
+from ..core.http_cache import is_not_modified
 from ..models.pr_package import PRPackage
 from ..models.pr_package_frontend import PRPackageCategoryFrontend
+from ..services.pr_catalog_snapshot import pr_catalog_snapshots
 
 router = APIRouter(prefix="/pr-packages")
 
 
 @router.get("/", response_model=List[PRPackageCategoryFrontend])
 async def get_pr_packages_by_category(
-    status: str = "active",
-    audience: Optional[str] = Query(None, description="Filter by audience: ai, crypto, or both"),
+    request: Request,
+    status: str = Query("active", pattern="^(active|inactive|all)$"),
+    audience: Optional[Literal['crypto', 'ai', 'both']] = Query(None, description="Filter by audience: ai, crypto, or both"),
 ):
-    """取得所有 PR Packages（按分類組織）"""
-
-    async with db.pool.acquire() as conn:
-        if audience is not None:
-            # Filter: packages whose audience matches OR is 'both'
-            if status == "all":
-                rows = await conn.fetch(
-                    """
-                    SELECT * FROM pr_packages
-                    WHERE (audience = $1 OR audience = 'both')
-                    ORDER BY category_order, display_order, id
-                    """,
-                    audience
-                )
-            else:
-                rows = await conn.fetch(
-                    """
-                    SELECT * FROM pr_packages
-                    WHERE status = $1
-                      AND (audience = $2 OR audience = 'both')
-                    ORDER BY category_order, display_order, id
-                    """,
-                    status,
-                    audience
-                )
-        elif status == "all":
-            rows = await conn.fetch(
-                """
-                SELECT * FROM pr_packages
-                ORDER BY category_order, display_order, id
-                """
-            )
-        else:
-            rows = await conn.fetch(
-                """
-                SELECT * FROM pr_packages
-                WHERE status = $1
-                ORDER BY category_order, display_order, id
-                """,
-                status
-            )
-    
-    # 處理 JSONB 欄位並按 category 分組
-    packages_by_category = {}
-    
-    for row in rows:
-        package_dict = dict(row)
-        
-        # 解析 JSON 欄位
-        if isinstance(package_dict['features'], str):
-            package_dict['features'] = json.loads(package_dict['features'])
-        if isinstance(package_dict['media_logos'], str):
-            package_dict['media_logos'] = json.loads(package_dict['media_logos'])
-        if package_dict['detailed_info'] and isinstance(package_dict['detailed_info'], str):
-            package_dict['detailed_info'] = json.loads(package_dict['detailed_info'])
-        
-        # 轉換欄位名稱為 camelCase（匹配前端）
-        # 處理 detailedInfo 的 cta_text → ctaText
-        detailed_info = None
-        if package_dict['detailed_info']:
-            detailed_info = package_dict['detailed_info'].copy()
-            if 'cta_text' in detailed_info:
-                detailed_info['ctaText'] = detailed_info.pop('cta_text')
-        
-        frontend_package = {
-            "id": package_dict['slug'],
-            "slug": package_dict['slug'],
-            "name": package_dict['name'],
-            "price": package_dict['price'],
-            "description": package_dict['description'],
-            "features": package_dict['features'],
-            "badge": package_dict['badge'],
-            "guaranteedPublications": package_dict['guaranteed_publications'],
-            "mediaLogos": package_dict['media_logos'],
-            "detailedInfo": detailed_info,
-            "audience": package_dict.get('audience', 'crypto'),
-        }
-        
-        category_id = package_dict['category_id']
-        
-        if category_id not in packages_by_category:
-            packages_by_category[category_id] = []
-        
-        packages_by_category[category_id].append(frontend_package)
-    
-    # 從資料庫獲取分類資訊（動態載入，不再寫死）
-    async with db.pool.acquire() as conn:
-        category_rows = await conn.fetch(
-            """
-            SELECT category_id, title, badges
-            FROM pr_package_categories
-            ORDER BY display_order, id
-            """
-        )
-    
-    categories = []
-    for cat_row in category_rows:
-        category_id = cat_row['category_id']
-        
-        # 解析 badges
-        badges = cat_row['badges']
-        if isinstance(badges, str):
-            badges = json.loads(badges)
-        
-        # 如果該分類有 packages，才加入結果
-        if category_id in packages_by_category:
-            categories.append({
-                "id": category_id,
-                "title": cat_row['title'],
-                "badges": badges,
-                "packages": packages_by_category[category_id]
-            })
-    
-    return categories
+    """
+    取得所有 PR Packages（按分類組織）
+    
+    直接回傳預先序列化的目錄快照（pr_catalog_snapshots），
+    只有 Admin 修改 packages / categories 時才重建
+    """
+    snapshot = await pr_catalog_snapshots.get(status, audience)
+    
+    if is_not_modified(request.headers, snapshot.etag, None):
+        return Response(status_code=304, headers={"ETag": snapshot.etag})
+    
+    return Response(
+        content=snapshot.body,
+        media_type="application/json",
+        headers={"ETag": snapshot.etag}
+    )
 
 
 @router.get("/{slug}", response_model=PRPackage)
@@ -127,6 +127,7 @@ async def create_pr_package(package: PRPackageCreate):
     if package_dict['detailed_info'] and isinstance(package_dict['detailed_info'], str):
         package_dict['detailed_info'] = json.loads(package_dict['detailed_info'])
     
+    await db.notify_content_change("pr_packages")
     return package_dict
 
 
@@ -190,6 +191,7 @@ async def update_pr_package(package_id: int, package: PRPackageUpdate):
     if package_dict['detailed_info'] and isinstance(package_dict['detailed_info'], str):
         package_dict['detailed_info'] = json.loads(package_dict['detailed_info'])
     
+    await db.notify_content_change("pr_packages")
     return package_dict
 
 
@@ -206,6 +208,7 @@ async def delete_pr_package(package_id: int):
     if result == "DELETE 0":
         raise HTTPException(status_code=404, detail="PR Package not found")
     
+    await db.notify_content_change("pr_packages")
     return None
 
 
@@ -244,5 +247,6 @@ async def update_package_category(
         if not row:
             raise HTTPException(status_code=404, detail="PR Package not found")
         
+        await db.notify_content_change("pr_packages", conn=conn)
         return {"message": "Package category updated", "package": dict(row)}
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List, Optional
 import logging
 import json
@@ -6,6 +6,7 @@ import secrets
 from datetime import datetime
 
 from ..core.database import db
+from ..core.http_cache import is_not_modified, watermark_etag
 from ..models.pr_template import (
     PRTemplateResponse,
     WaitlistCreate,
@@ -55,6 +56,8 @@ async def get_template_stats():
 
 @router.get("/templates", response_model=List[PRTemplateResponse])
 async def get_templates(
+    request: Request,
+    response: Response,
     category: Optional[str] = None,
     industry: Optional[str] = None,
     search: Optional[str] = None,
@@ -68,8 +71,20 @@ async def get_templates(
     - industry: 產業篩選（Tech, SaaS, etc.）
     - search: 關鍵字搜尋
     - sort: 排序方式（popular, latest, name）
+    
+    資料水位（含 download / preview 等計數）未變時不查詢，直接回 304
     """
     async with db.pool.acquire() as conn:
+        watermark = await conn.fetchrow("""
+            SELECT COUNT(*), MAX(updated_at),
+                   SUM(download_count + email_request_count + preview_count + waitlist_count)
+            FROM pr_templates
+        """)
+        etag = watermark_etag(tuple(watermark), request.url.query)
+        if is_not_modified(request.headers, etag, None):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        
         # Base query
         query = """
             SELECT id, title, description, category, category_color, icon,
@@ -278,33 +293,35 @@ async def request_template_email(
         client_ip = request.client.host if request.client else "unknown"
         user_agent = request.headers.get("user-agent", "unknown")
         
-        # 記錄請求
-        await conn.execute("""
-            INSERT INTO template_email_requests (
-                template_id, email, tracking_id, ip_address, user_agent
+        async with conn.transaction():
+            # 記錄請求
+            await conn.execute("""
+                INSERT INTO template_email_requests (
+                    template_id, email, tracking_id, ip_address, user_agent
+                )
+                VALUES ($1, $2, $3, $4, $5)
+            """, template_id, data.email, tracking_id, client_ip, user_agent)
+            
+            # 更新模板的 email_request_count
+            await conn.execute("""
+                UPDATE pr_templates 
+                SET email_request_count = email_request_count + 1
+                WHERE id = $1
+            """, template_id)
+            
+            # 發送 Email（寫入 outbox，由背景 worker 透過 Resend 寄送）
+            email_queued = await email_service.send_template_email(
+                to_email=data.email,
+                template_title=template["title"],
+                template_content=template["content"],
+                tracking_id=tracking_id,
+                conn=conn
             )
-            VALUES ($1, $2, $3, $4, $5)
-        """, template_id, data.email, tracking_id, client_ip, user_agent)
-        
-        # 更新模板的 email_request_count
-        await conn.execute("""
-            UPDATE pr_templates 
-            SET email_request_count = email_request_count + 1
-            WHERE id = $1
-        """, template_id)
-        
-        # 發送 Email（使用 Resend）
-        email_sent = await email_service.send_template_email(
-            to_email=data.email,
-            template_title=template["title"],
-            template_content=template["content"],
-            tracking_id=tracking_id
-        )
         
-        if email_sent:
-            logger.info(f"✅ Email sent successfully: {data.email} for {template['title']}")
+        if email_queued:
+            logger.info(f"📮 Email queued: {data.email} for {template['title']}")
         else:
-            logger.warning(f"⚠️ Email sending failed but request recorded: {data.email}")
+            logger.warning(f"⚠️ Email not queued but request recorded: {data.email}")
         
         return EmailRequestResponse(
             success=True,
@@ -1,18 +1,25 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from typing import List
 import json
 
 from ..core.database import db
+from ..core.http_cache import is_not_modified, watermark_etag
 from ..models.pricing import PricingPackage
 
 router = APIRouter(prefix="/pricing")
 
 
 @router.get("/packages", response_model=List[PricingPackage])
-async def get_pricing_packages(status: str = "active"):
-    """取得所有定價方案"""
+async def get_pricing_packages(request: Request, response: Response, status: str = "active"):
+    """取得所有定價方案（資料水位未變時不查詢，直接回 304）"""
     
     async with db.pool.acquire() as conn:
+        watermark = await conn.fetchrow("SELECT COUNT(*), MAX(updated_at) FROM pricing_packages")
+        etag = watermark_etag(tuple(watermark), status)
+        if is_not_modified(request.headers, etag, None):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        
         if status == "all":
             rows = await conn.fetch(
                 """
@@ -72,6 +72,7 @@ async def create_pricing_package(package: PricingPackageCreate):
     package_dict = dict(row)
     if isinstance(package_dict['features'], str):
         package_dict['features'] = json.loads(package_dict['features'])
+    await db.notify_content_change("pricing_packages")
     return package_dict
 
 
@@ -123,6 +124,7 @@ async def update_pricing_package(package_id: int, package: PricingPackageUpdate)
     package_dict = dict(row)
     if isinstance(package_dict['features'], str):
         package_dict['features'] = json.loads(package_dict['features'])
+    await db.notify_content_change("pricing_packages")
     return package_dict
 
 
@@ -139,6 +141,7 @@ async def delete_pricing_package(package_id: int):
     if result == "DELETE 0":
         raise HTTPException(status_code=404, detail="Pricing package not found")
     
+    await db.notify_content_change("pricing_packages")
     return None
 
 
@@ -56,6 +56,7 @@ async def update_setting(
             WHERE setting_key = $3
         """, data.setting_value, current_user.user_id, setting_key)
         
+        await db.notify_content_change("system_settings", conn=conn)
         return {
             "message": "設定已更新",
             "setting_key": setting_key,
@@ -6,7 +6,7 @@ from pydantic import BaseModel
 from typing import List, Optional
 import asyncpg
 
-from ..core.database import Database
+from ..core.database import Database, db
 from ..utils.security import require_admin
 from ..models.user import TokenData
 
@@ -130,6 +130,7 @@ async def create_navigation_item(
     """, data.label_en, data.label_zh, data.label_ja, data.desktop_url, data.mobile_url,
         data.target, data.parent_id, data.display_order, data.is_active)
     
+    await db.notify_content_change("navigation_items", conn=conn)
     return dict(row)
 
 
@@ -179,6 +180,7 @@ async def update_navigation_item(
     if not row:
         raise HTTPException(status_code=404, detail="Navigation item not found")
     
+    await db.notify_content_change("navigation_items", conn=conn)
     return dict(row)
 
 
@@ -193,6 +195,7 @@ async def delete_navigation_item(
         DELETE FROM navigation_items WHERE id = $1
     """, item_id)
     
+    await db.notify_content_change("navigation_items", conn=conn)
     return {"message": "Navigation item deleted successfully"}
 
 
@@ -259,6 +262,7 @@ async def update_navigation_cta(
         
         row = await conn.fetchrow(query, *values)
     
+    await db.notify_content_change("navigation_cta", conn=conn)
     return dict(row)
 
 
@@ -306,6 +310,7 @@ async def create_footer_section(
     """, data.section_key, data.title_en, data.title_zh, data.title_ja,
         data.display_order, data.is_active)
     
+    await db.notify_content_change("footer_sections", conn=conn)
     return dict(row)
 
 
@@ -345,6 +350,7 @@ async def update_footer_section(
     if not row:
         raise HTTPException(status_code=404, detail="Footer section not found")
     
+    await db.notify_content_change("footer_sections", conn=conn)
     return dict(row)
 
 
@@ -359,6 +365,7 @@ async def delete_footer_section(
         DELETE FROM footer_sections WHERE id = $1
     """, section_id)
     
+    await db.notify_content_change("footer_sections", conn=conn)
     return {"message": "Footer section deleted successfully"}
 
 
@@ -379,6 +386,7 @@ async def create_footer_link(
     """, data.section_id, data.label_en, data.label_zh, data.label_ja,
         data.url, data.target, data.display_order, data.is_active)
     
+    await db.notify_content_change("footer_links", conn=conn)
     return dict(row)
 
 
@@ -418,6 +426,7 @@ async def update_footer_link(
     if not row:
         raise HTTPException(status_code=404, detail="Footer link not found")
     
+    await db.notify_content_change("footer_links", conn=conn)
     return dict(row)
 
 
@@ -432,6 +441,7 @@ async def delete_footer_link(
         DELETE FROM footer_links WHERE id = $1
     """, link_id)
     
+    await db.notify_content_change("footer_links", conn=conn)
     return {"message": "Footer link deleted successfully"}
 
 
@@ -493,5 +503,6 @@ async def update_footer_text_setting(
     """
     
     row = await conn.fetchrow(query, *values)
+    await db.notify_content_change("footer_text_settings", conn=conn)
     return dict(row)
 
@@ -7,6 +7,18 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_MAX_QUERIES: int = 50000  # 連線執行此數量的查詢後重建
+    DB_POOL_MAX_INACTIVE_LIFETIME: float = 300.0  # 閒置超過此秒數的連線關閉（0 = 不關閉）
+    DB_POOL_ACQUIRE_TIMEOUT: float = 0  # 等待可用連線的上限秒數（0 = 無限等待）
+    DB_COMMAND_TIMEOUT: float = 60.0
+    DB_STATEMENT_CACHE_SIZE: int = 100  # 每個連線的 prepared statement 快取（PgBouncer transaction mode 需設 0）
+    DB_MAX_CACHED_STATEMENT_LIFETIME: int = 300  # prepared statement 快取存活秒數（0 = 不過期）
+    DB_SLOW_QUERY_MS: int = 500  # 超過此毫秒數的查詢記錄 warning（0 = 不記錄）
+    
+    # Metrics（GET /metrics；設定後需帶 Authorization: Bearer <token>）
+    METRICS_TOKEN: str = ""
     
     # CORS
     ALLOWED_ORIGINS: str
@@ -14,10 +26,23 @@ class Settings(BaseSettings):
     # Frontend URL
     FRONTEND_URL: str
     
+    # Backend URL（對外公開的 API 網址；Email 退訂連結直接指向後端，正式環境需設為 HTTPS）
+    BACKEND_URL: str = "http://localhost:8000"
+    
     # Resend (郵件服務 - 可選)
     RESEND_API_KEY: str = ""
     FROM_EMAIL: str = "onboarding@resend.dev"
     ADMIN_EMAIL: str = ""
+    EMAIL_OUTBOX_WORKERS: int = 2  # 背景寄信 worker 數
+    EMAIL_PROVIDER_CONCURRENCY: int = 4  # 同時呼叫 Resend 的上限
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 6
+    EMAIL_OUTBOX_POLL_INTERVAL: float = 5.0
+    NEWSLETTER_BATCH_SIZE: int = 100  # 每個 Resend batch 請求的收件人數（上限 100）
+    NEWSLETTER_SEND_CONCURRENCY: int = 2  # 同時進行的 batch 請求數
+    NEWSLETTER_REQUESTS_PER_SECOND: float = 2.0  # batch 請求速率上限（Resend 預設 2 req/s）
+    NEWSLETTER_BATCH_MAX_RETRIES: int = 5  # 暫時性錯誤的重試次數，用完後 campaign 標記 failed（可續傳）
+    EMAIL_TEMPLATE_CACHE_DIR: str = ""  # Jinja bytecode cache 目錄（空白 = Jinja 預設的使用者專屬暫存目錄）
+    EMAIL_TEMPLATE_AUTO_RELOAD: bool = False  # 開發時設為 true：模板修改後自動重新載入（停用渲染 memo）
     
     # Cloudflare R2 (圖片存儲 - 可選)
     R2_ACCOUNT_ID: str = ""
@@ -25,6 +50,22 @@ class Settings(BaseSettings):
     R2_SECRET_ACCESS_KEY: str = ""
     R2_BUCKET_NAME: str = ""
     R2_PUBLIC_URL: str = ""
+    R2_MAX_CONCURRENCY: int = 16  # 同時進行的 R2 請求數（thread pool 大小）
+    R2_MAX_POOL_CONNECTIONS: int = 32  # boto3 HTTP 連線池大小
+    R2_MAX_RETRIES: int = 4
+    R2_CONNECT_TIMEOUT: float = 5.0
+    R2_READ_TIMEOUT: float = 60.0
+    R2_CONTENT_PREFIX: str = "objects"  # content-addressed 物件的 key 前綴（objects/ab/<sha256>.ext）
+    R2_MULTIPART_CHUNK_SIZE: int = 8 * 1024 * 1024  # 超過此大小的檔案物件以 multipart 分段上傳（R2 最小 5MB）
+    R2_MULTIPART_CONCURRENCY: int = 2  # 每個 multipart 上傳同時進行的分段數
+    UPLOAD_SPOOL_MAX_MEMORY: int = 1024 * 1024  # 上傳檔案暫存超過此大小轉存磁碟
+    
+    # Responsive Images（媒體庫上傳 / Notion 封面自動產生縮小版本）
+    IMAGE_VARIANT_WIDTHS: str = "320,640,1024,1600"  # 逗號分隔，比原圖寬的不產生
+    IMAGE_VARIANT_FORMATS: str = "webp,jpeg"  # 可用：webp, jpeg, avif
+    IMAGE_VARIANT_QUALITY: int = 80
+    IMAGE_VARIANT_WORKERS: int = 2  # Pillow 運算的 process 數
+    IMAGE_VARIANT_MAX_SOURCE_BYTES: int = 25 * 1024 * 1024  # 超過此大小的原圖不產生
     
     # Security
     SECRET_KEY: str = "change-this-in-production"
@@ -32,6 +73,11 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password Hashing（bcrypt 在 thread pool 執行，不阻塞 event loop）
+    BCRYPT_ROUNDS: int = 12  # 調整後，用戶下次登入時自動 rehash
+    PASSWORD_HASH_WORKERS: int = 2  # 同時執行的 bcrypt 運算數
+    PASSWORD_HASH_MAX_PENDING: int = 32  # 排隊上限，超過時回 503（避免登入洪水拖垮 worker）
+    
     # Google OAuth
     GOOGLE_CLIENT_ID: str = ""
     GOOGLE_CLIENT_SECRET: str = ""
@@ -47,7 +93,22 @@ class Settings(BaseSettings):
     NOTION_WEBHOOK_SECRET: str = ""
     NOTION_API_KEY: str = ""
     NOTION_DATABASE_ID: str = ""
-    
+    NOTION_RATE_LIMIT_PER_SECOND: float = 3.0  # Notion API 平均限制約 3 req/s
+    NOTION_MAX_RETRIES: int = 5
+    NOTION_TIMEOUT: float = 30.0
+    NOTION_IMAGE_CONCURRENCY: int = 8  # 同步文章時同時下載的圖片數
+    NOTION_IMAGE_TIMEOUT: float = 30.0
+    NOTION_SYNC_WORKERS: int = 2  # 背景同步 worker 數
+    NOTION_SYNC_MAX_ATTEMPTS: int = 5
+    NOTION_SYNC_POLL_INTERVAL: float = 5.0
+    NOTION_SYNC_STALE_AFTER_SECONDS: int = 900  # running 超過此時間視為 worker 已中斷，重新領取
+    NOTION_SYNC_WAIT_TIMEOUT: float = 120.0  # webhook 帶 wait=true 時最多等待秒數
+    NOTION_BLOCK_CONCURRENCY: int = 3  # 讀取巢狀 blocks 時同時進行的 Notion 請求數（Notion 限制約 3 req/s）
+
+    # Public Content Cache（公開內容 API 的 in-process 快取）
+    CONTENT_CACHE_TTL_SECONDS: int = 300
+    CONTENT_CACHE_MAX_ENTRIES: int = 512
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -56,6 +117,29 @@ class Settings(BaseSettings):
     def allowed_origins_list(self) -> List[str]:
         """將 ALLOWED_ORIGINS 字串轉換為列表"""
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
+    
+    @property
+    def db_pool_options(self) -> dict:
+        """asyncpg.create_pool 的參數"""
+        return {
+            "min_size": self.DB_POOL_MIN_SIZE,
+            "max_size": self.DB_POOL_MAX_SIZE,
+            "max_queries": self.DB_POOL_MAX_QUERIES,
+            "max_inactive_connection_lifetime": self.DB_POOL_MAX_INACTIVE_LIFETIME,
+            "command_timeout": self.DB_COMMAND_TIMEOUT,
+            "statement_cache_size": self.DB_STATEMENT_CACHE_SIZE,
+            "max_cached_statement_lifetime": self.DB_MAX_CACHED_STATEMENT_LIFETIME,
+        }
+    
+    @property
+    def image_variant_widths(self) -> List[int]:
+        """將 IMAGE_VARIANT_WIDTHS 字串轉換為列表"""
+        return [int(width) for width in self.IMAGE_VARIANT_WIDTHS.split(",") if width.strip()]
+    
+    @property
+    def image_variant_formats(self) -> List[str]:
+        """將 IMAGE_VARIANT_FORMATS 字串轉換為列表"""
+        return [fmt.strip().lower() for fmt in self.IMAGE_VARIANT_FORMATS.split(",") if fmt.strip()]
 
 
 # 全域設定實例
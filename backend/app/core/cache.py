@@ -0,0 +1,133 @@
+"""
+In-process TTL 快取（公開內容 API 使用）
+
+設計：
+1. ✅ 以 key（endpoint + 參數）存放已查詢好的結果
+2. ✅ 每筆資料有 TTL，並有總筆數上限（LRU 淘汰）
+3. ✅ 每筆資料標記依賴的資料表（tags），Admin 寫入時依表失效
+   （透過 db.notify_content_change → Postgres NOTIFY，所有 worker 同步失效）
+4. ✅ 同一個 key 同時 miss 時只查一次資料庫（避免 cache stampede）
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+import logging
+
+from ..config import settings
+from .database import ALL_TABLES
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """有 TTL 與容量上限的 LRU 快取"""
+
+    def __init__(self, maxsize: int = 512, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expires_at, tags, value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, frozenset, Any]]" = OrderedDict()
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        # 每次失效都 +1，用來丟棄「失效前開始、失效後才完成」的查詢結果
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """取得快取值，回傳 (是否命中, 值)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[str] = (), ttl: Optional[float] = None):
+        """寫入快取值（超過容量時淘汰最久未使用的項目）"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, frozenset(tags), value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        tags: Iterable[str] = (),
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """命中直接回傳，否則呼叫 loader 並寫入快取"""
+        found, value = self.get(key)
+        if found:
+            self.hits += 1
+            return value
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                # 等待鎖期間可能已經被其他請求載入
+                found, value = self.get(key)
+                if found:
+                    self.hits += 1
+                    return value
+
+                self.misses += 1
+                generation = self._generation
+                value = await loader()
+
+                if generation == self._generation:
+                    self.set(key, value, tags=tags, ttl=ttl)
+                return value
+        finally:
+            if not lock.locked():
+                self._locks.pop(key, None)
+
+    def invalidate(self, *tags: str) -> int:
+        """刪除所有依賴指定資料表的快取項目，回傳刪除數量（ALL_TABLES 代表全部）"""
+        if ALL_TABLES in tags:
+            count = len(self._entries)
+            self.clear()
+            return count
+
+        self._generation += 1
+        targets = set(tags)
+        stale = [key for key, (_, entry_tags, _) in self._entries.items() if entry_tags & targets]
+        for key in stale:
+            del self._entries[key]
+
+        if stale:
+            logger.debug(f"🧹 Cache invalidated {len(stale)} entries for {sorted(targets)}")
+        return len(stale)
+
+    def clear(self):
+        """清空所有快取"""
+        self._generation += 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """快取統計（給 /health 或除錯使用）"""
+        return {
+            "entries": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# 全域公開內容快取實例
+content_cache = TTLCache(
+    maxsize=settings.CONTENT_CACHE_MAX_ENTRIES,
+    ttl=settings.CONTENT_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,248 @@
+"""
+可觀測的 asyncpg 連線池
+
+延遲變高時要能分辨是「查詢慢」還是「在 pool.acquire() 排隊」：
+1. ✅ InstrumentedPool 包住 asyncpg.Pool，所有 `async with db.pool.acquire()` 自動記錄
+   等待時間（acquire 排隊）與持有時間（取得 → 歸還）
+2. ✅ 依路由歸類（見 request_context.current_route），找出佔用連線最久的 endpoint / 背景工作
+3. ✅ 即時狀態：連線數、閒置、使用中、排隊中、acquire 逾時次數
+4. ✅ 其他屬性 / 方法（close、get_size 等）直接轉給原本的 asyncpg.Pool
+5. ✅ acquire 取得的連線包成 InstrumentedConnection：execute / fetch* 記錄每個查詢的耗時
+   （依路由與 SQL 類型）與錯誤數，超過 slow_query_threshold 的查詢記錄 warning
+"""
+import asyncio
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import asyncpg
+
+from .metrics import Histogram, MetricFamily, metrics_registry, stats_families
+from .request_context import current_route
+
+logger = logging.getLogger(__name__)
+
+DB_QUERY_DURATION = metrics_registry.histogram(
+    "db_query_duration_seconds",
+    "Database query duration by route and SQL statement type",
+    ("route", "operation")
+)
+DB_QUERY_ERRORS = metrics_registry.counter(
+    "db_query_errors_total",
+    "Database queries that raised, by route and SQL statement type",
+    ("route", "operation")
+)
+
+_SQL_LEADING_COMMENTS = re.compile(r"^\s*(?:(?:--[^\n]*\n|/\*.*?\*/)\s*)*", re.DOTALL)
+_SQL_OPERATIONS = frozenset({
+    "SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "CREATE", "ALTER", "DROP",
+    "TRUNCATE", "BEGIN", "COMMIT", "ROLLBACK", "LOCK", "VACUUM", "ANALYZE", "REFRESH",
+})
+
+
+@lru_cache(maxsize=2048)
+def query_operation(query: str) -> str:
+    """SQL 的第一個關鍵字（SELECT / INSERT ...；其他為 OTHER）"""
+    body = query[_SQL_LEADING_COMMENTS.match(query).end():]
+    keyword = body.split(None, 1)[0].upper() if body else ""
+    return keyword if keyword in _SQL_OPERATIONS else "OTHER"
+
+
+class RouteUsage:
+    """單一路由的連線使用情況"""
+
+    def __init__(self):
+        self.wait = Histogram()
+        self.hold = Histogram()
+        self.timeouts = 0
+
+
+class PoolMetrics:
+    """連線池的統計（本 process）"""
+
+    def __init__(self):
+        self.wait = Histogram()
+        self.hold = Histogram()
+        self.routes: Dict[str, RouteUsage] = {}
+        self.waiting = 0
+        self.in_use = 0
+        self.max_waiting = 0
+        self.timeouts = 0
+
+    def route(self, name: str) -> RouteUsage:
+        usage = self.routes.get(name)
+        if usage is None:
+            usage = self.routes[name] = RouteUsage()
+        return usage
+
+    def top_routes(self, by: str = "wait", limit: int = 10) -> Dict[str, dict]:
+        """依總等待 / 持有時間排序的路由"""
+        ranked = sorted(
+            self.routes.items(),
+            key=lambda item: getattr(item[1], by).sum,
+            reverse=True
+        )
+        return {
+            name: {
+                "wait": usage.wait.summary(),
+                "hold": usage.hold.summary(),
+                "timeouts": usage.timeouts,
+            }
+            for name, usage in ranked[:limit]
+        }
+
+
+class InstrumentedConnection:
+    """
+    asyncpg.Connection + 查詢計時
+
+    只包 execute / executemany / fetch / fetchrow / fetchval；其他方法（transaction、cursor、
+    copy_records_to_table 等）直接轉給原本的連線。
+    """
+
+    def __init__(self, conn: asyncpg.Connection, route: str, slow_query_threshold: Optional[float]):
+        self.raw = conn
+        self._route = route
+        self._slow_query_threshold = slow_query_threshold
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    async def execute(self, query: str, *args, **kwargs):
+        return await self._timed(self.raw.execute, query, args, kwargs)
+
+    async def executemany(self, command: str, args, **kwargs):
+        return await self._timed(self.raw.executemany, command, (args,), kwargs)
+
+    async def fetch(self, query: str, *args, **kwargs):
+        return await self._timed(self.raw.fetch, query, args, kwargs)
+
+    async def fetchrow(self, query: str, *args, **kwargs):
+        return await self._timed(self.raw.fetchrow, query, args, kwargs)
+
+    async def fetchval(self, query: str, *args, **kwargs):
+        return await self._timed(self.raw.fetchval, query, args, kwargs)
+
+    async def _timed(self, method, query: str, args: tuple, kwargs: dict):
+        operation = query_operation(query)
+        start = time.perf_counter()
+        try:
+            return await method(query, *args, **kwargs)
+        except Exception:
+            DB_QUERY_ERRORS.labels(self._route, operation).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            DB_QUERY_DURATION.labels(self._route, operation).observe(elapsed)
+            if self._slow_query_threshold is not None and elapsed >= self._slow_query_threshold:
+                logger.warning(
+                    f"🐢 Slow query ({elapsed * 1000:.0f}ms, {self._route}): {' '.join(query.split())[:200]}"
+                )
+
+
+class _InstrumentedAcquire:
+    """`async with pool.acquire()` 的 context manager（記錄等待 / 持有時間）"""
+
+    def __init__(self, pool: "InstrumentedPool", timeout: Optional[float]):
+        self._pool = pool
+        self._timeout = timeout
+        self._conn: Optional[asyncpg.Connection] = None
+        self._route = ""
+        self._acquired_at = 0.0
+
+    async def __aenter__(self) -> InstrumentedConnection:
+        metrics = self._pool.metrics
+        self._route = current_route()
+        usage = metrics.route(self._route)
+
+        start = time.perf_counter()
+        metrics.waiting += 1
+        metrics.max_waiting = max(metrics.max_waiting, metrics.waiting)
+        try:
+            self._conn = await self._pool.raw.acquire(timeout=self._timeout)
+        except asyncio.TimeoutError:
+            metrics.timeouts += 1
+            usage.timeouts += 1
+            raise
+        finally:
+            metrics.waiting -= 1
+
+        self._acquired_at = time.perf_counter()
+        wait = self._acquired_at - start
+        metrics.wait.observe(wait)
+        usage.wait.observe(wait)
+        metrics.in_use += 1
+        return InstrumentedConnection(self._conn, self._route, self._pool.slow_query_threshold)
+
+    async def __aexit__(self, *exc_info):
+        metrics = self._pool.metrics
+        try:
+            await self._pool.raw.release(self._conn)
+        finally:
+            hold = time.perf_counter() - self._acquired_at
+            metrics.in_use -= 1
+            metrics.hold.observe(hold)
+            metrics.route(self._route).hold.observe(hold)
+            self._conn = None
+
+
+class InstrumentedPool:
+    """asyncpg.Pool + acquire 統計"""
+
+    def __init__(
+        self,
+        pool: asyncpg.Pool,
+        acquire_timeout: Optional[float] = None,
+        slow_query_threshold: Optional[float] = None
+    ):
+        self.raw = pool
+        self.acquire_timeout = acquire_timeout
+        self.slow_query_threshold = slow_query_threshold
+        self.metrics = PoolMetrics()
+
+    def acquire(self, *, timeout: Optional[float] = None) -> _InstrumentedAcquire:
+        return _InstrumentedAcquire(self, timeout if timeout is not None else self.acquire_timeout)
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def stats(self) -> dict:
+        """即時狀態 + 整體等待 / 持有時間（給 /health）"""
+        return {
+            "size": self.raw.get_size(),
+            "idle": self.raw.get_idle_size(),
+            "min_size": self.raw.get_min_size(),
+            "max_size": self.raw.get_max_size(),
+            "in_use": self.metrics.in_use,
+            "waiting": self.metrics.waiting,
+            "max_waiting": self.metrics.max_waiting,
+            "acquire_timeouts": self.metrics.timeouts,
+            "wait": self.metrics.wait.summary(),
+            "hold": self.metrics.hold.summary(),
+        }
+
+    def snapshot(self, limit: int = 20) -> dict:
+        """完整統計：histogram bucket + 依路由排序（給 metrics endpoint）"""
+        return {
+            **self.stats(),
+            "wait": self.metrics.wait.snapshot(),
+            "hold": self.metrics.hold.snapshot(),
+            "routes_by_wait": self.metrics.top_routes("wait", limit),
+            "routes_by_hold": self.metrics.top_routes("hold", limit),
+        }
+
+    def metric_families(self) -> List[MetricFamily]:
+        """Prometheus 輸出：即時狀態 + 依路由的等待 / 持有時間 histogram"""
+        stats = {key: value for key, value in self.stats().items() if not isinstance(value, dict)}
+        families = stats_families("db_pool", stats, counters=("acquire_timeouts",))
+
+        wait = MetricFamily("histogram", "db_pool_acquire_wait_seconds", "Time spent waiting in pool.acquire()", ("route",))
+        hold = MetricFamily("histogram", "db_pool_connection_hold_seconds", "Time a connection is held before release", ("route",))
+        timeouts = MetricFamily("counter", "db_pool_route_acquire_timeouts_total", "pool.acquire() timeouts by route", ("route",))
+        for route, usage in self.metrics.routes.items():
+            wait.set_child((route,), usage.wait)
+            hold.set_child((route,), usage.hold)
+            timeouts.labels(route).inc(usage.timeouts)
+        return families + [wait, hold, timeouts]
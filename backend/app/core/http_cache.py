@@ -0,0 +1,143 @@
+"""
+HTTP 條件式請求（ETag / If-None-Match、Last-Modified / If-Modified-Since）
+
+公開讀取 API 回傳 strong ETag，瀏覽器與 CDN 重新驗證時內容未變就回 304，
+不必重新下載整份 JSON。
+
+兩種用法：
+1. ConditionalGetMiddleware：自動以 response body 的 hash 當 ETag（所有 /api/public GET）
+2. 已知版本的 endpoint（例如 bootstrap 的內容雜湊、文章的 updated_at）自行設定
+   ETag / Last-Modified，middleware 不會再計算 hash；可用 is_not_modified() 提早回 304
+3. 列表 / 單篇 endpoint 先查資料水位（COUNT(*)、MAX(updated_at) 等），以 watermark_etag()
+   產生 ETag，相符時在查詢與序列化之前就回 304
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import hashlib
+from typing import Any, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# 304 回應需保留的 header（RFC 9110 §15.4.5；另保留 CORS 的 access-control-*）
+_NOT_MODIFIED_HEADERS = ("etag", "cache-control", "last-modified", "vary", "expires")
+
+
+def make_etag(body: bytes) -> str:
+    """以內容雜湊產生 strong ETag"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def watermark_etag(*parts: Any) -> str:
+    """以資料水位 + 查詢參數產生 ETag（不需要先產生 response body）"""
+    return make_etag(repr(parts).encode("utf-8"))
+
+
+def http_date(dt: datetime) -> str:
+    """datetime → HTTP-date（資料庫 TIMESTAMP 無時區，視為 UTC）"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 比對（weak comparison，允許 W/ 前綴與 *）"""
+    if if_none_match.strip() == "*":
+        return True
+
+    target = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == target
+        for candidate in if_none_match.split(",")
+    )
+
+
+def is_not_modified(request_headers: Headers, etag: Optional[str], last_modified: Optional[str]) -> bool:
+    """判斷是否可回 304（有 If-None-Match 時忽略 If-Modified-Since）"""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(if_none_match, etag)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+    return False
+
+
+class ConditionalGetMiddleware:
+    """
+    為公開 GET API 加上 ETag，並處理條件式請求
+
+    只處理 200 回應；已帶 ETag 的回應不重算 hash。
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        path_prefixes: Sequence[str] = ("/api/public",),
+        cache_control: str = "no-cache",
+    ):
+        self.app = app
+        self.path_prefixes = tuple(path_prefixes)
+        self.cache_control = cache_control
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.path_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        start_message: Optional[Message] = None
+        body_parts = []
+
+        async def buffered_send(message: Message):
+            nonlocal start_message
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            await self._send_response(request_headers, start_message, b"".join(body_parts), send)
+
+        await self.app(scope, receive, buffered_send)
+
+    async def _send_response(self, request_headers: Headers, start_message: Message, body: bytes, send: Send):
+        """計算 ETag，符合條件時改送 304"""
+        if start_message["status"] != 200:
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        headers = MutableHeaders(raw=list(start_message["headers"]))
+        etag = headers.get("etag") or make_etag(body)
+        headers["etag"] = etag
+        headers.setdefault("cache-control", self.cache_control)
+
+        if is_not_modified(request_headers, etag, headers.get("last-modified")):
+            kept = [
+                (key, value) for key, value in headers.raw
+                if key.decode("latin-1").lower() in _NOT_MODIFIED_HEADERS
+                or key.decode("latin-1").lower().startswith("access-control-")
+            ]
+            await send({"type": "http.response.start", "status": 304, "headers": kept})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({**start_message, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,285 @@
+"""
+Metrics 基本型別與 Prometheus exposition
+
+1. ✅ Histogram：固定 bucket 的累計分布（與 Prometheus histogram 相同語意），可估算 p50 / p95 / p99
+2. ✅ Counter / Gauge，以 MetricFamily 依 label 分組
+3. ✅ MetricsRegistry：集中所有 metric family，輸出 Prometheus text format（GET /metrics）
+4. ✅ collector：輸出時才讀取的即時數值（各服務既有的 stats()）
+
+asyncio 單執行緒內更新，不需要 lock；數值為本 worker（process）的統計，
+多個 worker 時 Prometheus 需個別抓取（或加上 instance label 後彙總）。
+"""
+import math
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# 秒；涵蓋 1ms（快速查詢 / 立即取得連線）到 10s（逾時邊緣）
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """固定 bucket histogram"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # 最後一個是 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """估算分位數（bucket 內線性內插，同 PromQL histogram_quantile）"""
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if cumulative + count >= rank and count > 0:
+                if index == len(self.buckets):
+                    return self.max
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = min(self.buckets[index], self.max)
+                return lower + (upper - lower) * ((rank - cumulative) / count)
+            cumulative += count
+        return self.max
+
+    def cumulative_counts(self) -> Dict[str, int]:
+        """le → 累計次數（Prometheus _bucket 格式）"""
+        result = {}
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            result[f"{bound:g}"] = cumulative
+        result["+Inf"] = self.count
+        return result
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """次數 / 平均 / 分位數（毫秒，方便在 /health 閱讀）"""
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 2) if value is not None else None
+
+        return {
+            "count": self.count,
+            "avg_ms": ms(self.sum / self.count) if self.count else None,
+            "p50_ms": ms(self.quantile(0.5)),
+            "p95_ms": ms(self.quantile(0.95)),
+            "p99_ms": ms(self.quantile(0.99)),
+            "max_ms": ms(self.max) if self.count else None,
+        }
+
+    def snapshot(self) -> dict:
+        """summary + 各 bucket 的累計次數"""
+        return {**self.summary(), "sum_seconds": round(self.sum, 6), "buckets": self.cumulative_counts()}
+
+
+class Counter:
+    """只增不減的累計值"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: float = 0.0):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class Gauge:
+    """可增可減的即時值"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: float = 0.0):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+# ==================== Metric Family ====================
+
+_METRIC_TYPES = {
+    "counter": Counter,
+    "gauge": Gauge,
+    "histogram": Histogram,
+}
+
+
+class MetricFamily:
+    """
+    同名 metric 依 label 值分組
+
+    例如 http_requests_total{method, route, status}：
+        family.labels("GET", "/api/public/blog/posts", "200").inc()
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        if kind not in _METRIC_TYPES:
+            raise ValueError(f"Unknown metric type: {kind}")
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.children: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, *values) -> object:
+        """取得（必要時建立）對應 label 值的 Counter / Gauge / Histogram"""
+        key = tuple(str(value) for value in values)
+        child = self.children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            child = self.children[key] = self._new_child()
+        return child
+
+    def set_child(self, values: Sequence, child: object):
+        """直接放入既有的 metric 物件（例如連線池已記錄的 Histogram）"""
+        self.children[tuple(str(value) for value in values)] = child
+
+    def _new_child(self) -> object:
+        if self.kind == "histogram":
+            return Histogram(self.buckets)
+        return _METRIC_TYPES[self.kind]()
+
+    def expose(self) -> List[str]:
+        """Prometheus text format 的各行"""
+        lines = [
+            f"# HELP {self.name} {_escape_help(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for values, child in self.children.items():
+            labels = list(zip(self.labelnames, values))
+            if self.kind != "histogram":
+                lines.append(f"{self.name}{_format_labels(labels)} {_format_value(child.value)}")
+                continue
+
+            for bound, count in child.cumulative_counts().items():
+                lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', bound)])} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {child.count}")
+        return lines
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def stats_families(prefix: str, stats: Dict[str, object], counters: Sequence[str] = ()) -> List[MetricFamily]:
+    """
+    服務既有的 stats() → MetricFamily（每個數值一個）
+
+    counters 內的 key 為累計值，輸出為 <prefix>_<key>_total（去掉結尾的 _count）；
+    其他數值為 gauge。非數值（None 等）略過。
+    """
+    families = []
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if key in counters:
+            name = f"{prefix}_{key[:-len('_count')] if key.endswith('_count') else key}_total"
+            family = MetricFamily("counter", name, f"{prefix} {key}")
+            family.set_child((), Counter(value))
+        else:
+            family = MetricFamily("gauge", f"{prefix}_{key}", f"{prefix} {key}")
+            family.set_child((), Gauge(value))
+        families.append(family)
+    return families
+
+
+# ==================== Registry ====================
+
+Collector = Callable[[], Iterable[MetricFamily]]
+
+
+class MetricsRegistry:
+    """所有 metric family + collector（輸出時呼叫）"""
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._collectors: List[Collector] = []
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        existing = self._families.get(family.name)
+        if existing is not None:
+            if existing.kind != family.kind or existing.labelnames != family.labelnames:
+                raise ValueError(f"Metric {family.name} already registered with a different type / labels")
+            return existing
+        self._families[family.name] = family
+        return family
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register(MetricFamily("counter", name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._register(MetricFamily("gauge", name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> MetricFamily:
+        return self._register(MetricFamily("histogram", name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Collector):
+        """註冊 collector：每次輸出時呼叫，回傳當下建立的 MetricFamily"""
+        self._collectors.append(collector)
+
+    def expose(self) -> str:
+        """Prometheus text format（version 0.0.4）"""
+        lines: List[str] = []
+        for family in self._families.values():
+            lines.extend(family.expose())
+        for collector in self._collectors:
+            for family in collector():
+                lines.extend(family.expose())
+        return "\n".join(lines) + "\n"
+
+
+# Prometheus text format 的 Content-Type
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 全域實例
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,117 @@
+"""
+Schema migration runner
+
+原本每次啟動（每個 worker）都重跑所有 CREATE TABLE / ALTER TABLE / information_schema 檢查與 seed：
+1. ✅ migration 檔案放在 app/migrations，檔名 NNNN_name.py，依編號順序執行，每個檔案提供 async upgrade(conn)
+2. ✅ 已套用的版本記錄在 schema_migrations
+3. ✅ 快速路徑：記錄的版本已是最新時只需一個查詢，不執行任何 DDL、不取得任何 lock
+4. ✅ 需要 migrate 時以 advisory lock 確保只有一個 worker 執行，其他 worker 等待後直接使用結果
+5. ✅ 每個 migration 在獨立 transaction 內執行並記錄版本（失敗時整個 migration rollback）
+
+新增 schema 變更：新增下一個編號的檔案即可（不要修改已發佈的 migration）。
+"""
+import importlib
+import logging
+import pkgutil
+import re
+import time
+from typing import List, NamedTuple
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_PACKAGE = "app.migrations"
+MIGRATION_NAME_PATTERN = re.compile(r"^(\d{4})_(\w+)$")
+
+# pg_advisory_lock key（所有 worker 共用）
+MIGRATION_LOCK_KEY = 7300
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    module: str
+
+
+def discover_migrations() -> List[Migration]:
+    """依版本排序的所有 migration（編號重複時 raise）"""
+    package = importlib.import_module(MIGRATIONS_PACKAGE)
+
+    migrations = []
+    for info in pkgutil.iter_modules(package.__path__):
+        match = MIGRATION_NAME_PATTERN.match(info.name)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), f"{MIGRATIONS_PACKAGE}.{info.name}"))
+
+    migrations.sort()
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions in {MIGRATIONS_PACKAGE}: {versions}")
+    return migrations
+
+
+async def current_version(conn: asyncpg.Connection) -> int:
+    """資料庫目前的 schema 版本（尚未建立 schema_migrations 時為 0）"""
+    exists = await conn.fetchval("SELECT to_regclass('schema_migrations') IS NOT NULL")
+    if not exists:
+        return 0
+    return await conn.fetchval("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+
+
+async def run_migrations(conn: asyncpg.Connection) -> int:
+    """
+    套用所有尚未執行的 migration
+
+    Returns:
+        本次套用的 migration 數
+    """
+    migrations = discover_migrations()
+    latest = migrations[-1].version if migrations else 0
+
+    # 快速路徑：已是最新版本
+    if await current_version(conn) >= latest:
+        logger.info(f"✅ Database schema is up to date (version {latest})")
+        return 0
+
+    logger.info("🔒 Waiting for migration lock...")
+    await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_KEY)
+    try:
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                applied_at TIMESTAMP DEFAULT NOW(),
+                duration_ms INTEGER
+            )
+        """)
+
+        # 等待 lock 期間其他 worker 可能已完成
+        applied = {
+            row['version']
+            for row in await conn.fetch("SELECT version FROM schema_migrations")
+        }
+        pending = [m for m in migrations if m.version not in applied]
+
+        for migration in pending:
+            await _apply(conn, migration)
+
+        if pending:
+            logger.info(f"✅ {len(pending)} migrations applied (schema version {latest})")
+        return len(pending)
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_KEY)
+
+
+async def _apply(conn: asyncpg.Connection, migration: Migration):
+    """在 transaction 內執行一個 migration 並記錄版本"""
+    logger.info(f"🔄 Applying migration {migration.version:04d}_{migration.name}...")
+    module = importlib.import_module(migration.module)
+
+    start = time.perf_counter()
+    async with conn.transaction():
+        await module.upgrade(conn)
+        await conn.execute(
+            "INSERT INTO schema_migrations (version, name, duration_ms) VALUES ($1, $2, $3)",
+            migration.version, migration.name, int((time.perf_counter() - start) * 1000)
+        )
@@ -0,0 +1,44 @@
+"""
+對外呼叫的耗時（Notion、Resend、R2、Google OAuth）
+
+    with outbound_timer("notion", "GET /pages") as timer:
+        response = await client.request(...)
+        timer.outcome = response.status_code
+
+outcome 未設定時：正常結束為 ok，拋出例外為 error。
+"""
+import time
+from typing import Optional, Union
+
+from .metrics import metrics_registry
+
+OUTBOUND_REQUEST_DURATION = metrics_registry.histogram(
+    "outbound_request_duration_seconds",
+    "Duration of calls to external services by service, operation and outcome",
+    ("service", "operation", "outcome")
+)
+
+
+class OutboundTimer:
+    """記錄一次對外呼叫的耗時（同步 with，可用於 async 程式碼）"""
+
+    def __init__(self, service: str, operation: str):
+        self.service = service
+        self.operation = operation
+        self.outcome: Optional[Union[str, int]] = None
+        self._start = 0.0
+
+    def __enter__(self) -> "OutboundTimer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.outcome is None:
+            self.outcome = "error" if exc_type is not None else "ok"
+        OUTBOUND_REQUEST_DURATION.labels(self.service, self.operation, self.outcome).observe(
+            time.perf_counter() - self._start
+        )
+
+
+def outbound_timer(service: str, operation: str) -> OutboundTimer:
+    return OutboundTimer(service, operation)
@@ -0,0 +1,123 @@
+"""
+目前請求的路由 + HTTP 請求 metrics
+
+RequestContextMiddleware 把 ASGI scope 放進 contextvar；路由比對完成後
+FastAPI 會把 route 寫入同一個 scope，因此之後在 endpoint 內呼叫 current_route()
+可以取得路由樣板（/api/public/blog/posts/{slug}，不是實際路徑，避免 label 數量爆炸）。
+
+同一個 middleware 也記錄每個請求的耗時 / 狀態碼（依路由樣板與 router tag，
+例如 "Public - Blog"）與處理中的請求數，輸出於 GET /metrics。
+"""
+import asyncio
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import metrics_registry
+
+_current_scope: ContextVar[Optional[Scope]] = ContextVar("current_scope", default=None)
+
+# 背景 task 名稱去掉編號（email-outbox-worker-0 → email-outbox-worker）
+_TASK_SUFFIX = re.compile(r"[-_:]?\d+$")
+
+# 我們自己命名的背景 task 一律是 kebab-case；asyncio 預設的 Task-N、
+# anyio / starlette 內部 task（函式 qualname，含 "."）不算
+_BACKGROUND_TASK_NAME = re.compile(r"^[a-z][a-z0-9]*(-[a-z0-9]+)*$")
+
+UNMATCHED_ROUTE = "unmatched"
+
+# 其他 method（任意字串）一律歸為 OTHER，避免 label 數量爆炸
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+HTTP_REQUESTS = metrics_registry.counter(
+    "http_requests_total",
+    "HTTP requests by route template, router tag and status code",
+    ("method", "route", "router", "status")
+)
+HTTP_REQUEST_DURATION = metrics_registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request duration until the response body is sent",
+    ("method", "route", "router")
+)
+HTTP_REQUESTS_IN_FLIGHT = metrics_registry.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being processed",
+    ("method",)
+)
+
+
+def route_template(scope: Scope) -> str:
+    """scope → 路由樣板（尚未比對或沒有對應路由時為 unmatched）"""
+    return getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+
+
+def route_router(scope: Scope) -> str:
+    """scope → 路由所屬 router 的 tag（main.py include_router 的 tags）"""
+    tags = getattr(scope.get("route"), "tags", None)
+    return str(tags[0]) if tags else ""
+
+
+def route_label(scope: Scope) -> str:
+    """scope → METHOD + 路由樣板（例如 GET /api/public/blog/posts/{slug}）"""
+    return f"{scope.get('method', '')} {route_template(scope)}".strip()
+
+
+def current_route() -> str:
+    """
+    目前程式碼歸屬的路由
+
+    有命名的背景 task（例如 email-outbox-worker-0）即使由請求建立（繼承 contextvar）
+    也歸到 background:<task 名稱>；其他請求之外的程式碼為 background。
+    """
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    name = _TASK_SUFFIX.sub("", task.get_name()) if task is not None else ""
+    if _BACKGROUND_TASK_NAME.match(name):
+        return f"background:{name}"
+
+    scope = _current_scope.get()
+    if scope is not None:
+        return route_label(scope)
+    return "background"
+
+
+class RequestContextMiddleware:
+    """把目前的 HTTP scope 放進 contextvar，並記錄請求 metrics"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in HTTP_METHODS else "OTHER"
+        status_code = 500  # 沒有送出 response 就發生例外 → ServerErrorMiddleware 回 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_scope.reset(token)
+            duration = time.perf_counter() - start
+            in_flight.dec()
+
+            route = route_template(scope)
+            router = route_router(scope)
+            HTTP_REQUEST_DURATION.labels(method, route, router).observe(duration)
+            HTTP_REQUESTS.labels(method, route, router, status_code).inc()
@@ -1,9 +1,27 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from typing import Optional
+import asyncio
 import logging
+import secrets
 
 from .config import settings
 from .core.database import db
+from .core.cache import content_cache
+from .core.http_cache import ConditionalGetMiddleware
+from .core.request_context import RequestContextMiddleware
+from .core.metrics import PROMETHEUS_CONTENT_TYPE, metrics_registry, stats_families
+from .services.pr_catalog_snapshot import pr_catalog_snapshots
+from .services.blog_search import backfill_search_index
+from .services.password_hasher import password_hasher, PasswordHasherBusy
+from .services.notion_gateway import notion_gateway
+from .services.notion_sync_queue import notion_sync_queue
+from .services.image_variants import image_variants
+from .services.email_outbox import email_outbox
+from .services.email_service import email_service
+from .services.email_templates import email_templates
+from .services.newsletter_broadcast import newsletter_broadcast
 from .api import (
     blog, pricing, contact, newsletter, pr_package, pr_template,
     blog_admin, pricing_admin, pr_package_admin, contact_admin, newsletter_admin,
@@ -37,6 +55,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 公開讀取 API 的 ETag / 304 處理（瀏覽器與 CDN 可低成本重新驗證）
+app.add_middleware(ConditionalGetMiddleware, path_prefixes=("/api/public",))
+
+# 目前請求的路由（連線池等 metrics 依路由歸類）+ 請求耗時 / 狀態碼 metrics
+app.add_middleware(RequestContextMiddleware)
+
+
+def _collect_service_metrics():
+    """各服務既有的 stats() → GET /metrics（輸出時才讀取）"""
+    yield from stats_families("password_hasher", password_hasher.stats(), counters=(
+        "hash_count", "verify_count", "rehash_count", "rejected_count"
+    ))
+    yield from stats_families("email_outbox", email_outbox.stats(), counters=("sent", "retries", "failed"))
+    yield from stats_families("email_templates", email_templates.stats(), counters=("memo_hits", "memo_misses"))
+    yield from stats_families("content_cache", content_cache.stats(), counters=("hits", "misses", "evictions"))
+    yield from stats_families("notion_gateway", notion_gateway.stats(), counters=("requests", "retries", "coalesced"))
+    if db.pool is not None:
+        yield from db.pool.metric_families()
+
+
+metrics_registry.add_collector(_collect_service_metrics)
+
+
+# 密碼運算排隊已滿（登入 / 註冊洪水）→ 503，讓 client 稍後重試
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy, please try again shortly"},
+        headers={"Retry-After": "1"}
+    )
+
 
 # Startup event
 @app.on_event("startup")
@@ -46,21 +96,63 @@ async def startup():
     
     # 初始化資料庫
     db.database_url = settings.DATABASE_URL
+    db.pool_options = settings.db_pool_options
+    db.acquire_timeout = settings.DB_POOL_ACQUIRE_TIMEOUT or None
+    db.slow_query_threshold = settings.DB_SLOW_QUERY_MS / 1000 if settings.DB_SLOW_QUERY_MS else None
+    
+    # 其他 worker 的 Admin 寫入 → 本 worker 快取失效（LISTEN/NOTIFY）
+    db.add_content_change_handler(content_cache.invalidate)
+    db.add_content_change_handler(pr_catalog_snapshots.invalidate)
+    # 新郵件寫入 outbox（commit 後）→ 喚醒寄信 worker
+    db.add_content_change_handler(email_outbox.wake_on_change)
+    
     await db.connect()
     
     # 存儲 db 實例到 app.state
     app.state.db = db
     
+    # Notion webhook 同步的背景 worker pool
+    notion_sync_queue.set_handler(blog_admin.run_notion_sync)
+    notion_sync_queue.start()
+    
+    # 預先編譯 Email 模板（bytecode cache 在磁碟，重啟後不必重新編譯）
+    await asyncio.to_thread(email_templates.precompile)
+    
+    # Email outbox 的背景寄信 worker pool
+    email_outbox.set_handler(email_service.deliver)
+    email_outbox.start()
+    
+    # 接續寄送中斷的 Newsletter 群發
+    await newsletter_broadcast.resume_interrupted()
+    
+    # 背景補建 Blog 全文搜尋索引（既有文章；不阻塞啟動）
+    app.state.blog_search_backfill = asyncio.create_task(_backfill_blog_search(), name="blog-search-backfill")
+    
     logger.info("✅ VortixPR API started successfully")
 
 
+async def _backfill_blog_search():
+    """啟動時補建缺少搜尋索引的文章"""
+    try:
+        async with db.pool.acquire() as conn:
+            await backfill_search_index(conn)
+    except Exception as e:
+        logger.error(f"❌ Blog search index backfill failed: {e}")
+
+
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown():
     """應用程式關閉時執行"""
     logger.info("👋 Shutting down VortixPR API...")
     
+    await notion_sync_queue.stop()
+    await email_outbox.stop()
+    await newsletter_broadcast.stop()
     await db.disconnect()
+    password_hasher.shutdown()
+    image_variants.shutdown()
+    await notion_gateway.close()
     
     logger.info("✅ VortixPR API shut down successfully")
 
@@ -87,16 +179,48 @@ async def health_check():
         return {
             "status": "healthy",
             "database": "connected",
-            "environment": settings.ENVIRONMENT
+            "environment": settings.ENVIRONMENT,
+            "password_hasher": password_hasher.stats(),
+            "email_outbox": email_outbox.stats(),
+            "email_templates": email_templates.stats(),
+            "db_pool": db.pool.stats()
         }
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         return {
             "status": "unhealthy",
-            "error": str(e)
+            "error": str(e),
+            "db_pool": db.pool.stats() if db.pool else None
         }
 
 
+def require_metrics_token(authorization: Optional[str] = Header(None)):
+    """設定 METRICS_TOKEN 時，metrics endpoint 需帶 Authorization: Bearer <token>"""
+    if not settings.METRICS_TOKEN:
+        return
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+@app.get("/metrics", dependencies=[Depends(require_metrics_token)])
+async def prometheus_metrics():
+    """Prometheus text format：請求 / 查詢 / 對外呼叫的 histogram 與各服務統計（本 worker）"""
+    return Response(content=metrics_registry.expose(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.get("/metrics/db-pool", dependencies=[Depends(require_metrics_token)])
+async def db_pool_metrics(limit: int = 20):
+    """連線池統計：等待 / 持有時間 histogram 與依路由排序的使用情況（本 worker）"""
+    if db.pool is None:
+        return {"error": "Database not connected"}
+    return db.pool.snapshot(limit=min(max(limit, 1), 200))
+
+
 # 註冊 API routers - 按快取策略分類
 
 # Public APIs（可大量快取 - 只讀操作）
@@ -0,0 +1,943 @@
+"""
+基礎資料表（原 Database.init_tables 的 CREATE TABLE / INDEX）
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def upgrade(conn):
+    # ==================== Users ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id SERIAL PRIMARY KEY,
+            email VARCHAR(255) UNIQUE NOT NULL,
+            hashed_password VARCHAR(255),
+            name VARCHAR(100) NOT NULL,
+            avatar_url TEXT,
+
+            -- Auth Provider (email, google, github)
+            provider VARCHAR(50) DEFAULT 'email',
+            provider_id VARCHAR(255),
+
+            -- Role (user, publisher, admin, super_admin)
+            role VARCHAR(20) DEFAULT 'user',
+
+            -- Account Status (active, user_deactivated, admin_suspended, banned)
+            account_status VARCHAR(20) DEFAULT 'active',
+
+            -- Legacy fields (保留向後兼容)
+            is_active BOOLEAN DEFAULT TRUE,
+            is_verified BOOLEAN DEFAULT FALSE,
+
+            -- Status Details
+            deactivated_at TIMESTAMP,
+            deactivation_reason TEXT,
+            banned_at TIMESTAMP,
+            banned_reason TEXT,
+            banned_by INTEGER,
+
+            -- Timestamps
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW(),
+            last_login_at TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+        CREATE INDEX IF NOT EXISTS idx_users_provider ON users(provider, provider_id);
+        CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);
+    """)
+
+    # ==================== Banned Emails ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS banned_emails (
+            id SERIAL PRIMARY KEY,
+            email VARCHAR(255) UNIQUE NOT NULL,
+            reason TEXT,
+            banned_by INTEGER REFERENCES users(id) ON DELETE SET NULL,
+            banned_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_banned_emails_email ON banned_emails(email);
+    """)
+
+    # ==================== System Settings ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS system_settings (
+            id SERIAL PRIMARY KEY,
+            setting_key VARCHAR(100) UNIQUE NOT NULL,
+            setting_value TEXT NOT NULL,
+            setting_type VARCHAR(20) DEFAULT 'string',
+            description TEXT,
+            updated_at TIMESTAMP DEFAULT NOW(),
+            updated_by INTEGER REFERENCES users(id) ON DELETE SET NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_settings_key ON system_settings(setting_key);
+    """)
+
+    # 插入預設設定（包含 CMS 設定）
+    await conn.execute("""
+        INSERT INTO system_settings (setting_key, setting_value, setting_type, description)
+        VALUES 
+            ('auto_delete_deactivated_users', 'false', 'boolean', '是否自動刪除停用超過 N 天的用戶'),
+            ('auto_delete_days', '30', 'integer', '自動刪除的天數（當啟用自動刪除時）'),
+            ('site_logo_light', '', 'url', 'Logo 圖片 URL (淺色版)'),
+            ('site_logo_dark', '', 'url', 'Logo 圖片 URL (深色版)'),
+            ('site_name', 'VortixPR', 'text', '網站名稱'),
+            ('site_slogan', 'Your Crypto&AI News Partner', 'text', '網站 Slogan'),
+            ('contact_email', 'hello@vortixpr.com', 'email', '聯絡信箱'),
+            ('contact_phone', '', 'text', '聯絡電話'),
+            ('social_twitter', '', 'url', 'Twitter 連結'),
+            ('social_linkedin', '', 'url', 'LinkedIn 連結'),
+            ('social_facebook', '', 'url', 'Facebook 連結'),
+            ('social_instagram', '', 'url', 'Instagram 連結'),
+            ('carousel_subtitle', 'Selected crypto, tech, AI and regional outlets we work with.', 'text', '首頁跑馬燈區域副標題')
+        ON CONFLICT (setting_key) DO NOTHING
+    """)
+
+    # 確保 carousel_subtitle 設定存在（針對已有資料庫的情況）
+    carousel_setting_exists = await conn.fetchval("""
+        SELECT EXISTS(SELECT 1 FROM system_settings WHERE setting_key = 'carousel_subtitle')
+    """)
+    if not carousel_setting_exists:
+        logger.info("📝 Adding carousel_subtitle setting...")
+        await conn.execute("""
+            INSERT INTO system_settings (setting_key, setting_value, setting_type, description)
+            VALUES ('carousel_subtitle', 'Selected crypto, tech, AI and regional outlets we work with.', 'text', '首頁跑馬燈區域副標題')
+        """)
+        logger.info("✅ Carousel subtitle setting added")
+
+    # ==================== FAQs ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS faqs (
+            id SERIAL PRIMARY KEY,
+            question TEXT NOT NULL,
+            answer TEXT NOT NULL,
+            display_order INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_faqs_active_order ON faqs(is_active, display_order);
+    """)
+
+    # ==================== Testimonials ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS testimonials (
+            id SERIAL PRIMARY KEY,
+            quote TEXT NOT NULL,
+            author_name VARCHAR(100) NOT NULL,
+            author_title VARCHAR(200),
+            author_company VARCHAR(200),
+            author_avatar_url TEXT,
+            display_order INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_testimonials_active_order ON testimonials(is_active, display_order);
+    """)
+
+    # ==================== Team Members ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS team_members (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            position VARCHAR(200) NOT NULL,
+            avatar_url TEXT,
+            bio TEXT,
+            linkedin_url TEXT,
+            twitter_url TEXT,
+            display_order INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_team_members_active_order ON team_members(is_active, display_order);
+    """)
+
+    # ==================== Section Contents (JSONB CMS) ====================
+    # 🎯 統一的 JSONB Section 管理表（現代化 CMS 架構）
+    # 取代舊的獨立表模式（services, publisher_section 等）
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS section_contents (
+            id SERIAL PRIMARY KEY,
+            section_key VARCHAR(100) UNIQUE NOT NULL,
+            content JSONB NOT NULL,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        -- GIN 索引：加速 JSONB 查詢
+        CREATE INDEX IF NOT EXISTS idx_section_content_gin 
+        ON section_contents USING GIN (content);
+
+        -- section_key 索引
+        CREATE INDEX IF NOT EXISTS idx_section_key 
+        ON section_contents (section_key);
+    """)
+
+    # ⚠️ 舊的 services 表已廢棄
+    # 已遷移到 section_contents (JSONB 模式)
+    # 
+    # 🗑️ 本地開發環境清理指令：
+    #    DROP TABLE IF EXISTS services;
+    # 
+    # 🚨 生產環境注意事項：
+    #    1. 如果生產環境已有 services 表且有資料，請先備份
+    #    2. 確認已遷移到 section_contents
+    #    3. 再手動執行：DROP TABLE services;
+    #    4. 本 database.py 不會自動刪除（遵循安全原則）
+
+    # ==================== Differentiators ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS differentiators (
+            id SERIAL PRIMARY KEY,
+            text TEXT NOT NULL,
+            display_order INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_differentiators_active_order ON differentiators(is_active, display_order);
+    """)
+
+    # ==================== Stats ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS stats (
+            id SERIAL PRIMARY KEY,
+            label VARCHAR(100) NOT NULL,
+            value INTEGER NOT NULL,
+            suffix VARCHAR(10) DEFAULT '+',
+            description TEXT,
+            display_order INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_stats_active_order ON stats(is_active, display_order);
+    """)
+
+    # ==================== Client Logos ====================
+    # 顯示在首頁 "Trusted by industry leaders" 區塊
+    # ⚠️ 遷移處理：如果舊的 partner_logos 表存在，先重命名
+    partner_table_exists = await conn.fetchval("""
+        SELECT EXISTS (
+            SELECT 1 FROM information_schema.tables 
+            WHERE table_name='partner_logos'
+        )
+    """)
+
+    if partner_table_exists:
+        logger.info("🔄 Migrating: Renaming partner_logos → client_logos...")
+        await conn.execute("ALTER TABLE partner_logos RENAME TO client_logos")
+
+        # 重命名索引（如果存在）
+        index_exists = await conn.fetchval("""
+            SELECT EXISTS (
+                SELECT 1 FROM pg_indexes 
+                WHERE indexname = 'idx_partner_logos_active_order'
+            )
+        """)
+        if index_exists:
+            await conn.execute("ALTER INDEX idx_partner_logos_active_order RENAME TO idx_client_logos_active_order")
+
+        logger.info("✅ Table renamed successfully")
+
+    # 現在創建表（如果還不存在）
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS client_logos (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            logo_url TEXT NOT NULL,
+            website_url TEXT,
+            display_order INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_client_logos_active_order ON client_logos(is_active, display_order);
+    """)
+
+    # ==================== Publisher Features ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS publisher_features (
+            id SERIAL PRIMARY KEY,
+            title VARCHAR(200) NOT NULL,
+            description TEXT NOT NULL,
+            display_order INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_publisher_features_active_order ON publisher_features(is_active, display_order);
+    """)
+
+    # ==================== Carousel Logos ====================
+    # 顯示在首頁跑馬燈區塊
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS carousel_logos (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            logo_url TEXT NOT NULL,
+            alt_text VARCHAR(200),
+            website_url TEXT,
+            display_order INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_carousel_logos_display_order ON carousel_logos(display_order);
+        CREATE INDEX IF NOT EXISTS idx_carousel_logos_is_active ON carousel_logos(is_active);
+        CREATE INDEX IF NOT EXISTS idx_carousel_logos_active_order ON carousel_logos(is_active, display_order);
+    """)
+
+    # 插入初始 Logo 數據（僅在表為空時）
+    carousel_count = await conn.fetchval("SELECT COUNT(*) FROM carousel_logos")
+    if carousel_count == 0:
+        logger.info("📝 Inserting initial carousel logos...")
+        await conn.execute("""
+            INSERT INTO carousel_logos (name, logo_url, alt_text, display_order, is_active) VALUES
+            ('BlockTempo', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/blocktempo%20logo_white_%E6%A9%AB.png', 'BlockTempo Logo', 1, true),
+            ('Media Partner 2', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/Logo.png', 'Media Logo', 2, true),
+            ('Media Partner 3', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/image-removebg-preview%20(57).png', 'Media Logo', 3, true),
+            ('Media Partner 4', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/image-removebg-preview%20(58).png', 'Media Logo', 4, true),
+            ('Media Partner 5', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/image-removebg-preview%20(59).png', 'Media Logo', 5, true),
+            ('Business Insider', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/business-insider.png', 'Business Insider Logo', 6, true),
+            ('Media Partner 7', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/image-removebg-preview%20(60).png', 'Media Logo', 7, true),
+            ('Media Partner 8', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/image-removebg-preview%20(61).png', 'Media Logo', 8, true),
+            ('Media Partner 9', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/output-onlinepngtools%20(9).png', 'Media Logo', 9, true)
+        """)
+        logger.info("✅ Initial carousel logos inserted")
+
+    # ==================== Hero Sections ====================
+    # ⚠️ 只定義原始的穩定欄位（遵循 DATABASE_ARCHITECTURE.md 原則）
+    # 新增欄位請新增下一個編號的 migration 處理
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS hero_sections (
+            id SERIAL PRIMARY KEY,
+            page VARCHAR(50) NOT NULL,
+
+            -- 基本 CTA 按鈕（原始欄位）
+            cta_primary_text VARCHAR(100),
+            cta_primary_url VARCHAR(500),
+            cta_secondary_text VARCHAR(100),
+            cta_secondary_url VARCHAR(500),
+
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW(),
+            UNIQUE(page)
+        );
+    """)
+
+    # ==================== Hero Media Logos ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS hero_media_logos (
+            id SERIAL PRIMARY KEY,
+            hero_page VARCHAR(50) NOT NULL,
+
+            -- Logo 資訊
+            name VARCHAR(200) NOT NULL,
+            logo_url TEXT NOT NULL,
+            website_url TEXT,
+
+            -- 視覺屬性
+            opacity DECIMAL(3,2) DEFAULT 0.5,
+            size VARCHAR(20) DEFAULT 'md',
+
+            -- 位置（自定義 CSS 值）
+            position_top VARCHAR(20),
+            position_left VARCHAR(20),
+            position_right VARCHAR(20),
+            position_bottom VARCHAR(20),
+
+            -- 動畫
+            animation_speed INTEGER DEFAULT 5,
+
+            display_order INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_hero_media_page ON hero_media_logos(hero_page);
+        CREATE INDEX IF NOT EXISTS idx_hero_media_active_order ON hero_media_logos(is_active, display_order);
+    """)
+
+    # ==================== Lyro Section ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS lyro_section (
+            id SERIAL PRIMARY KEY,
+
+            -- 內容
+            label VARCHAR(100),
+            title TEXT NOT NULL,
+            subtitle TEXT,
+            description TEXT,
+
+            -- 圖片
+            background_image_url TEXT,
+
+            -- 狀態
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+    """)
+
+    # ==================== Lyro Features ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS lyro_features (
+            id SERIAL PRIMARY KEY,
+            text TEXT NOT NULL,
+            display_order INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT TRUE,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_lyro_features_active_order ON lyro_features(is_active, display_order);
+    """)
+
+    # ==================== User Invitations ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS user_invitations (
+            id SERIAL PRIMARY KEY,
+            email VARCHAR(255) NOT NULL,
+            role VARCHAR(20) NOT NULL,
+
+            -- 邀請 Token
+            token VARCHAR(255) UNIQUE NOT NULL,
+
+            -- 邀請者（ON DELETE SET NULL - 刪除邀請者時不影響邀請記錄）
+            invited_by INTEGER REFERENCES users(id) ON DELETE SET NULL,
+
+            -- 狀態 (pending, accepted, expired, cancelled)
+            status VARCHAR(20) DEFAULT 'pending',
+
+            -- 過期時間（7 天）
+            expires_at TIMESTAMP NOT NULL,
+
+            -- Timestamps
+            created_at TIMESTAMP DEFAULT NOW(),
+            accepted_at TIMESTAMP,
+            accepted_by INTEGER REFERENCES users(id) ON DELETE SET NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_invitations_email ON user_invitations(email);
+        CREATE INDEX IF NOT EXISTS idx_invitations_token ON user_invitations(token);
+        CREATE INDEX IF NOT EXISTS idx_invitations_status ON user_invitations(status);
+    """)
+
+    # ==================== Blog Posts ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS blog_posts (
+            id SERIAL PRIMARY KEY,
+            title VARCHAR(255) NOT NULL,
+            slug VARCHAR(255) UNIQUE NOT NULL,
+            category VARCHAR(100) NOT NULL,
+            excerpt TEXT,
+            content TEXT NOT NULL,
+            author VARCHAR(100) DEFAULT 'VortixPR Team',
+            read_time INTEGER,
+            image_url TEXT,
+
+            -- SEO
+            meta_title VARCHAR(255),
+            meta_description TEXT,
+
+            -- Status
+            status VARCHAR(20) DEFAULT 'draft',
+
+            -- Timestamps
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW(),
+            published_at TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_blog_category ON blog_posts(category);
+        CREATE INDEX IF NOT EXISTS idx_blog_status ON blog_posts(status);
+        CREATE INDEX IF NOT EXISTS idx_blog_published_at ON blog_posts(published_at DESC);
+        CREATE INDEX IF NOT EXISTS idx_blog_slug ON blog_posts(slug);
+    """)
+
+    # ==================== Pricing Packages ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS pricing_packages (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            slug VARCHAR(100) UNIQUE NOT NULL,
+            description TEXT,
+            price DECIMAL(10, 2) NOT NULL,
+            currency VARCHAR(3) DEFAULT 'USD',
+            billing_period VARCHAR(20) DEFAULT 'monthly',
+
+            -- Features (JSON array)
+            features JSONB NOT NULL DEFAULT '[]'::jsonb,
+
+            -- Highlight
+            is_popular BOOLEAN DEFAULT FALSE,
+            badge_text VARCHAR(50),
+
+            -- Display Order
+            display_order INTEGER DEFAULT 0,
+
+            -- Status
+            status VARCHAR(20) DEFAULT 'active',
+
+            -- Timestamps
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_pricing_status ON pricing_packages(status);
+        CREATE INDEX IF NOT EXISTS idx_pricing_order ON pricing_packages(display_order);
+    """)
+
+    # ==================== Contact Submissions ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS contact_submissions (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            email VARCHAR(255) NOT NULL,
+            company VARCHAR(255),
+            phone VARCHAR(50),
+            message TEXT NOT NULL,
+
+            -- Status
+            status VARCHAR(20) DEFAULT 'new',
+
+            -- Metadata
+            ip_address VARCHAR(50),
+            user_agent TEXT,
+
+            created_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_contact_status ON contact_submissions(status);
+        CREATE INDEX IF NOT EXISTS idx_contact_created ON contact_submissions(created_at DESC);
+    """)
+
+    # ==================== Newsletter Subscribers ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS newsletter_subscribers (
+            id SERIAL PRIMARY KEY,
+            email VARCHAR(255) UNIQUE NOT NULL,
+
+            -- Status
+            status VARCHAR(20) DEFAULT 'active',
+
+            -- Metadata
+            source VARCHAR(50),
+            ip_address VARCHAR(50),
+
+            -- Timestamps
+            subscribed_at TIMESTAMP DEFAULT NOW(),
+            unsubscribed_at TIMESTAMP
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_newsletter_email ON newsletter_subscribers(email);
+        CREATE INDEX IF NOT EXISTS idx_newsletter_status ON newsletter_subscribers(status);
+    """)
+
+    # ==================== Publisher Applications ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS publisher_applications (
+            id SERIAL PRIMARY KEY,
+
+            -- Contact Info
+            name VARCHAR(100) NOT NULL,
+            email VARCHAR(255) NOT NULL,
+            company VARCHAR(255),
+            website VARCHAR(255),
+
+            -- Application Info
+            audience_size INTEGER,
+            content_topics TEXT[],
+            monthly_traffic INTEGER,
+            social_media JSONB,
+            additional_info TEXT,
+
+            -- Status
+            status VARCHAR(20) DEFAULT 'pending',
+            reviewed_at TIMESTAMP,
+            notes TEXT,
+
+            created_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_publisher_status ON publisher_applications(status);
+        CREATE INDEX IF NOT EXISTS idx_publisher_created ON publisher_applications(created_at DESC);
+    """)
+
+    # ==================== Navigation Items ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS navigation_items (
+            id SERIAL PRIMARY KEY,
+
+            -- Multi-language labels
+            label_en VARCHAR(100) NOT NULL,
+            label_zh VARCHAR(100),
+            label_ja VARCHAR(100),
+
+            -- URL for desktop and mobile (flexible: can be #section or /page)
+            desktop_url VARCHAR(255) NOT NULL,
+            mobile_url VARCHAR(255),
+            target VARCHAR(20) DEFAULT '_self',
+
+            -- Hierarchy support
+            parent_id INTEGER REFERENCES navigation_items(id) ON DELETE CASCADE,
+
+            -- Display
+            display_order INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT true,
+
+            -- Timestamps
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_nav_items_active_order ON navigation_items(is_active, display_order);
+        CREATE INDEX IF NOT EXISTS idx_nav_items_parent ON navigation_items(parent_id);
+    """)
+
+    # Navigation CTA Button
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS navigation_cta (
+            id SERIAL PRIMARY KEY,
+
+            -- Multi-language text
+            text_en VARCHAR(100) NOT NULL,
+            text_zh VARCHAR(100),
+            text_ja VARCHAR(100),
+
+            -- URL
+            url VARCHAR(255) NOT NULL,
+
+            -- Status
+            is_active BOOLEAN DEFAULT true,
+
+            -- Timestamps
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+    """)
+
+    # ==================== Footer Sections ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS footer_sections (
+            id SERIAL PRIMARY KEY,
+
+            -- Multi-language titles
+            title_en VARCHAR(100) NOT NULL,
+            title_zh VARCHAR(100),
+            title_ja VARCHAR(100),
+
+            -- Section identifier
+            section_key VARCHAR(50) NOT NULL UNIQUE,
+
+            -- Display
+            display_order INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT true,
+
+            -- Timestamps
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_footer_sections_active_order ON footer_sections(is_active, display_order);
+    """)
+
+    # Footer Links
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS footer_links (
+            id SERIAL PRIMARY KEY,
+
+            -- Parent section
+            section_id INTEGER REFERENCES footer_sections(id) ON DELETE CASCADE,
+
+            -- Multi-language labels
+            label_en VARCHAR(100) NOT NULL,
+            label_zh VARCHAR(100),
+            label_ja VARCHAR(100),
+
+            -- URL and behavior
+            url VARCHAR(255) NOT NULL,
+            target VARCHAR(20) DEFAULT '_self',
+
+            -- Display
+            display_order INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT true,
+
+            -- Timestamps
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_footer_links_section ON footer_links(section_id);
+        CREATE INDEX IF NOT EXISTS idx_footer_links_active_order ON footer_links(is_active, display_order);
+    """)
+
+    # Footer Text Settings
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS footer_text_settings (
+            id SERIAL PRIMARY KEY,
+
+            -- Setting identifier
+            setting_key VARCHAR(50) NOT NULL UNIQUE,
+
+            -- Multi-language values
+            value_en TEXT,
+            value_zh TEXT,
+            value_ja TEXT,
+
+            -- Timestamps
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+    """)
+
+    # ==================== PR Packages (首頁使用) ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS pr_packages (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            slug VARCHAR(100) UNIQUE NOT NULL,
+            price VARCHAR(50) NOT NULL,
+            description TEXT,
+            badge VARCHAR(100),
+            guaranteed_publications INTEGER,
+
+            -- Category (global-pr, asia-packages, founder-pr)
+            category_id VARCHAR(50) NOT NULL,
+            category_order INTEGER DEFAULT 0,  -- 分類顯示順序
+
+            -- JSON fields
+            media_logos JSONB DEFAULT '[]'::jsonb,
+            features JSONB NOT NULL DEFAULT '[]'::jsonb,
+            detailed_info JSONB,
+
+            -- Display Order (within category)
+            display_order INTEGER DEFAULT 0,
+
+            -- Audience (crypto, ai, both)
+            audience VARCHAR(16) NOT NULL DEFAULT 'crypto'
+                CONSTRAINT pr_packages_audience_check CHECK (audience IN ('crypto', 'ai', 'both')),
+
+            -- Status
+            status VARCHAR(20) DEFAULT 'active',
+
+            -- Timestamps
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_pr_packages_category ON pr_packages(category_id);
+        CREATE INDEX IF NOT EXISTS idx_pr_packages_status ON pr_packages(status);
+        CREATE INDEX IF NOT EXISTS idx_pr_packages_order ON pr_packages(category_order, display_order);
+    """)
+
+    # ==================== Migrations ====================
+    # Add audience column to existing pr_packages tables (idempotent)
+    audience_col_exists = await conn.fetchval("""
+        SELECT EXISTS(
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'pr_packages' AND column_name = 'audience'
+        )
+    """)
+    if not audience_col_exists:
+        logger.info("📝 Adding audience column to pr_packages...")
+        await conn.execute("""
+            ALTER TABLE pr_packages
+            ADD COLUMN audience VARCHAR(16) NOT NULL DEFAULT 'crypto'
+                CONSTRAINT pr_packages_audience_check CHECK (audience IN ('crypto', 'ai', 'both'))
+        """)
+        logger.info("✅ audience column added to pr_packages")
+    # Always ensure the index exists (idempotent)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_pr_packages_audience ON pr_packages(audience)
+    """)
+
+    # Media Files Table（媒體檔案管理）
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS media_files (
+            id SERIAL PRIMARY KEY,
+            filename VARCHAR(255) NOT NULL,
+            original_filename VARCHAR(255) NOT NULL,
+            file_key VARCHAR(500) UNIQUE NOT NULL,
+            file_url TEXT NOT NULL,
+            file_size INTEGER NOT NULL,
+            mime_type VARCHAR(100) NOT NULL,
+            folder VARCHAR(100) DEFAULT 'uploads',
+            width INTEGER,
+            height INTEGER,
+            alt_text VARCHAR(500),
+            caption TEXT,
+            uploaded_by VARCHAR(100),
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+
+    # Media Files Indexes
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_media_folder 
+        ON media_files(folder)
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_media_created 
+        ON media_files(created_at DESC)
+    """)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_media_mime 
+        ON media_files(mime_type)
+    """)
+
+    # ==================== PR Package Categories ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS pr_package_categories (
+            id SERIAL PRIMARY KEY,
+            category_id VARCHAR(50) UNIQUE NOT NULL,
+            title VARCHAR(100) NOT NULL,
+            badges JSONB DEFAULT '[]'::jsonb,
+            display_order INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_pr_categories_display_order 
+        ON pr_package_categories(display_order)
+    """)
+
+    # 插入預設分類（如果不存在）
+    await conn.execute("""
+        INSERT INTO pr_package_categories (category_id, title, badges, display_order)
+        VALUES 
+            ('global-pr', 'GLOBAL PR', '["🚀 Launches", "💰 Funding", "🤝 Partnerships"]'::jsonb, 1),
+            ('asia-packages', 'ASIA PACKAGES', '["🇨🇳 CN", "🇰🇷 KR", "🇯🇵 JP", "🌏 SEA"]'::jsonb, 2),
+            ('founder-pr', 'FOUNDER PR', '["👤 Founders", "💼 CMOs", "⭐ Key Leaders"]'::jsonb, 3)
+        ON CONFLICT (category_id) DO NOTHING
+    """)
+
+    # ==================== PR Templates ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS pr_templates (
+            id SERIAL PRIMARY KEY,
+
+            -- 基本資訊
+            title VARCHAR(200) NOT NULL,
+            description TEXT NOT NULL,
+            category VARCHAR(50) NOT NULL,
+            category_color VARCHAR(20) DEFAULT '#FF7400',
+            icon VARCHAR(50) DEFAULT 'FileText',
+
+            -- 內容（Markdown 格式）
+            content TEXT NOT NULL,
+
+            -- 分類與標籤（JSONB for flexibility）
+            industry_tags JSONB DEFAULT '[]'::jsonb,
+            use_cases JSONB DEFAULT '[]'::jsonb,
+            includes JSONB DEFAULT '[]'::jsonb,
+
+            -- 統計數據
+            download_count INTEGER DEFAULT 0,
+            email_request_count INTEGER DEFAULT 0,
+            preview_count INTEGER DEFAULT 0,
+            waitlist_count INTEGER DEFAULT 0,
+
+            -- 狀態與排序
+            is_active BOOLEAN DEFAULT TRUE,
+            display_order INTEGER DEFAULT 0,
+
+            -- 時間戳
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_pr_templates_category ON pr_templates(category);
+        CREATE INDEX IF NOT EXISTS idx_pr_templates_active ON pr_templates(is_active);
+        CREATE INDEX IF NOT EXISTS idx_pr_templates_order ON pr_templates(display_order);
+    """)
+
+    # ==================== Template Waitlist ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS template_waitlist (
+            id SERIAL PRIMARY KEY,
+            template_id INTEGER REFERENCES pr_templates(id) ON DELETE CASCADE,
+
+            -- 用戶資訊
+            email VARCHAR(255) NOT NULL,
+            name VARCHAR(200),
+
+            -- 偏好設定
+            subscribe_newsletter BOOLEAN DEFAULT TRUE,
+
+            -- 來源追蹤
+            source_template_title VARCHAR(200),
+            ip_address VARCHAR(50),
+            user_agent TEXT,
+
+            -- 狀態
+            status VARCHAR(20) DEFAULT 'pending',
+            invited_at TIMESTAMP,
+            activated_at TIMESTAMP,
+
+            -- 時間戳
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_waitlist_email ON template_waitlist(email);
+        CREATE INDEX IF NOT EXISTS idx_waitlist_template ON template_waitlist(template_id);
+        CREATE INDEX IF NOT EXISTS idx_waitlist_status ON template_waitlist(status);
+        CREATE INDEX IF NOT EXISTS idx_waitlist_created ON template_waitlist(created_at DESC);
+    """)
+
+    # ==================== Template Email Requests ====================
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS template_email_requests (
+            id SERIAL PRIMARY KEY,
+            template_id INTEGER REFERENCES pr_templates(id) ON DELETE CASCADE,
+
+            -- 用戶資訊
+            email VARCHAR(255) NOT NULL,
+
+            -- 發送狀態
+            status VARCHAR(20) DEFAULT 'pending',
+            sent_at TIMESTAMP,
+            opened_at TIMESTAMP,
+            clicked_at TIMESTAMP,
+
+            -- 追蹤（用於開信率統計）
+            tracking_id VARCHAR(100) UNIQUE,
+
+            -- 來源追蹤
+            ip_address VARCHAR(50),
+            user_agent TEXT,
+
+            -- 時間戳
+            created_at TIMESTAMP DEFAULT NOW()
+        )
+    """)
+
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_email_requests_email ON template_email_requests(email);
+        CREATE INDEX IF NOT EXISTS idx_email_requests_template ON template_email_requests(template_id);
+        CREATE INDEX IF NOT EXISTS idx_email_requests_status ON template_email_requests(status);
+        CREATE INDEX IF NOT EXISTS idx_email_requests_tracking ON template_email_requests(tracking_id);
+    """)
@@ -0,0 +1,43 @@
+"""
+users 帳號狀態欄位（account_status / 停用 / 封禁）
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def upgrade(conn):
+    account_status_exists = await conn.fetchval("""
+        SELECT EXISTS (
+            SELECT 1 FROM information_schema.columns 
+            WHERE table_name='users' AND column_name='account_status'
+        )
+    """)
+
+    if not account_status_exists:
+        logger.info("🔄 Adding account_status column to users table...")
+        await conn.execute("""
+            ALTER TABLE users ADD COLUMN account_status VARCHAR(20) DEFAULT 'active';
+            ALTER TABLE users ADD COLUMN deactivated_at TIMESTAMP;
+            ALTER TABLE users ADD COLUMN deactivation_reason TEXT;
+            ALTER TABLE users ADD COLUMN banned_at TIMESTAMP;
+            ALTER TABLE users ADD COLUMN banned_reason TEXT;
+            ALTER TABLE users ADD COLUMN banned_by INTEGER;
+        """)
+
+        # 為現有用戶設定預設狀態
+        await conn.execute("""
+            UPDATE users 
+            SET account_status = CASE 
+                WHEN is_active = TRUE THEN 'active'
+                ELSE 'admin_suspended'
+            END
+            WHERE account_status IS NULL
+        """)
+
+        # 添加索引（在確保欄位存在後）
+        await conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_users_account_status ON users(account_status)
+        """)
+
+        logger.info("✅ account_status columns and index added")
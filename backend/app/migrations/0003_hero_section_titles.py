@@ -0,0 +1,56 @@
+"""
+hero_sections 新版標題欄位（title_prefix / highlights / suffix 等）
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def upgrade(conn):
+    # Step 1: 處理舊的 title 欄位（如果存在）- 獨立執行
+    old_title_exists = await conn.fetchval("""
+        SELECT EXISTS (
+            SELECT 1 FROM information_schema.columns 
+            WHERE table_name='hero_sections' AND column_name='title'
+        )
+    """)
+
+    if old_title_exists:
+        # 檢查是否有 NOT NULL 約束
+        title_is_not_null = await conn.fetchval("""
+            SELECT is_nullable = 'NO'
+            FROM information_schema.columns 
+            WHERE table_name='hero_sections' AND column_name='title'
+        """)
+
+        if title_is_not_null:
+            logger.info("🔄 Removing NOT NULL constraint from old title column...")
+            await conn.execute("""
+                ALTER TABLE hero_sections ALTER COLUMN title DROP NOT NULL;
+            """)
+            logger.info("✅ Old title column constraint removed")
+
+    # Step 2: 添加新欄位
+    title_prefix_exists = await conn.fetchval("""
+        SELECT EXISTS (
+            SELECT 1 FROM information_schema.columns 
+            WHERE table_name='hero_sections' AND column_name='title_prefix'
+        )
+    """)
+
+    if not title_prefix_exists:
+        logger.info("🔄 Adding new title fields to hero_sections table...")
+        await conn.execute("""
+            ALTER TABLE hero_sections 
+            ADD COLUMN IF NOT EXISTS title_prefix TEXT,
+            ADD COLUMN IF NOT EXISTS title_highlights TEXT[],
+            ADD COLUMN IF NOT EXISTS title_suffix TEXT,
+            ADD COLUMN IF NOT EXISTS subtitle TEXT,
+            ADD COLUMN IF NOT EXISTS description TEXT,
+            ADD COLUMN IF NOT EXISTS center_logo_url TEXT,
+            ADD COLUMN IF NOT EXISTS cta_primary_url_mobile VARCHAR(500),
+            ADD COLUMN IF NOT EXISTS cta_secondary_url_mobile VARCHAR(500),
+            ADD COLUMN IF NOT EXISTS background_image_url TEXT,
+            ADD COLUMN IF NOT EXISTS background_video_url TEXT;
+        """)
+        logger.info("✅ Hero sections new fields added")
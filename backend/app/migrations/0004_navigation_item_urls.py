@@ -0,0 +1,81 @@
+"""
+navigation_items：url + section_id → desktop_url + mobile_url
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def upgrade(conn):
+    # 檢查並添加/轉換 navigation_items 的 URL 欄位
+    # 舊設計：url + section_id
+    # 新設計：desktop_url + mobile_url（更靈活）
+    desktop_url_exists = await conn.fetchval("""
+        SELECT EXISTS (
+            SELECT 1 FROM information_schema.columns 
+            WHERE table_name='navigation_items' AND column_name='desktop_url'
+        )
+    """)
+
+    if not desktop_url_exists:
+        logger.info("🔄 Converting navigation_items to desktop_url/mobile_url structure...")
+
+        # 如果有舊的 url 欄位，先遷移資料
+        old_url_exists = await conn.fetchval("""
+            SELECT EXISTS (
+                SELECT 1 FROM information_schema.columns 
+                WHERE table_name='navigation_items' AND column_name='url'
+            )
+        """)
+
+        if old_url_exists:
+            # 添加新欄位
+            await conn.execute("""
+                ALTER TABLE navigation_items 
+                ADD COLUMN IF NOT EXISTS desktop_url VARCHAR(255),
+                ADD COLUMN IF NOT EXISTS mobile_url VARCHAR(255);
+            """)
+
+            # 遷移資料：如果有 section_id，desktop 用 #section，否則用 url
+            section_id_exists = await conn.fetchval("""
+                SELECT EXISTS (
+                    SELECT 1 FROM information_schema.columns 
+                    WHERE table_name='navigation_items' AND column_name='section_id'
+                )
+            """)
+
+            if section_id_exists:
+                await conn.execute("""
+                    UPDATE navigation_items 
+                    SET desktop_url = CASE 
+                        WHEN section_id IS NOT NULL AND section_id != '' 
+                        THEN '#' || section_id 
+                        ELSE url 
+                    END,
+                    mobile_url = url
+                    WHERE desktop_url IS NULL;
+                """)
+            else:
+                await conn.execute("""
+                    UPDATE navigation_items 
+                    SET desktop_url = url,
+                    mobile_url = url
+                    WHERE desktop_url IS NULL;
+                """)
+
+            # 刪除舊欄位
+            await conn.execute("""
+                ALTER TABLE navigation_items 
+                DROP COLUMN IF EXISTS url,
+                DROP COLUMN IF EXISTS section_id;
+            """)
+
+            logger.info("✅ Navigation items converted to desktop_url/mobile_url structure")
+        else:
+            # 沒有舊欄位，只添加新欄位
+            await conn.execute("""
+                ALTER TABLE navigation_items 
+                ADD COLUMN IF NOT EXISTS desktop_url VARCHAR(255),
+                ADD COLUMN IF NOT EXISTS mobile_url VARCHAR(255);
+            """)
+            logger.info("✅ Navigation items desktop_url/mobile_url fields added")
@@ -0,0 +1,25 @@
+"""
+blog_posts 標籤
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def upgrade(conn):
+    tags_exists = await conn.fetchval("""
+        SELECT EXISTS (
+            SELECT 1 FROM information_schema.columns 
+            WHERE table_name='blog_posts' AND column_name='tags'
+        )
+    """)
+
+    if not tags_exists:
+        logger.info("🔄 Adding tags field to blog_posts...")
+        await conn.execute("""
+            ALTER TABLE blog_posts 
+            ADD COLUMN tags JSONB DEFAULT '[]'::jsonb;
+        """)
+        logger.info("✅ tags field added to blog_posts")
+    else:
+        logger.info("✅ tags field already exists in blog_posts")
@@ -0,0 +1,60 @@
+"""
+Blog 全文搜尋索引（blog_search_index + trigger）
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def upgrade(conn):
+    # tsvector 放在獨立表，避免 SELECT * FROM blog_posts 把整份索引帶回應用程式
+    # 由 trigger 維護；既有文章由 services/blog_search.backfill_search_index() 補建
+    search_trigger_exists = await conn.fetchval("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_trigger WHERE tgname = 'trg_blog_search_index'
+        )
+    """)
+
+    if not search_trigger_exists:
+        logger.info("🔄 Adding full-text search index for blog_posts...")
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS blog_search_index (
+                post_id INTEGER PRIMARY KEY REFERENCES blog_posts(id) ON DELETE CASCADE,
+                document TSVECTOR NOT NULL,
+                updated_at TIMESTAMP DEFAULT NOW()
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_blog_search_document
+            ON blog_search_index USING GIN (document);
+
+            -- 標題 A > 摘要/標籤 B > 內文（去除 HTML）C
+            CREATE OR REPLACE FUNCTION blog_search_document(
+                p_title TEXT, p_excerpt TEXT, p_content TEXT, p_tags JSONB
+            ) RETURNS TSVECTOR LANGUAGE sql IMMUTABLE AS $$
+                SELECT
+                    setweight(to_tsvector('english', coalesce(p_title, '')), 'A')
+                    || setweight(to_tsvector('english', coalesce(p_excerpt, '')), 'B')
+                    || setweight(to_tsvector('english', coalesce((
+                        SELECT string_agg(tag, ' ')
+                        FROM jsonb_array_elements_text(
+                            CASE WHEN jsonb_typeof(p_tags) = 'array' THEN p_tags ELSE '[]'::jsonb END
+                        ) AS tag
+                    ), '')), 'B')
+                    || setweight(to_tsvector('english', regexp_replace(coalesce(p_content, ''), '<[^>]+>', ' ', 'g')), 'C')
+            $$;
+
+            CREATE OR REPLACE FUNCTION blog_search_index_sync() RETURNS TRIGGER LANGUAGE plpgsql AS $$
+            BEGIN
+                INSERT INTO blog_search_index (post_id, document, updated_at)
+                VALUES (NEW.id, blog_search_document(NEW.title, NEW.excerpt, NEW.content, NEW.tags), NOW())
+                ON CONFLICT (post_id) DO UPDATE
+                SET document = EXCLUDED.document, updated_at = NOW();
+                RETURN NULL;
+            END;
+            $$;
+
+            CREATE TRIGGER trg_blog_search_index
+            AFTER INSERT OR UPDATE OF title, excerpt, content, tags ON blog_posts
+            FOR EACH ROW EXECUTE FUNCTION blog_search_index_sync();
+        """)
+        logger.info("✅ Full-text search index added (run backfill for existing posts)")
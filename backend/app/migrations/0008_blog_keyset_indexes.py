@@ -0,0 +1,20 @@
+"""
+Blog keyset 分頁索引
+"""
+
+
+async def upgrade(conn):
+    # cursor 分頁：public 依 (published_at, id)、admin 依 (updated_at, id)
+    await conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_blog_posts_status_published_id
+        ON blog_posts (status, published_at DESC NULLS LAST, id DESC);
+
+        CREATE INDEX IF NOT EXISTS idx_blog_posts_published_id
+        ON blog_posts (published_at DESC NULLS LAST, id DESC);
+
+        CREATE INDEX IF NOT EXISTS idx_blog_posts_status_updated_id
+        ON blog_posts (status, updated_at DESC NULLS LAST, id DESC);
+
+        CREATE INDEX IF NOT EXISTS idx_blog_posts_updated_id
+        ON blog_posts (updated_at DESC NULLS LAST, id DESC);
+    """)
@@ -0,0 +1,39 @@
+"""
+Notion webhook 背景同步 queue（notion_sync_jobs）
+"""
+
+
+async def upgrade(conn):
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS notion_sync_jobs (
+            id SERIAL PRIMARY KEY,
+            notion_page_id VARCHAR(100) NOT NULL,
+            last_edited_time TIMESTAMP,
+            status VARCHAR(20) NOT NULL DEFAULT 'queued'
+                CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 5,
+            run_after TIMESTAMP NOT NULL DEFAULT NOW(),
+            locked_at TIMESTAMP,
+            locked_by VARCHAR(100),
+            last_error TEXT,
+            result JSONB,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW(),
+            finished_at TIMESTAMP
+        );
+
+        -- 去重：同一頁面的同一版本只有一個 job；沒有版本資訊時同一頁面只有一個未完成 job
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_notion_sync_jobs_version
+        ON notion_sync_jobs (notion_page_id, last_edited_time)
+        WHERE last_edited_time IS NOT NULL;
+
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_notion_sync_jobs_active
+        ON notion_sync_jobs (notion_page_id)
+        WHERE last_edited_time IS NULL AND status IN ('queued', 'running');
+
+        -- worker 領取 job
+        CREATE INDEX IF NOT EXISTS idx_notion_sync_jobs_runnable
+        ON notion_sync_jobs (run_after, id)
+        WHERE status IN ('queued', 'running');
+    """)
@@ -0,0 +1,22 @@
+"""
+Notion 增量同步（notion_image_map / notion_render_cache）
+"""
+
+
+async def upgrade(conn):
+    # notion_image_map：來源圖片（去掉簽章的 URL）→ R2 物件，已上傳的圖片不再重新下載
+    # notion_render_cache：每個頁面的 block hash → HTML 片段，未變更的 block 不重新轉換
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS notion_image_map (
+            source_key TEXT PRIMARY KEY,
+            r2_key TEXT NOT NULL,
+            r2_url TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE TABLE IF NOT EXISTS notion_render_cache (
+            notion_page_id VARCHAR(100) PRIMARY KEY,
+            blocks JSONB NOT NULL DEFAULT '{}'::jsonb,
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+    """)
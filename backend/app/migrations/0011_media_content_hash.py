@@ -0,0 +1,13 @@
+"""
+media_files content-addressed 去重（content_hash）
+"""
+
+
+async def upgrade(conn):
+    # content_hash = 檔案內容 SHA-256；相同內容只保留一筆記錄、一個 R2 物件（舊資料為 NULL）
+    await conn.execute("""
+        ALTER TABLE media_files ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
+
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_media_content_hash
+        ON media_files (content_hash);
+    """)
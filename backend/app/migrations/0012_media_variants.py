@@ -0,0 +1,25 @@
+"""
+Responsive 縮圖（media_variants）
+"""
+
+
+async def upgrade(conn):
+    # 以 source_url 對應原圖：媒體庫檔案與 Notion 封面（不在 media_files）都適用
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS media_variants (
+            id SERIAL PRIMARY KEY,
+            media_file_id INTEGER REFERENCES media_files(id) ON DELETE SET NULL,
+            source_url TEXT NOT NULL,
+            width INTEGER NOT NULL,
+            height INTEGER NOT NULL,
+            format VARCHAR(10) NOT NULL,
+            file_key VARCHAR(500) NOT NULL,
+            file_url TEXT NOT NULL,
+            file_size INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT NOW(),
+            UNIQUE (source_url, width, format)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_media_variants_media_file
+        ON media_variants (media_file_id);
+    """)
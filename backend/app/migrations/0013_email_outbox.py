@@ -0,0 +1,36 @@
+"""
+Email outbox（交易式寄信）
+"""
+
+
+async def upgrade(conn):
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS email_outbox (
+            id BIGSERIAL PRIMARY KEY,
+            kind VARCHAR(50) NOT NULL,
+            to_emails TEXT[] NOT NULL,
+            subject TEXT NOT NULL,
+            html TEXT NOT NULL,
+            from_email VARCHAR(255),
+            status VARCHAR(20) NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 6,
+            run_after TIMESTAMP NOT NULL DEFAULT NOW(),
+            locked_at TIMESTAMP,
+            locked_by VARCHAR(255),
+            provider_message_id VARCHAR(255),
+            last_error TEXT,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            sent_at TIMESTAMP,
+            CONSTRAINT email_outbox_status_check
+                CHECK (status IN ('queued', 'sending', 'sent', 'failed'))
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_email_outbox_runnable
+        ON email_outbox (run_after, id)
+        WHERE status IN ('queued', 'sending');
+
+        CREATE INDEX IF NOT EXISTS idx_email_outbox_created
+        ON email_outbox (created_at DESC);
+    """)
@@ -0,0 +1,41 @@
+"""
+Newsletter 群發（newsletter_campaigns / recipients）
+"""
+
+
+async def upgrade(conn):
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS newsletter_campaigns (
+            id SERIAL PRIMARY KEY,
+            subject VARCHAR(255) NOT NULL,
+            content_html TEXT NOT NULL,
+            segment_source VARCHAR(50),
+            status VARCHAR(20) NOT NULL DEFAULT 'draft'
+                CHECK (status IN ('draft', 'sending', 'paused', 'completed', 'failed')),
+            total_recipients INTEGER NOT NULL DEFAULT 0,
+            sent_count INTEGER NOT NULL DEFAULT 0,
+            failed_count INTEGER NOT NULL DEFAULT 0,
+            last_subscriber_id INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW(),
+            started_at TIMESTAMP,
+            completed_at TIMESTAMP
+        );
+
+        -- 每位收件人的寄送結果（已有記錄 = 已處理，續傳時跳過）
+        CREATE TABLE IF NOT EXISTS newsletter_campaign_recipients (
+            campaign_id INTEGER NOT NULL REFERENCES newsletter_campaigns(id) ON DELETE CASCADE,
+            subscriber_id INTEGER NOT NULL,
+            email VARCHAR(255) NOT NULL,
+            status VARCHAR(20) NOT NULL CHECK (status IN ('sent', 'failed')),
+            provider_message_id VARCHAR(255),
+            error TEXT,
+            processed_at TIMESTAMP DEFAULT NOW(),
+            PRIMARY KEY (campaign_id, subscriber_id)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_newsletter_campaign_recipients_failed
+        ON newsletter_campaign_recipients (campaign_id)
+        WHERE status = 'failed';
+    """)
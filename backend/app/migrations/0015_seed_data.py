@@ -0,0 +1,320 @@
+"""
+初始資料（資料表為空時才寫入）
+"""
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def upgrade(conn):
+    # 檢查 pricing_packages 是否有資料
+    count = await conn.fetchval("SELECT COUNT(*) FROM pricing_packages")
+
+    if count == 0:
+        logger.info("📝 Seeding pricing packages...")
+
+        # 插入初始的 pricing packages（JSONB 需要 JSON 字串）
+        await conn.execute("""
+            INSERT INTO pricing_packages (name, slug, description, price, features, is_popular, display_order, status)
+            VALUES
+                ($1, $2, $3, $4, $5::jsonb, $6, $7, $8),
+                ($9, $10, $11, $12, $13::jsonb, $14, $15, $16),
+                ($17, $18, $19, $20, $21::jsonb, $22, $23, $24)
+        """,
+            'Starter', 'starter', 'Perfect for small projects and startups', 999.00,
+            json.dumps(["5 Press Releases/Month", "Media Database Access", "Basic Analytics", "Email Support"]),
+            False, 1, 'active',
+
+            'Professional', 'professional', 'Ideal for growing businesses', 2999.00,
+            json.dumps(["15 Press Releases/Month", "Premium Media Database", "Advanced Analytics", "Priority Support", "Social Media Integration"]),
+            True, 2, 'active',
+
+            'Enterprise', 'enterprise', 'For large organizations', 5999.00,
+            json.dumps(["Unlimited Press Releases", "Dedicated Account Manager", "Custom Analytics Dashboard", "24/7 Support", "API Access", "White Label Options"]),
+            False, 3, 'active'
+        )
+
+        logger.info("✅ Pricing packages seeded")
+
+    # === Seed FAQs ===
+    faq_count = await conn.fetchval("SELECT COUNT(*) FROM faqs")
+    if faq_count == 0:
+        logger.info("📝 Seeding FAQs...")
+        await conn.execute("""
+            INSERT INTO faqs (question, answer, display_order, is_active)
+            VALUES
+                ('How fast can you distribute a PR?', 'Most releases are scheduled within 24–48 hours after final approval.\n\nRush options may be available depending on the package.', 1, true),
+                ('What media outlets are included?', 'We work with a mix of crypto, AI, tech and Asia-regional publications, including news sites, niche media and aggregators.\n\nOutlet access varies by package and market targeting.', 2, true),
+                ('Do you guarantee placements?', 'Certain packages include guaranteed publication based on predefined outlet categories.\n\nEditorial features, interviews or headlines are not guaranteed and depend on publisher discretion.', 3, true),
+                ('How many revisions are included?', 'Packages include one round of revisions before distribution.\n\nAdditional edits or rewrites are available as add-ons.', 4, true),
+                ('What''s the Asia localization process?', 'Localization includes regional messaging alignment, optional language adaptation, and distribution to relevant Asia media lists depending on your tier.', 5, true),
+                ('Do you help with strategy?', 'Strategy support is available as an add-on.\n\nSome packages include light headline or angle refinement prior to distribution.', 6, true)
+        """)
+        logger.info("✅ FAQs seeded")
+
+    # === Seed Testimonials ===
+    testimonial_count = await conn.fetchval("SELECT COUNT(*) FROM testimonials")
+    if testimonial_count == 0:
+        logger.info("📝 Seeding testimonials...")
+        await conn.execute("""
+            INSERT INTO testimonials (quote, author_name, author_title, author_company, display_order, is_active)
+            VALUES
+                ('Professional, results-driven, and incredibly well-connected. VortixPR delivered beyond our expectations for our token launch.', 'Michael Kim', 'Head of Marketing', 'BlockchainVentures', 1, true),
+                ('Their strategic approach to AI PR positioning helped us stand out in a crowded market. The media coverage exceeded all expectations.', 'Emily Watson', 'CEO', 'FinTech Innovations', 2, true),
+                ('VortixPR''s deep understanding of the crypto space and regulatory landscape made our exchange launch seamless and successful.', 'David Park', 'Marketing Director', 'CryptoExchange Pro', 3, true),
+                ('The team''s expertise in DeFi marketing helped us reach the right investors at the perfect time. Truly exceptional service and results.', 'Sarah Chen', 'Co-founder', 'DeFi Protocol Labs', 4, true),
+                ('From concept to launch, VortixPR guided our NFT project with precision and creativity. The community response was incredible.', 'Alex Rodriguez', 'Creative Director', 'MetaArt Studios', 5, true),
+                ('Outstanding work on our Web3 gaming platform launch. Their understanding of both gaming and crypto audiences is unmatched.', 'Jordan Taylor', 'CEO', 'GameChain Interactive', 6, true)
+        """)
+        logger.info("✅ Testimonials seeded")
+
+    # === Seed Services (JSONB 模式) ===
+    # ⚠️ 已遷移到 section_contents 表（JSONB 格式）
+    # 舊的 services 表已廢棄，不再使用
+    section_count = await conn.fetchval("SELECT COUNT(*) FROM section_contents WHERE section_key = 'services'")
+    if section_count == 0:
+        logger.info("📝 Seeding services section (JSONB)...")
+        import json
+        services_content = {
+            'label': 'Services',
+            'title': 'What We Offer',
+            'description': 'At VortixPR, we amplify blockchain, Web3, and AI projects through strategic media engagement. Our global network ensures your message resonates with the right audience.',
+            'cta': {
+                'text': 'Get Started',
+                'url': '/contact'
+            },
+            'items': [
+                {'id': 1, 'title': 'Global Press Distribution', 'description': 'Targeted distribution across top crypto, tech and AI media.', 'icon': 'globe', 'display_order': 1},
+                {'id': 2, 'title': 'Asia-Market Localization & Outreach', 'description': 'CN, KR, JP & SEA outreach with language + narrative adaptation.', 'icon': 'language', 'display_order': 2},
+                {'id': 3, 'title': 'PR & Narrative Strategy', 'description': 'Angle shaping, headline advice, and editorial review.', 'icon': 'strategy', 'display_order': 3},
+                {'id': 4, 'title': 'Founder & Personal Branding PR', 'description': 'Articles, interviews and content for founder authority.', 'icon': 'user', 'display_order': 4},
+                {'id': 5, 'title': 'Influencer Marketing & Community Activation', 'description': 'Leverage key opinion leaders and build engaged communities around your project.', 'icon': 'users', 'display_order': 5}
+            ]
+        }
+        await conn.execute("""
+            INSERT INTO section_contents (section_key, content)
+            VALUES ($1, $2::jsonb)
+        """, 'services', json.dumps(services_content))
+        logger.info("✅ Services section seeded (JSONB)")
+
+    # === Seed Differentiators ===
+    diff_count = await conn.fetchval("SELECT COUNT(*) FROM differentiators")
+    if diff_count == 0:
+        logger.info("📝 Seeding differentiators...")
+        await conn.execute("""
+            INSERT INTO differentiators (text, display_order, is_active)
+            VALUES
+                ('Distribution + strategy under one roof', 1, true),
+                ('Asia-native editorial network', 2, true),
+                ('AI-backed narrative & LLM optimization', 3, true),
+                ('Transparent pricing, no hidden fees', 4, true),
+                ('Founder-friendly packages + add-ons', 5, true)
+        """)
+        logger.info("✅ Differentiators seeded")
+
+    # === Seed Stats ===
+    stats_count = await conn.fetchval("SELECT COUNT(*) FROM stats")
+    if stats_count == 0:
+        logger.info("📝 Seeding stats...")
+        await conn.execute("""
+            INSERT INTO stats (label, value, suffix, description, display_order, is_active)
+            VALUES
+                ('Publications', 900, '+', 'Media outlets in our global network', 1, true),
+                ('Brands', 300, '+', 'Clients successfully served', 2, true),
+                ('Countries', 20, '+', 'Global reach across continents', 3, true),
+                ('Media Reach', 1003, 'M+', 'Total audience impressions delivered', 4, true)
+        """)
+        logger.info("✅ Stats seeded")
+
+    # === Seed Publisher Features ===
+    pub_count = await conn.fetchval("SELECT COUNT(*) FROM publisher_features")
+    if pub_count == 0:
+        logger.info("📝 Seeding publisher features...")
+        await conn.execute("""
+            INSERT INTO publisher_features (title, description, display_order, is_active)
+            VALUES
+                ('Premium Media Access', 'Connect with 500+ verified crypto & AI outlets instantly', 1, true),
+                ('Revenue Share Model', 'Earn up to 40% commission on successful placements', 2, true),
+                ('Publisher Dashboard', 'Track performance, earnings, and content in real-time', 3, true),
+                ('Priority Support', 'Dedicated support team for all your publishing needs', 4, true)
+        """)
+        logger.info("✅ Publisher features seeded")
+
+    # === Seed Hero Sections ===
+    hero_count = await conn.fetchval("SELECT COUNT(*) FROM hero_sections")
+    if hero_count == 0:
+        logger.info("📝 Seeding hero sections...")
+        await conn.execute("""
+            INSERT INTO hero_sections (page, title_prefix, title_highlights, subtitle, cta_primary_text, cta_primary_url, cta_secondary_text, cta_secondary_url, center_logo_url, is_active)
+            VALUES
+                ('home', 
+                 'Strategic PR & Global Press Distribution for', 
+                 ARRAY['Web3 & AI']::text[],
+                 'Fast, reliable coverage — global & Asia — with optional narrative support and founder visibility.', 
+                 'View Packages', 
+                 '/packages', 
+                 'Submit Press Release', 
+                 '/contact',
+                 'https://img.vortixpr.com/VortixPR_Website/Vortix%20Logo%20mark.png',
+                 true)
+        """)
+        logger.info("✅ Hero sections seeded")
+
+    # === Seed Hero Media Logos（首頁的 8 個 logo）===
+    hero_logo_count = await conn.fetchval("SELECT COUNT(*) FROM hero_media_logos")
+    if hero_logo_count == 0:
+        logger.info("📝 Seeding hero media logos...")
+        await conn.execute("""
+            INSERT INTO hero_media_logos (hero_page, name, logo_url, opacity, size, position_top, position_right, display_order, is_active)
+            VALUES
+                ('home', 'BlockTempo', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/blocktempo%20logo_white_%E6%A9%AB.png', 0.6, 'lg', '8%', '22%', 1, true),
+                ('home', 'The Block', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/image-removebg-preview%20(57).png', 0.45, 'md', '20%', null, 2, true),
+                ('home', 'Investing.com', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/Logo.png', 0.4, 'sm', '30%', '2%', 3, true),
+                ('home', 'CoinTelegraph', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/image-removebg-preview%20(58).png', 0.55, 'lg', '52%', '-7%', 4, true),
+                ('home', 'CoinDesk', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/image-removebg-preview%20(59).png', 0.5, 'md', '62%', null, 5, true),
+                ('home', 'Business Insider', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/business-insider.png', 0.42, 'sm', '84%', null, 6, true),
+                ('home', 'Decrypt', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/image-removebg-preview%20(60).png', 0.4, 'sm', '80%', '12%', 7, true),
+                ('home', 'Bitcoin Magazine', 'https://img.vortixpr.com/VortixPR_Website/For%20media%20cloud%20(hero)/image-removebg-preview%20(61).png', 0.45, 'md', '68%', '28%', 8, true)
+        """)
+
+        # 設置 left 位置（需要另外 UPDATE，因為有些是 left 有些是 right）
+        await conn.execute("""
+            UPDATE hero_media_logos SET position_left = '-8%' WHERE name = 'The Block';
+            UPDATE hero_media_logos SET position_left = '-5%' WHERE name = 'CoinDesk';
+            UPDATE hero_media_logos SET position_left = '20%' WHERE name = 'Business Insider';
+            UPDATE hero_media_logos SET position_left = '13%' WHERE name = 'Bitcoin.com';
+        """)
+
+        logger.info("✅ Hero media logos seeded")
+
+    # === Seed Lyro Section ===
+    lyro_count = await conn.fetchval("SELECT COUNT(*) FROM lyro_section")
+    if lyro_count == 0:
+        logger.info("📝 Seeding lyro section...")
+        await conn.execute("""
+            INSERT INTO lyro_section (label, title, subtitle, description, background_image_url, is_active)
+            VALUES
+                ('#lyro_engine', 
+                 'Lyro — AI Narrative Engine', 
+                 '(Coming Soon)',
+                 'Lyro is our internal AI tool that analyzes your announcement before distribution. It checks for clarity, angle suitability, and how well LLMs can surface your story in search, news, and AI feeds.',
+                 'https://img.vortixpr.com/VortixPR_Website/Left_Point_Cat-2.png',
+                 true)
+        """)
+        logger.info("✅ Lyro section seeded")
+
+    # === Seed Lyro Features ===
+    lyro_feat_count = await conn.fetchval("SELECT COUNT(*) FROM lyro_features")
+    if lyro_feat_count == 0:
+        logger.info("📝 Seeding lyro features...")
+        await conn.execute("""
+            INSERT INTO lyro_features (text, display_order, is_active)
+            VALUES
+                ('Narrative optimization', 1, true),
+                ('Media angle suggestions', 2, true),
+                ('LLM visibility forecasting', 3, true),
+                ('Asia geo-angle adjustments', 4, true)
+        """)
+        logger.info("✅ Lyro features seeded")
+
+    # === Seed Navigation Items ===
+    # 使用原有的 navigationData.ts 資料
+    # desktop_url: 桌面版（#section 或 /page）
+    # mobile_url: 手機版（通常是 /page）
+    nav_count = await conn.fetchval("SELECT COUNT(*) FROM navigation_items")
+    if nav_count == 0:
+        logger.info("📝 Seeding navigation items...")
+        await conn.execute("""
+            INSERT INTO navigation_items (label_en, desktop_url, mobile_url, target, display_order, is_active)
+            VALUES
+                ('About', '#about-section', '/about', '_self', 1, true),
+                ('Services', '#services-section', '/services', '_self', 2, true),
+                ('Packages', '#packages-section', '/pricing', '_self', 3, true),
+                ('Publisher', '#publisher-section', '/publisher', '_self', 4, true),
+                ('Contact', '#contact-section', '/contact', '_self', 5, true),
+                ('Lyro', '#lyro-section', '/lyro', '_self', 6, true)
+        """)
+        logger.info("✅ Navigation items seeded")
+    elif nav_count > 6:
+        # 清理重複資料（如果有的話）
+        logger.info("🧹 Cleaning duplicate navigation items...")
+        await conn.execute("""
+            DELETE FROM navigation_items
+            WHERE id NOT IN (
+                SELECT MIN(id)
+                FROM navigation_items
+                GROUP BY label_en, desktop_url
+            )
+        """)
+        logger.info("✅ Duplicates cleaned")
+
+    # === Seed Navigation CTA ===
+    nav_cta_count = await conn.fetchval("SELECT COUNT(*) FROM navigation_cta")
+    if nav_cta_count == 0:
+        logger.info("📝 Seeding navigation CTA...")
+        await conn.execute("""
+            INSERT INTO navigation_cta (text_en, url, is_active)
+            VALUES ('Get Started', '/contact', true)
+        """)
+        logger.info("✅ Navigation CTA seeded")
+
+    # === Seed Footer Sections ===
+    # 使用原有的 footerData.ts 資料
+    footer_section_count = await conn.fetchval("SELECT COUNT(*) FROM footer_sections")
+    if footer_section_count == 0:
+        logger.info("📝 Seeding footer sections...")
+        await conn.execute("""
+            INSERT INTO footer_sections (section_key, title_en, display_order, is_active)
+            VALUES
+                ('map', 'Map', 1, true),
+                ('resources', 'Resources', 2, true),
+                ('policies', 'Policies', 3, true)
+        """)
+        logger.info("✅ Footer sections seeded")
+
+    # === Seed Footer Links ===
+    # 使用原有的 footerData.ts 資料
+    footer_link_count = await conn.fetchval("SELECT COUNT(*) FROM footer_links")
+    if footer_link_count == 0:
+        logger.info("📝 Seeding footer links...")
+        # 取得 section IDs
+        map_id = await conn.fetchval("SELECT id FROM footer_sections WHERE section_key = 'map'")
+        resources_id = await conn.fetchval("SELECT id FROM footer_sections WHERE section_key = 'resources'")
+        policies_id = await conn.fetchval("SELECT id FROM footer_sections WHERE section_key = 'policies'")
+
+        await conn.execute("""
+            INSERT INTO footer_links (section_id, label_en, url, target, display_order, is_active)
+            VALUES
+                ($1, 'Home', '/', '_self', 1, true),
+                ($1, 'Services', '/services', '_self', 2, true),
+                ($1, 'Packages', '/pricing', '_self', 3, true),
+                ($1, 'Our Client', '/clients', '_self', 4, true),
+                ($1, 'Publisher', '/publisher', '_self', 5, true),
+                ($1, 'About', '/about', '_self', 6, true),
+                ($1, 'Contact', '/contact', '_self', 7, true),
+                ($2, 'Blog', '/blog', '_self', 1, true),
+                ($2, 'Template', '/template', '_self', 2, true),
+                ($2, 'Concept', '/concept', '_self', 3, true),
+                ($3, 'Editorial Policy', '#', '_self', 1, true),
+                ($3, 'Privacy Policy', '#', '_self', 2, true),
+                ($3, 'Terms of Service', '#', '_self', 3, true),
+                ($3, 'Credit Card Policy', '#', '_self', 4, true),
+                ($3, 'Cookies Settings', '#', '_self', 5, true)
+        """, map_id, resources_id, policies_id)
+        logger.info("✅ Footer links seeded")
+
+    # === Seed Footer Text Settings ===
+    footer_text_count = await conn.fetchval("SELECT COUNT(*) FROM footer_text_settings")
+    if footer_text_count == 0:
+        logger.info("📝 Seeding footer text settings...")
+        await conn.execute("""
+            INSERT INTO footer_text_settings (setting_key, value_en)
+            VALUES
+                ('tagline', 'Your PR Partner for Web3 & AI'),
+                ('description', 'VortixPR helps blockchain and AI companies amplify their message through strategic media distribution and PR services.'),
+                ('copyright', '© 2025 VortixPR. All rights reserved.'),
+                ('newsletter_title', 'Stay Updated'),
+                ('newsletter_description', 'Get the latest news and insights from the world of Web3 and AI.')
+        """)
+        logger.info("✅ Footer text settings seeded")
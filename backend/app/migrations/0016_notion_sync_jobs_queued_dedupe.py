@@ -0,0 +1,32 @@
+"""
+Notion 同步 job 只與尚未執行的 job 去重
+
+原本 running 的 job 也參與去重：頁面同步期間的編輯會被併入已讀過舊內容的 job 而遺失。
+改為每個頁面最多一個 queued job；執行中的頁面再收到 webhook 時排入新 job
+（同一頁面同時只會執行一個 job，見 NotionSyncQueue._claim）。
+"""
+
+
+async def upgrade(conn):
+    await conn.execute("""
+        DROP INDEX IF EXISTS uq_notion_sync_jobs_version;
+        DROP INDEX IF EXISTS uq_notion_sync_jobs_active;
+
+        -- 同一頁面若有多個 queued job，只保留最新的一個（較新的 job 會同步最新內容）
+        UPDATE notion_sync_jobs j
+        SET status = 'failed',
+            last_error = 'Superseded by a newer queued job',
+            finished_at = NOW(),
+            updated_at = NOW()
+        WHERE j.status = 'queued'
+          AND EXISTS (
+            SELECT 1 FROM notion_sync_jobs n
+            WHERE n.notion_page_id = j.notion_page_id
+              AND n.status = 'queued'
+              AND n.id > j.id
+          );
+
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_notion_sync_jobs_queued
+        ON notion_sync_jobs (notion_page_id)
+        WHERE status = 'queued';
+    """)
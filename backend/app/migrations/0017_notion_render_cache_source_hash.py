@@ -0,0 +1,11 @@
+"""
+notion_render_cache.source_hash：上次同步時的頁面內容 hash
+
+Notion 的 last_edited_time 只到分鐘，無法判斷同一分鐘內的編輯；改以內容 hash 判斷頁面是否變更。
+"""
+
+
+async def upgrade(conn):
+    await conn.execute("""
+        ALTER TABLE notion_render_cache ADD COLUMN IF NOT EXISTS source_hash VARCHAR(64);
+    """)
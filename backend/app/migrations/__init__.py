@@ -0,0 +1,6 @@
+"""
+Schema migrations（由 app/core/migrations.py 依編號順序執行）
+
+每個檔案 NNNN_name.py 提供 async upgrade(conn)，在 transaction 內執行；
+已發佈的 migration 不要修改，schema 變更請新增下一個編號的檔案。
+"""
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict
 from datetime import datetime
 import json as _json
 
@@ -68,22 +68,35 @@ class BlogPost(BlogPostBase):
     sync_source: Optional[str] = None
     notion_last_edited_time: Optional[datetime] = None
     
+    # image_url 的 responsive 縮圖：format → srcset 字串（尚未產生時為空）
+    image_srcset: Dict[str, str] = Field(default_factory=dict)
+    
     class Config:
         from_attributes = True
 
 
+class BlogPostListItem(BlogPost):
+    """Blog Post 列表項目（全文搜尋時附帶相關度與 highlight 片段）"""
+    search_rank: Optional[float] = None
+    search_headline: Optional[str] = None
+
+
 class BlogPostList(BaseModel):
     """Blog Post 列表回應"""
-    posts: list[BlogPost]
-    total: int
-    page: int
+    posts: list[BlogPostListItem]
+    total: Optional[int] = None  # total_mode=none 時為 None
+    page: Optional[int] = None  # cursor 模式時為 None
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None  # cursor 模式時為 None
+    next_cursor: Optional[str] = None  # cursor 模式：下一頁的 cursor（沒有下一頁時為 None）
+    total_estimated: bool = False
 
 
 class NotionBlogSync(BaseModel):
     """從 Notion 同步的資料（N8N 只需傳送 page_id）"""
     notion_page_id: str = Field(..., min_length=1, max_length=100)
+    # 可選：Notion 頁面的 last_edited_time，用來去重（同一版本只同步一次）
+    last_edited_time: Optional[datetime] = None
 
 
 class NotionBlogResponse(BlogPost):
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -17,6 +17,7 @@ class MediaFileBase(BaseModel):
     alt_text: Optional[str] = None
     caption: Optional[str] = None
     uploaded_by: Optional[str] = None
+    content_hash: Optional[str] = None
 
 
 class MediaFileCreate(BaseModel):
@@ -39,11 +40,22 @@ class MediaFileUpdate(BaseModel):
     caption: Optional[str] = None
 
 
+class MediaVariant(BaseModel):
+    """衍生圖片（responsive 縮圖）"""
+    width: int
+    height: int
+    format: str
+    file_url: str
+    file_size: int
+
+
 class MediaFile(MediaFileBase):
     """媒體檔案完整資訊"""
     id: int
     created_at: datetime
     updated_at: datetime
+    variants: List[MediaVariant] = Field(default_factory=list)
+    srcset: Dict[str, str] = Field(default_factory=dict)  # format → srcset 字串
     
     class Config:
         from_attributes = True
@@ -21,3 +21,41 @@ class NewsletterSubscriber(BaseModel):
     class Config:
         from_attributes = True
 
+
+
+class NewsletterCampaignCreate(BaseModel):
+    """建立 Newsletter 群發"""
+    subject: str = Field(..., min_length=1, max_length=255)
+    content_html: str = Field(..., min_length=1)
+    segment_source: Optional[str] = Field(None, max_length=50)  # 只寄給此來源的訂閱者（None = 全部）
+
+
+class NewsletterCampaign(BaseModel):
+    """Newsletter 群發模型"""
+    id: int
+    subject: str
+    content_html: str
+    segment_source: Optional[str] = None
+    status: str
+    total_recipients: int
+    sent_count: int
+    failed_count: int
+    last_error: Optional[str] = None
+    is_running: bool = False
+    created_at: datetime
+    updated_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class NewsletterCampaignRecipient(BaseModel):
+    """Newsletter 群發收件人結果"""
+    subscriber_id: int
+    email: str
+    status: str
+    provider_message_id: Optional[str] = None
+    error: Optional[str] = None
+    processed_at: datetime
@@ -0,0 +1,77 @@
+"""
+Blog 全文搜尋（Postgres tsvector + GIN）
+
+索引存在 blog_search_index（post_id → document），由 blog_posts 的 trigger 維護。
+本模組負責：
+1. ✅ 既有文章的補建（backfill），分批執行，不長時間鎖表
+2. ✅ 全部重建（調整權重或語言設定後使用）
+"""
+import logging
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# 必須與 blog_search_document() 使用的設定一致
+SEARCH_CONFIG = "english"
+
+
+async def backfill_search_index(
+    conn: asyncpg.Connection,
+    batch_size: int = 200,
+    rebuild: bool = False
+) -> int:
+    """
+    補建（或重建）文章搜尋索引，回傳處理的文章數
+
+    Args:
+        conn: 資料庫連線
+        batch_size: 每批處理的文章數（每批一個短 transaction）
+        rebuild: True = 重建所有文章；False = 只補建缺少索引的文章
+    """
+    processed = 0
+    last_id = 0
+
+    while True:
+        if rebuild:
+            rows = await conn.fetch(
+                """
+                INSERT INTO blog_search_index (post_id, document, updated_at)
+                SELECT id, blog_search_document(title, excerpt, content, tags), NOW()
+                FROM blog_posts
+                WHERE id > $1
+                ORDER BY id
+                LIMIT $2
+                ON CONFLICT (post_id) DO UPDATE
+                SET document = EXCLUDED.document, updated_at = NOW()
+                RETURNING post_id
+                """,
+                last_id, batch_size
+            )
+        else:
+            rows = await conn.fetch(
+                """
+                INSERT INTO blog_search_index (post_id, document, updated_at)
+                SELECT p.id, blog_search_document(p.title, p.excerpt, p.content, p.tags), NOW()
+                FROM blog_posts p
+                WHERE p.id > $1
+                  AND NOT EXISTS (SELECT 1 FROM blog_search_index s WHERE s.post_id = p.id)
+                ORDER BY p.id
+                LIMIT $2
+                ON CONFLICT (post_id) DO NOTHING
+                RETURNING post_id
+                """,
+                last_id, batch_size
+            )
+
+        if not rows:
+            break
+
+        processed += len(rows)
+        last_id = max(row['post_id'] for row in rows)
+        logger.info(f"🔎 Blog search index: {processed} posts indexed (last id {last_id})")
+
+    if processed:
+        logger.info(f"✅ Blog search index {'rebuilt' if rebuild else 'backfilled'}: {processed} posts")
+
+    return processed
@@ -0,0 +1,260 @@
+"""
+Email Outbox（交易式寄信 + 背景 worker pool）
+
+API 不再直接呼叫郵件服務（Resend SDK 是同步呼叫，慢的時候會拖住整個 request 甚至 event loop）：
+1. ✅ 郵件先渲染好寫入 email_outbox，與業務資料在同一個 transaction（資料寫入成功才會寄信）
+2. ✅ 背景 worker 以 FOR UPDATE SKIP LOCKED 領取，多個 process 不會重複寄送
+3. ✅ 失敗以指數退避重試；驗證錯誤等不可重試的錯誤直接標記 failed
+4. ✅ 同時呼叫郵件服務的數量有上限（EMAIL_PROVIDER_CONCURRENCY）
+5. ✅ 記錄寄送狀態與 provider 回傳的 message id；以 outbox id 當 idempotency key，重試不會重複寄出
+"""
+import asyncio
+import logging
+import os
+import socket
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+import asyncpg
+
+from ..config import settings
+from ..core.database import db, ALL_TABLES
+
+logger = logging.getLogger(__name__)
+
+# 寄送函數：outbox row → provider message id（失敗時 raise）
+DeliveryHandler = Callable[[asyncpg.Record], Awaitable[Optional[str]]]
+
+OUTBOX_TABLE = "email_outbox"
+
+OUTBOX_COLUMNS = """
+    id, kind, to_emails, subject, html, from_email, status, attempts, max_attempts,
+    run_after, provider_message_id, last_error, created_at, updated_at, sent_at
+"""
+
+
+class PermanentEmailError(Exception):
+    """不可重試的寄送錯誤（例如收件人格式錯誤）"""
+    pass
+
+
+class EmailOutbox:
+    """Email outbox 與寄送 worker pool"""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        provider_concurrency: int = 4,
+        max_attempts: int = 6,
+        poll_interval: float = 5.0,
+        stale_after_seconds: int = 300
+    ):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.stale_after_seconds = stale_after_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._provider_semaphore = asyncio.Semaphore(provider_concurrency)
+        self._handler: Optional[DeliveryHandler] = None
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+        # 統計
+        self.sent_count = 0
+        self.retry_count = 0
+        self.failed_count = 0
+
+    def set_handler(self, handler: DeliveryHandler):
+        """設定寄送函數（main.py 啟動時設定）"""
+        self._handler = handler
+
+    # ==================== Producer ====================
+
+    async def enqueue(
+        self,
+        to: Union[str, Sequence[str]],
+        subject: str,
+        html: str,
+        kind: str,
+        from_email: Optional[str] = None,
+        conn: Optional[asyncpg.Connection] = None
+    ) -> int:
+        """
+        寫入一封待寄郵件，回傳 outbox id
+
+        Args:
+            conn: 傳入呼叫端的連線（在其 transaction 內寫入）；未傳入時自行取得連線
+        """
+        to_emails = [to] if isinstance(to, str) else list(to)
+
+        if conn is None:
+            async with db.pool.acquire() as own_conn:
+                return await self.enqueue(to_emails, subject, html, kind, from_email, own_conn)
+
+        outbox_id = await conn.fetchval(
+            """
+            INSERT INTO email_outbox (kind, to_emails, subject, html, from_email, max_attempts)
+            VALUES ($1, $2, $3, $4, $5, $6)
+            RETURNING id
+            """,
+            kind, to_emails, subject, html, from_email or settings.FROM_EMAIL, self.max_attempts
+        )
+
+        # 在 transaction 中時，NOTIFY 會在 COMMIT 後才送達各 worker 的 listener（見 wake_on_change）
+        await db.notify_content_change(OUTBOX_TABLE, conn=conn)
+        return outbox_id
+
+    async def list_emails(self, status: Optional[str] = None, limit: int = 50) -> List[dict]:
+        """最近的郵件（不含內文，Admin 檢視用）"""
+        async with db.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT id, kind, to_emails, subject, status, attempts, max_attempts, run_after,
+                       provider_message_id, last_error, created_at, updated_at, sent_at
+                FROM email_outbox
+                WHERE ($1::text IS NULL OR status = $1)
+                ORDER BY id DESC
+                LIMIT $2
+                """,
+                status, limit
+            )
+        return [dict(row) for row in rows]
+
+    # ==================== Workers ====================
+
+    def wake_on_change(self, *tables: str):
+        """內容變更 handler：有新郵件寫入（已 commit）時立即喚醒 worker，不必等下一次輪詢"""
+        if OUTBOX_TABLE in tables or ALL_TABLES in tables:
+            self._wakeup.set()
+
+    def start(self):
+        """啟動 worker pool"""
+        if self._tasks:
+            return
+        if self._handler is None:
+            raise RuntimeError("EmailOutbox handler is not set")
+
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(n), name=f"email-outbox-worker-{n}")
+            for n in range(self.workers)
+        ]
+        logger.info(f"📮 Email outbox started ({self.workers} workers)")
+
+    async def stop(self):
+        """停止 worker pool（寄送中的郵件之後由 stale 機制重新領取；idempotency key 避免重複寄出）"""
+        self._stopping = True
+        self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker_loop(self, n: int):
+        """持續領取並寄送"""
+        while not self._stopping:
+            try:
+                email = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Email outbox worker {n} failed to claim: {e}")
+                email = None
+
+            if email is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._deliver(email)
+
+    async def _claim(self) -> Optional[asyncpg.Record]:
+        """領取一封可寄送的郵件"""
+        async with db.pool.acquire() as conn:
+            return await conn.fetchrow(
+                f"""
+                UPDATE email_outbox
+                SET status = 'sending', attempts = attempts + 1,
+                    locked_at = NOW(), locked_by = $1, updated_at = NOW()
+                WHERE id = (
+                    SELECT id FROM email_outbox
+                    WHERE (status = 'queued' AND run_after <= NOW())
+                       OR (status = 'sending' AND locked_at < NOW() - make_interval(secs => $2))
+                    ORDER BY run_after, id
+                    FOR UPDATE SKIP LOCKED
+                    LIMIT 1
+                )
+                RETURNING {OUTBOX_COLUMNS}
+                """,
+                self.worker_id, float(self.stale_after_seconds)
+            )
+
+    async def _deliver(self, email: asyncpg.Record):
+        """寄送並記錄結果"""
+        try:
+            async with self._provider_semaphore:
+                message_id = await self._handler(email)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._fail(email, e)
+            return
+
+        async with db.pool.acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE email_outbox
+                SET status = 'sent', provider_message_id = $2, last_error = NULL,
+                    locked_at = NULL, locked_by = NULL, sent_at = NOW(), updated_at = NOW()
+                WHERE id = $1
+                """,
+                email['id'], message_id
+            )
+        self.sent_count += 1
+        logger.info(f"✅ Email sent: {email['subject']} -> {email['to_emails']} ({message_id})")
+
+    async def _fail(self, email: asyncpg.Record, error: Exception):
+        """失敗：可重試且還有次數則退避後重試，否則標記 failed"""
+        detail = str(error) or type(error).__name__
+        final = isinstance(error, PermanentEmailError) or email['attempts'] >= email['max_attempts']
+        delay = min(3600, 30 * (2 ** (email['attempts'] - 1)))
+
+        async with db.pool.acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE email_outbox
+                SET status = $2, last_error = $3,
+                    run_after = NOW() + make_interval(secs => $4),
+                    locked_at = NULL, locked_by = NULL, updated_at = NOW()
+                WHERE id = $1
+                """,
+                email['id'], 'failed' if final else 'queued', detail[:2000], float(delay)
+            )
+
+        if final:
+            self.failed_count += 1
+            logger.error(f"❌ Email {email['id']} failed permanently: {detail}")
+        else:
+            self.retry_count += 1
+            logger.warning(f"⚠️ Email {email['id']} failed, retrying in {delay}s: {detail}")
+
+    def stats(self) -> Dict[str, int]:
+        """統計資料（本 process）"""
+        return {
+            "workers": len(self._tasks),
+            "sent": self.sent_count,
+            "retries": self.retry_count,
+            "failed": self.failed_count,
+        }
+
+
+# 全域實例
+email_outbox = EmailOutbox(
+    workers=settings.EMAIL_OUTBOX_WORKERS,
+    provider_concurrency=settings.EMAIL_PROVIDER_CONCURRENCY,
+    max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    poll_interval=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+)
@@ -1,35 +1,57 @@
 """
 Email Service - Using Resend with Jinja2 Templates
+
+send_* methods render the template and queue the message in email_outbox
+(optionally inside the caller's transaction); background workers deliver it
+through deliver() - see services/email_outbox.py.
 """
+import asyncio
+import html as html_lib
 import resend
+import asyncpg
 import logging
-from typing import Optional
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-from pathlib import Path
+from typing import List, Optional, Tuple
+from urllib.parse import quote
 
 from ..config import settings
+from ..core.outbound_metrics import outbound_timer
+from ..utils.security import create_unsubscribe_token
+from .email_outbox import email_outbox, PermanentEmailError
+from .email_templates import email_templates, EmailTemplateRenderer
 
 
 logger = logging.getLogger(__name__)
 
+# Campaign emails are rendered once with these placeholders, then personalized per recipient
+RECIPIENT_EMAIL_TOKEN = "%%RECIPIENT_EMAIL%%"
+UNSUBSCRIBE_URL_TOKEN = "%%UNSUBSCRIBE_URL%%"
+
+# Resend batch API limit
+MAX_BATCH_SIZE = 100
+
+# Whole-request errors that will not succeed on retry
+PERMANENT_RESEND_ERRORS = (
+    resend.exceptions.ValidationError,
+    resend.exceptions.MissingRequiredFieldsError,
+    resend.exceptions.MissingApiKeyError,
+    resend.exceptions.InvalidApiKeyError,
+)
+
 
 class EmailService:
     """Email sending service with template rendering"""
     
     def __init__(self):
-        """Initialize Resend API and Jinja2 environment"""
+        """Initialize Resend API and the template renderer"""
         if settings.RESEND_API_KEY:
             resend.api_key = settings.RESEND_API_KEY
             logger.info("📧 Resend Email Service initialized")
         else:
             logger.warning("⚠️ RESEND_API_KEY not set - email sending disabled")
         
-        # Initialize Jinja2
-        template_dir = Path(__file__).parent.parent / 'templates' / 'emails'
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(str(template_dir)),
-            autoescape=select_autoescape(['html', 'xml'])
-        )
+        # Compiled / memoized Jinja2 rendering (see services/email_templates.py)
+        self.templates: EmailTemplateRenderer = email_templates
+        self.jinja_env = email_templates.env
     
     def _render_template(self, template_name: str, **context) -> str:
         """
@@ -42,51 +64,69 @@ class EmailService:
         Returns:
             Rendered HTML string
         """
-        template = self.jinja_env.get_template(template_name)
-        return template.render(**context)
+        return self.templates.render(template_name, **context)
     
     async def _send_email(
         self,
         to: str | list[str],
         subject: str,
         html: str,
-        from_email: Optional[str] = None
+        from_email: Optional[str] = None,
+        kind: str = "transactional",
+        conn: Optional[asyncpg.Connection] = None
     ) -> bool:
         """
-        Internal method to send email via Resend
+        Queue an email in the outbox (delivered by background workers)
         
         Args:
             to: Recipient email(s)
             subject: Email subject
             html: HTML content
             from_email: Sender email (defaults to settings.FROM_EMAIL)
+            kind: Email type recorded in the outbox (e.g. 'contact_notification')
+            conn: Caller's connection - pass it to queue inside the caller's transaction
             
         Returns:
-            bool: Whether the email was sent successfully
+            bool: Whether the email was queued
         """
         if not settings.RESEND_API_KEY:
             logger.warning("Email sending skipped - RESEND_API_KEY not configured")
             return False
         
-        try:
-            # Ensure 'to' is a list
-            if isinstance(to, str):
-                to = [to]
-            
-            params = {
-                "from": from_email or settings.FROM_EMAIL,
-                "to": to,
-                "subject": subject,
-                "html": html,
-            }
-            
-            response = resend.Emails.send(params)
-            logger.info(f"✅ Email sent successfully: {subject} -> {to}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to send email: {e}")
+        if not to:
+            logger.warning(f"Email sending skipped - no recipient: {subject}")
             return False
+        
+        outbox_id = await email_outbox.enqueue(to, subject, html, kind, from_email=from_email, conn=conn)
+        logger.info(f"📮 Email queued #{outbox_id}: {subject} -> {to}")
+        return True
+    
+    async def deliver(self, email: asyncpg.Record) -> Optional[str]:
+        """
+        Deliver an outbox email via Resend (called by the outbox workers)
+        
+        The Resend SDK is synchronous, so the call runs in a worker thread.
+        The outbox id is used as the idempotency key, so a retry after a
+        timeout does not send the email twice.
+        
+        Returns:
+            Resend message id
+        """
+        params = {
+            "from": email['from_email'] or settings.FROM_EMAIL,
+            "to": list(email['to_emails']),
+            "subject": email['subject'],
+            "html": email['html'],
+        }
+        options = {"idempotency_key": f"email-outbox-{email['id']}"}
+        
+        try:
+            with outbound_timer("resend", "emails.send"):
+                response = await asyncio.to_thread(resend.Emails.send, params, options)
+        except PERMANENT_RESEND_ERRORS as e:
+            raise PermanentEmailError(str(e)) from e
+        
+        return response.get("id") if isinstance(response, dict) else None
     
     # ==================== Contact Form ====================
     
@@ -96,7 +136,8 @@ class EmailService:
         email: str,
         company: Optional[str],
         phone: Optional[str],
-        message: str
+        message: str,
+        conn: Optional[asyncpg.Connection] = None
     ) -> bool:
         """
         Send contact form notification to admin
@@ -107,9 +148,10 @@ class EmailService:
             company: Company name (optional)
             phone: Phone number (optional)
             message: Message content
+            conn: Caller's connection (queue inside the caller's transaction)
             
         Returns:
-            bool: Whether the email was sent successfully
+            bool: Whether the email was queued
         """
         html = self._render_template(
             'contact/notification.html',
@@ -124,34 +166,140 @@ class EmailService:
         return await self._send_email(
             to=settings.ADMIN_EMAIL,
             subject=f"🔔 New Contact Form: {name}",
-            html=html
+            html=html,
+            kind="contact_notification",
+            conn=conn
         )
     
     # ==================== Newsletter ====================
     
-    async def send_newsletter_welcome(self, email: str) -> bool:
+    async def send_newsletter_welcome(self, email: str, conn: Optional[asyncpg.Connection] = None) -> bool:
         """
         Send Newsletter welcome email
         
         Args:
             email: Subscriber email
+            conn: Caller's connection (queue inside the caller's transaction)
             
         Returns:
-            bool: Whether the email was sent successfully
+            bool: Whether the email was queued
         """
         html = self._render_template(
             'newsletter/welcome.html',
             email=email,
             blog_url="https://vortixpr.com/blog",
-            unsubscribe_url=f"{settings.FRONTEND_URL}/newsletter/unsubscribe"
+            unsubscribe_url=self.newsletter_unsubscribe_url(email)
         )
         
         return await self._send_email(
             to=email,
             subject="🎉 Welcome to VortixPR Newsletter!",
-            html=html
+            html=html,
+            kind="newsletter_welcome",
+            conn=conn
         )
     
+    # ==================== Newsletter Campaign ====================
+    
+    def render_campaign(self, subject: str, content_html: str) -> str:
+        """
+        Render a newsletter campaign once for all recipients
+        
+        Recipient-specific values are left as placeholders;
+        use personalize_campaign() to fill them in per recipient.
+        
+        Args:
+            subject: Campaign subject
+            content_html: Campaign body (trusted admin HTML)
+            
+        Returns:
+            Rendered HTML string with recipient placeholders
+        """
+        return self._render_template(
+            'newsletter/campaign.html',
+            subject=subject,
+            content_html=content_html,
+            email=RECIPIENT_EMAIL_TOKEN,
+            unsubscribe_url=UNSUBSCRIBE_URL_TOKEN
+        )
+    
+    @staticmethod
+    def newsletter_unsubscribe_url(email: str) -> str:
+        """
+        Signed unsubscribe link for a subscriber
+        
+        Points at the backend endpoint that serves both the confirmation
+        page (GET) and RFC 8058 one-click unsubscribe (POST).
+        """
+        return (
+            f"{settings.BACKEND_URL.rstrip('/')}/api/write/newsletter/unsubscribe/one-click"
+            f"?email={quote(email, safe='')}&token={create_unsubscribe_token(email)}"
+        )
+    
+    def personalize_campaign(self, rendered_html: str, email: str) -> str:
+        """
+        Fill the recipient placeholders of a rendered campaign
+        
+        Args:
+            rendered_html: Output of render_campaign()
+            email: Recipient email
+            
+        Returns:
+            HTML for this recipient
+        """
+        return (
+            rendered_html
+            .replace(RECIPIENT_EMAIL_TOKEN, html_lib.escape(email))
+            .replace(UNSUBSCRIBE_URL_TOKEN, html_lib.escape(self.newsletter_unsubscribe_url(email)))
+        )
+    
+    async def send_batch(
+        self,
+        messages: List[dict],
+        idempotency_key: Optional[str] = None
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Send up to 100 emails in one Resend batch request
+        
+        Uses permissive validation, so one invalid address does not reject
+        the whole batch.
+        
+        Args:
+            messages: Resend send params ({"to", "subject", "html", ...}); "from" defaults to FROM_EMAIL
+            idempotency_key: Key for safe retries of the same batch
+            
+        Returns:
+            One (message_id, error) pair per message, in order
+            
+        Raises:
+            PermanentEmailError: The whole batch was rejected (bad API key, invalid request)
+        """
+        if len(messages) > MAX_BATCH_SIZE:
+            raise ValueError(f"Batch size {len(messages)} exceeds {MAX_BATCH_SIZE}")
+        
+        params = [{"from": settings.FROM_EMAIL, **message} for message in messages]
+        options = {"batch_validation": "permissive"}
+        if idempotency_key:
+            options["idempotency_key"] = idempotency_key
+        
+        try:
+            with outbound_timer("resend", "batch.send"):
+                response = await asyncio.to_thread(resend.Batch.send, params, options)
+        except PERMANENT_RESEND_ERRORS as e:
+            raise PermanentEmailError(str(e)) from e
+        
+        # data lists the accepted emails in order; errors refer to rejected ones by index
+        errors = {error["index"]: error["message"] for error in response.get("errors") or []}
+        sent = iter(response.get("data") or [])
+        results = []
+        for index in range(len(messages)):
+            if index in errors:
+                results.append((None, errors[index]))
+            else:
+                accepted = next(sent, None)
+                results.append((accepted["id"] if accepted else None, None))
+        return results
+    
     # ==================== PR Template ====================
     
     async def send_template_email(
@@ -159,7 +307,8 @@ class EmailService:
         to_email: str,
         template_title: str,
         template_content: str,
-        tracking_id: str
+        tracking_id: str,
+        conn: Optional[asyncpg.Connection] = None
     ) -> bool:
         """
         Send PR Template to user's email
@@ -169,9 +318,10 @@ class EmailService:
             template_title: Template title
             template_content: Template content
             tracking_id: Tracking ID
+            conn: Caller's connection (queue inside the caller's transaction)
             
         Returns:
-            bool: Whether the email was sent successfully
+            bool: Whether the email was queued
         """
         html = self._render_template(
             'template/send.html',
@@ -187,7 +337,9 @@ class EmailService:
         return await self._send_email(
             to=to_email,
             subject=f"📝 Your PR Template: {template_title}",
-            html=html
+            html=html,
+            kind="template_email",
+            conn=conn
         )
     
     # ==================== User Invitation ====================
@@ -197,7 +349,8 @@ class EmailService:
         to_email: str,
         inviter_name: str,
         invitation_url: str,
-        role: str
+        role: str,
+        conn: Optional[asyncpg.Connection] = None
     ) -> bool:
         """
         Send user invitation email
@@ -207,9 +360,10 @@ class EmailService:
             inviter_name: Name of the person sending the invitation
             invitation_url: Invitation URL with token
             role: Role being invited to
+            conn: Caller's connection (queue inside the caller's transaction)
             
         Returns:
-            bool: Whether the email was sent successfully
+            bool: Whether the email was queued
         """
         role_labels = {
             'user': 'User',
@@ -230,7 +384,9 @@ class EmailService:
         return await self._send_email(
             to=to_email,
             subject=f"You've Been Invited to VortixPR ({role_label})",
-            html=html
+            html=html,
+            kind="invitation",
+            conn=conn
         )
     
     # ==================== Preview (For Admin) ====================
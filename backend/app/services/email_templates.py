@@ -0,0 +1,172 @@
+"""
+Email 模板渲染（編譯快取 + 渲染結果 memo）
+
+原本每次寄信 / 預覽都經過 get_template → 檢查檔案 mtime → 渲染整個 layouts/base.html 繼承鏈：
+1. ✅ FileSystemBytecodeCache：編譯結果存到磁碟，process 重啟 / 多 worker 冷啟動不必重新編譯
+2. ✅ 啟動時預先編譯所有模板，之後直接使用同一個 Template 物件（不再檢查 mtime）
+3. ✅ 渲染結果依「模板實際引用的變數」memo：layout / header / footer 與固定內容的郵件
+   （歡迎信、Admin 預覽）只渲染一次；含收件人資料的郵件 key 不同，不會誤用
+4. ✅ 群發只渲染一次（見 EmailService.render_campaign），重複使用同一個編譯後的模板
+
+EMAIL_TEMPLATE_AUTO_RELOAD=true（開發用）時每次檢查檔案是否修改，並停用 memo。
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, FrozenSet, Hashable, Optional, Tuple
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, meta, select_autoescape
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).parent.parent / 'templates' / 'emails'
+
+# 可 memo 的 context 值：不可變的基本型別，且總長度有限（避免大內容佔用記憶體）
+MEMO_VALUE_TYPES = (str, int, float, bool, type(None))
+MEMO_MAX_CONTEXT_CHARS = 4096
+
+
+class EmailTemplateRenderer:
+    """Email 模板的編譯 / 渲染"""
+
+    def __init__(
+        self,
+        template_dir: Path = TEMPLATE_DIR,
+        cache_dir: Optional[str] = None,
+        auto_reload: bool = False,
+        memo_size: int = 128
+    ):
+        self.auto_reload = auto_reload
+        self.memo_size = memo_size
+        self.env = Environment(
+            loader=FileSystemLoader(str(template_dir)),
+            autoescape=select_autoescape(['html', 'xml']),
+            auto_reload=auto_reload,
+            bytecode_cache=self._bytecode_cache(cache_dir),
+        )
+
+        self._templates: Dict[str, Template] = {}
+        self._variables: Dict[str, FrozenSet[str]] = {}
+        self._rendered: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 統計
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+    @staticmethod
+    def _bytecode_cache(cache_dir: Optional[str]) -> Optional[FileSystemBytecodeCache]:
+        """
+        建立 bytecode cache（無法使用時停用，仍可正常渲染）
+
+        未指定目錄時交給 Jinja 建立每個使用者專屬、權限 0700 的暫存目錄，
+        不使用可預測的共用 /tmp 路徑（其他使用者可預先建立並植入 bytecode）
+        """
+        try:
+            if not cache_dir:
+                return FileSystemBytecodeCache()
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            return FileSystemBytecodeCache(cache_dir)
+        except (OSError, RuntimeError) as e:
+            logger.warning(f"⚠️ Email template bytecode cache disabled ({cache_dir or 'default'}): {e}")
+            return None
+
+    # ==================== 編譯 ====================
+
+    def precompile(self) -> int:
+        """編譯所有模板（啟動時呼叫），回傳模板數"""
+        names = self.env.list_templates(extensions=['html'])
+        for name in names:
+            self.get_template(name)
+        logger.info(f"📧 {len(names)} email templates compiled")
+        return len(names)
+
+    def get_template(self, name: str) -> Template:
+        """取得編譯後的模板（auto_reload 時交給 Jinja 檢查檔案是否修改）"""
+        if self.auto_reload:
+            return self.env.get_template(name)
+
+        template = self._templates.get(name)
+        if template is None:
+            template = self.env.get_template(name)
+            self._templates[name] = template
+            self._variables[name] = self._referenced_variables(name)
+        return template
+
+    def _referenced_variables(self, name: str) -> FrozenSet[str]:
+        """模板（含 extends / include 的模板）引用的所有 context 變數"""
+        variables = set()
+        pending, seen = [name], set()
+        while pending:
+            current = pending.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            source, _, _ = self.env.loader.get_source(self.env, current)
+            ast = self.env.parse(source)
+            variables |= meta.find_undeclared_variables(ast)
+            pending.extend(ref for ref in meta.find_referenced_templates(ast) if ref)
+        return frozenset(variables)
+
+    # ==================== 渲染 ====================
+
+    def render(self, template_name: str, /, **context) -> str:
+        """渲染模板；模板引用的變數值與先前相同時直接回傳先前的結果"""
+        template = self.get_template(template_name)
+        key = self._memo_key(template_name, context)
+        if key is None:
+            return template.render(**context)
+
+        with self._lock:
+            html = self._rendered.get(key)
+            if html is not None:
+                self._rendered.move_to_end(key)
+                self.memo_hits += 1
+                return html
+
+        html = template.render(**context)
+
+        with self._lock:
+            self.memo_misses += 1
+            self._rendered[key] = html
+            while len(self._rendered) > self.memo_size:
+                self._rendered.popitem(last=False)
+        return html
+
+    def _memo_key(self, name: str, context: dict) -> Optional[Tuple]:
+        """只用模板實際引用的變數組成 key；值不適合 memo 時回傳 None"""
+        if self.auto_reload or self.memo_size <= 0:
+            return None
+
+        items = []
+        total = 0
+        for variable in sorted(self._variables.get(name, ())):
+            value = context.get(variable)
+            if not isinstance(value, MEMO_VALUE_TYPES):
+                return None
+            if isinstance(value, str):
+                total += len(value)
+                if total > MEMO_MAX_CONTEXT_CHARS:
+                    return None
+            items.append((variable, value))
+        return (name, tuple(items))
+
+    def stats(self) -> Dict[str, int]:
+        """統計資料（本 process）"""
+        return {
+            "templates": len(self._templates),
+            "memo_entries": len(self._rendered),
+            "memo_hits": self.memo_hits,
+            "memo_misses": self.memo_misses,
+        }
+
+
+# 全域實例
+email_templates = EmailTemplateRenderer(
+    cache_dir=settings.EMAIL_TEMPLATE_CACHE_DIR or None,
+    auto_reload=settings.EMAIL_TEMPLATE_AUTO_RELOAD,
+)
@@ -0,0 +1,283 @@
+"""
+Responsive 圖片（縮圖 / WebP 等衍生版本）
+
+上傳到媒體庫的圖片、Notion 同步的封面圖原本都只有原圖，列表頁與媒體庫會下載好幾 MB 的檔案：
+1. ✅ 依 IMAGE_VARIANT_WIDTHS × IMAGE_VARIANT_FORMATS 產生縮小版本（不放大）
+2. ✅ Pillow 運算在 process pool 執行（CPU bound，不佔用 event loop 與 GIL）
+3. ✅ 衍生版本以 content-addressed key 上傳到 R2，記錄在 media_variants
+4. ✅ build_srcset：API 直接回傳可放進 <img srcset> / <picture><source> 的字串
+5. ✅ schedule：媒體庫上傳後在背景從 R2 讀取原圖產生，不佔用上傳請求的記憶體與時間
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from PIL import features
+
+from ..config import settings
+from ..core.database import db
+from ..utils.image_resize import VARIANT_FORMATS, probe_size, render_variants
+from .r2_storage import r2_storage
+
+logger = logging.getLogger(__name__)
+
+# 會產生衍生版本的原圖格式（GIF 動畫、SVG 直接使用原圖）
+RESIZABLE_EXTENSIONS = frozenset({"jpg", "jpeg", "png", "webp"})
+
+# 從 R2 下載原圖前，先讀取開頭這麼多 bytes 判斷尺寸
+PROBE_BYTES = 64 * 1024
+
+VARIANT_COLUMNS = "id, media_file_id, source_url, width, height, format, file_key, file_url, file_size"
+
+
+class ImageVariantService:
+    """衍生圖片產生 / 查詢"""
+
+    def __init__(
+        self,
+        widths: Sequence[int],
+        formats: Sequence[str],
+        quality: int = 80,
+        workers: int = 2,
+        max_source_bytes: int = 25 * 1024 * 1024
+    ):
+        self.widths = sorted(set(widths))
+        self.formats = [fmt for fmt in formats if self._format_supported(fmt)]
+        self.quality = quality
+        self.workers = workers
+        self.max_source_bytes = max_source_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _format_supported(fmt: str) -> bool:
+        """Pillow 是否能輸出此格式（AVIF / WebP 依編譯選項而定）"""
+        if fmt not in VARIANT_FORMATS:
+            logger.warning(f"⚠️ Unknown image variant format ignored: {fmt}")
+            return False
+        if fmt in ("webp", "avif") and not features.check(fmt):
+            logger.warning(f"⚠️ Pillow has no {fmt} support, variant format ignored")
+            return False
+        return True
+
+    @staticmethod
+    def is_resizable(url_or_key: str) -> bool:
+        """依副檔名判斷是否產生衍生版本"""
+        path = url_or_key.split("?", 1)[0]
+        return "." in path and path.rsplit(".", 1)[-1].lower() in RESIZABLE_EXTENSIONS
+
+    # ==================== 產生 ====================
+
+    async def ensure_variants(
+        self,
+        source_url: str,
+        content: Optional[bytes] = None,
+        media_file_id: Optional[int] = None
+    ) -> List[dict]:
+        """
+        確保 source_url 已有衍生版本（已存在時直接回傳，不重新產生）
+
+        Args:
+            source_url: 原圖 URL（必須是本站 R2 上的檔案）
+            content: 原圖內容（未提供時從 R2 下載）
+            media_file_id: 對應的 media_files.id（媒體庫上傳時）
+        """
+        if not self.widths or not self.formats or not self.is_resizable(source_url):
+            return []
+
+        async with db.pool.acquire() as conn:
+            rows = await conn.fetch(
+                f"SELECT {VARIANT_COLUMNS} FROM media_variants WHERE source_url = $1 ORDER BY format, width",
+                source_url
+            )
+            if rows:
+                if media_file_id is not None:
+                    await conn.execute(
+                        "UPDATE media_variants SET media_file_id = $2 WHERE source_url = $1 AND media_file_id IS NULL",
+                        source_url, media_file_id
+                    )
+                return [dict(row) for row in rows]
+
+        if content is None:
+            file_key = r2_storage.key_from_url(source_url)
+            if file_key is None:
+                return []
+            if not await self._worth_downloading(file_key, source_url):
+                return []
+            content = await r2_storage.get_file(file_key)
+
+        if len(content) > self.max_source_bytes:
+            logger.info(f"ℹ️ Image too large for variants ({len(content)} bytes): {source_url}")
+            return []
+
+        loop = asyncio.get_running_loop()
+        try:
+            rendered = await loop.run_in_executor(
+                self._get_executor(),
+                render_variants, content, self.widths, self.formats, self.quality
+            )
+        except BrokenProcessPool:
+            # 子程序異常結束（例如 OOM）後 pool 無法再使用，下次重新建立
+            self._executor = None
+            raise
+        if not rendered:
+            return []
+
+        stem = os.path.splitext(source_url.rsplit("/", 1)[-1].split("?", 1)[0])[0]
+        uploads = await r2_storage.upload_many([
+            {
+                "file_content": data,
+                "filename": f"{stem}-{width}w.{VARIANT_FORMATS[fmt][1]}",
+                "folder": "variants",
+                "content_type": VARIANT_FORMATS[fmt][2],
+            }
+            for width, height, fmt, data in rendered
+        ])
+
+        records = []
+        for (width, height, fmt, data), result in zip(rendered, uploads):
+            if isinstance(result, Exception):
+                logger.warning(f"⚠️ Image variant upload failed ({width}w {fmt}): {result}")
+                continue
+            records.append((media_file_id, source_url, width, height, fmt, result['key'], result['url'], len(data)))
+
+        async with db.pool.acquire() as conn:
+            await conn.executemany(
+                """
+                INSERT INTO media_variants (
+                    media_file_id, source_url, width, height, format, file_key, file_url, file_size
+                )
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                ON CONFLICT (source_url, width, format) DO UPDATE
+                SET height = EXCLUDED.height, file_key = EXCLUDED.file_key,
+                    file_url = EXCLUDED.file_url, file_size = EXCLUDED.file_size,
+                    media_file_id = COALESCE(media_variants.media_file_id, EXCLUDED.media_file_id)
+                """,
+                records
+            )
+            rows = await conn.fetch(
+                f"SELECT {VARIANT_COLUMNS} FROM media_variants WHERE source_url = $1 ORDER BY format, width",
+                source_url
+            )
+
+        logger.info(f"🖼️ {len(records)} image variants generated: {source_url}")
+        return [dict(row) for row in rows]
+
+    async def _worth_downloading(self, file_key: str, source_url: str) -> bool:
+        """
+        下載原圖前先用 HEAD / Range 讀取大小與尺寸
+
+        過大、或比所有寬度都窄（不會產生任何版本）的原圖不下載；
+        沒有衍生版本不會留下記錄，每次同步都會重新判斷，所以判斷必須便宜
+        """
+        head = await r2_storage.run('head_object', Bucket=r2_storage.bucket_name, Key=file_key)
+        size = head.get('ContentLength') or 0
+        if not size or size > self.max_source_bytes:
+            logger.info(f"ℹ️ Image too large for variants ({size} bytes): {source_url}")
+            return False
+
+        header = await r2_storage.get_file_range(file_key, 0, min(size, PROBE_BYTES) - 1)
+        dimensions = await asyncio.to_thread(probe_size, header)
+        # EXIF 可能旋轉 90°，以較長邊判斷；header 讀不到尺寸時照常下載
+        if dimensions and max(dimensions) <= self.widths[0]:
+            logger.info(f"ℹ️ Image narrower than every variant width {dimensions}: {source_url}")
+            return False
+        return True
+
+    def schedule(self, source_url: str, media_file_id: Optional[int] = None):
+        """在背景產生衍生版本（原圖從 R2 下載；同一張圖進行中時不重複排程）"""
+        if not self.widths or not self.formats or not self.is_resizable(source_url):
+            return
+        if source_url in self._pending:
+            return
+
+        task = asyncio.create_task(
+            self.ensure_variants(source_url, media_file_id=media_file_id),
+            name=f"image-variants-{media_file_id or source_url}"
+        )
+        self._pending[source_url] = task
+        task.add_done_callback(lambda t: self._on_done(source_url, t))
+
+    async def join(self):
+        """等待背景產生完成（獨立執行的 script 結束前呼叫）"""
+        while self._pending:
+            await asyncio.gather(*self._pending.values(), return_exceptions=True)
+
+    def _on_done(self, source_url: str, task: asyncio.Task):
+        if self._pending.get(source_url) is task:
+            del self._pending[source_url]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"⚠️ Image variants failed for {source_url}: {task.exception()}")
+
+    # ==================== 查詢 / 刪除 ====================
+
+    async def variants_for_urls(self, conn, urls: Iterable[Optional[str]]) -> Dict[str, List[dict]]:
+        """一次查詢多張原圖的衍生版本：source_url → variants"""
+        urls = list({url for url in urls if url})
+        if not urls:
+            return {}
+
+        rows = await conn.fetch(
+            f"""
+            SELECT {VARIANT_COLUMNS} FROM media_variants
+            WHERE source_url = ANY($1::text[])
+            ORDER BY format, width
+            """,
+            urls
+        )
+        grouped: Dict[str, List[dict]] = {}
+        for row in rows:
+            grouped.setdefault(row['source_url'], []).append(dict(row))
+        return grouped
+
+    async def delete_variants(self, conn, source_url: str) -> int:
+        """刪除原圖的所有衍生版本（R2 物件 + 記錄）"""
+        rows = await conn.fetch(
+            "DELETE FROM media_variants WHERE source_url = $1 RETURNING file_key",
+            source_url
+        )
+        for row in rows:
+            await r2_storage.delete_file(row['file_key'])
+        return len(rows)
+
+    # ==================== Process pool ====================
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """第一次使用時建立（spawn：不 fork 帶有 event loop / thread 的主程序）"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def shutdown(self):
+        """關閉 process pool、取消背景產生（應用程式關閉時呼叫；未完成的圖片之後讀取時回傳原圖）"""
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def build_srcset(variants: Sequence[dict]) -> Dict[str, str]:
+    """衍生版本 → 各格式的 srcset（例如 {"webp": "https://.../a.webp 320w, ..."}）"""
+    srcset: Dict[str, List[str]] = {}
+    for variant in sorted(variants, key=lambda v: v['width']):
+        srcset.setdefault(variant['format'], []).append(f"{variant['file_url']} {variant['width']}w")
+    return {fmt: ", ".join(entries) for fmt, entries in srcset.items()}
+
+
+# 全域實例
+image_variants = ImageVariantService(
+    widths=settings.image_variant_widths,
+    formats=settings.image_variant_formats,
+    quality=settings.IMAGE_VARIANT_QUALITY,
+    workers=settings.IMAGE_VARIANT_WORKERS,
+    max_source_bytes=settings.IMAGE_VARIANT_MAX_SOURCE_BYTES,
+)
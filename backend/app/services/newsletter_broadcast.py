@@ -0,0 +1,401 @@
+"""
+Newsletter 群發（Resend batch API）
+
+逐封呼叫 EmailService 寄給數萬名訂閱者太慢，也無法中斷後續傳：
+1. ✅ 以 server-side cursor 串流讀取 active 訂閱者（不一次載入記憶體）
+2. ✅ Jinja 模板每個 campaign 只渲染一次，收件人相關欄位以字串替換填入
+3. ✅ 每 100 人一個 batch 請求，並行數與每秒請求數有上限（NEWSLETTER_*）
+4. ✅ 每個 batch 完成後寫入 checkpoint：收件人結果 + campaign 進度（同一個 transaction）
+5. ✅ 中斷 / 暫停 / 失敗後重新送出只寄給尚未處理的訂閱者；advisory lock 確保同一 campaign 只有一個 process 在寄
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import asyncpg
+
+from ..config import settings
+from ..core.database import db
+from .email_outbox import PermanentEmailError
+from .email_service import email_service, MAX_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_lock(namespace, campaign_id) 的 namespace
+ADVISORY_LOCK_NAMESPACE = 7301
+
+# (subscriber_id, email)
+Recipient = Tuple[int, str]
+
+
+class _RateLimiter:
+    """固定間隔的請求速率限制（所有 batch worker 共用）"""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def wait(self):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class _CampaignRun:
+    """單次寄送的狀態（chunk 依序編號，用來計算連續完成的 checkpoint）"""
+
+    def __init__(self, campaign: asyncpg.Record, rendered_html: str):
+        self.campaign_id = campaign['id']
+        self.subject = campaign['subject']
+        self.rendered_html = rendered_html
+        self.last_ids: Dict[int, int] = {}  # chunk 序號 → 最後一位訂閱者 id
+        self.done: set = set()
+        self.next_checkpoint = 0
+        self.stop_reason: Optional[str] = None  # 'paused' / 'failed'
+        self.error: Optional[str] = None
+
+    def complete(self, seq: int) -> Optional[int]:
+        """標記 chunk 完成，回傳新的連續完成 watermark（沒有前進時回傳 None）"""
+        self.done.add(seq)
+        watermark = None
+        while self.next_checkpoint in self.done:
+            self.done.discard(self.next_checkpoint)
+            watermark = self.last_ids.pop(self.next_checkpoint)
+            self.next_checkpoint += 1
+        return watermark
+
+
+class NewsletterBroadcaster:
+    """Newsletter campaign 寄送"""
+
+    def __init__(
+        self,
+        batch_size: int = MAX_BATCH_SIZE,
+        concurrency: int = 2,
+        requests_per_second: float = 2.0,
+        max_retries: int = 5
+    ):
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.concurrency = max(1, concurrency)
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    def is_running(self, campaign_id: int) -> bool:
+        task = self._tasks.get(campaign_id)
+        return task is not None and not task.done()
+
+    # ==================== 啟動 / 停止 ====================
+
+    async def start(self, campaign_id: int) -> bool:
+        """
+        將 campaign 標記為 sending 並在背景開始寄送
+
+        Returns:
+            False = 找不到可寄送的 campaign（不存在或已完成）
+        """
+        if self.is_running(campaign_id):
+            return True
+
+        async with db.pool.acquire() as conn:
+            updated = await conn.fetchval(
+                """
+                UPDATE newsletter_campaigns
+                SET status = 'sending', last_error = NULL,
+                    started_at = COALESCE(started_at, NOW()), updated_at = NOW()
+                WHERE id = $1 AND status IN ('draft', 'sending', 'paused', 'failed')
+                RETURNING id
+                """,
+                campaign_id
+            )
+        if updated is None:
+            return False
+
+        self._spawn(campaign_id)
+        return True
+
+    async def pause(self, campaign_id: int) -> bool:
+        """暫停寄送（進行中的 batch 完成後停止；之後可再次 start 續傳）"""
+        async with db.pool.acquire() as conn:
+            updated = await conn.fetchval(
+                """
+                UPDATE newsletter_campaigns
+                SET status = 'paused', updated_at = NOW()
+                WHERE id = $1 AND status = 'sending'
+                RETURNING id
+                """,
+                campaign_id
+            )
+        return updated is not None
+
+    async def resume_interrupted(self):
+        """啟動時接續寄送中斷（process 重啟）的 campaign"""
+        async with db.pool.acquire() as conn:
+            rows = await conn.fetch("SELECT id FROM newsletter_campaigns WHERE status = 'sending'")
+        for row in rows:
+            logger.info(f"📨 Resuming newsletter campaign {row['id']}")
+            self._spawn(row['id'])
+
+    async def stop(self):
+        """應用程式關閉：停止寄送（campaign 維持 sending，下次啟動時續傳）"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def _spawn(self, campaign_id: int):
+        task = asyncio.create_task(self.run(campaign_id), name=f"newsletter-campaign-{campaign_id}")
+        self._tasks[campaign_id] = task
+        task.add_done_callback(lambda t: self._on_done(campaign_id, t))
+
+    def _on_done(self, campaign_id: int, task: asyncio.Task):
+        if self._tasks.get(campaign_id) is task:
+            del self._tasks[campaign_id]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"❌ Newsletter campaign {campaign_id} crashed: {task.exception()}")
+
+    # ==================== 寄送 ====================
+
+    async def run(self, campaign_id: int):
+        """寄送 campaign 給所有尚未處理的 active 訂閱者"""
+        async with db.pool.acquire() as conn:
+            locked = await conn.fetchval(
+                "SELECT pg_try_advisory_lock($1, $2)", ADVISORY_LOCK_NAMESPACE, campaign_id
+            )
+            if not locked:
+                logger.info(f"ℹ️ Newsletter campaign {campaign_id} is being sent by another process")
+                return
+
+            try:
+                await self._run_locked(conn, campaign_id)
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock($1, $2)", ADVISORY_LOCK_NAMESPACE, campaign_id)
+
+    async def _run_locked(self, conn: asyncpg.Connection, campaign_id: int):
+        campaign = await conn.fetchrow("SELECT * FROM newsletter_campaigns WHERE id = $1", campaign_id)
+        if campaign is None or campaign['status'] != 'sending':
+            return
+
+        run = _CampaignRun(campaign, email_service.render_campaign(campaign['subject'], campaign['content_html']))
+        segment = campaign['segment_source']
+
+        # 已處理 + 剩餘 = 本 campaign 的總收件人數
+        await conn.execute(
+            """
+            UPDATE newsletter_campaigns c
+            SET total_recipients = (
+                    SELECT COUNT(*) FROM newsletter_campaign_recipients r WHERE r.campaign_id = c.id
+                ) + (
+                    SELECT COUNT(*) FROM newsletter_subscribers s
+                    WHERE s.status = 'active' AND ($2::text IS NULL OR s.source = $2)
+                      AND s.id > c.last_subscriber_id
+                      AND NOT EXISTS (
+                          SELECT 1 FROM newsletter_campaign_recipients r
+                          WHERE r.campaign_id = c.id AND r.subscriber_id = s.id
+                      )
+                ),
+                updated_at = NOW()
+            WHERE c.id = $1
+            """,
+            campaign_id, segment
+        )
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        limiter = _RateLimiter(self.requests_per_second)
+        workers = [
+            asyncio.create_task(
+                self._batch_worker(run, queue, limiter), name=f"newsletter-batch-worker-{n}"
+            )
+            for n in range(self.concurrency)
+        ]
+
+        logger.info(f"📨 Sending newsletter campaign {campaign_id}: {campaign['subject']}")
+        try:
+            # server-side cursor 需要在 transaction 內；last_subscriber_id 之前的都已處理完
+            async with conn.transaction():
+                chunk: List[Recipient] = []
+                seq = 0
+                async for row in conn.cursor(
+                    """
+                    SELECT s.id, s.email FROM newsletter_subscribers s
+                    WHERE s.status = 'active' AND ($2::text IS NULL OR s.source = $2)
+                      AND s.id > $3
+                      AND NOT EXISTS (
+                          SELECT 1 FROM newsletter_campaign_recipients r
+                          WHERE r.campaign_id = $1 AND r.subscriber_id = s.id
+                      )
+                    ORDER BY s.id
+                    """,
+                    campaign_id, segment, campaign['last_subscriber_id'],
+                    prefetch=self.batch_size * self.concurrency
+                ):
+                    if run.stop_reason:
+                        break
+                    chunk.append((row['id'], row['email']))
+                    if len(chunk) == self.batch_size:
+                        run.last_ids[seq] = chunk[-1][0]
+                        await queue.put((seq, chunk))
+                        seq += 1
+                        chunk = []
+
+                if chunk and not run.stop_reason:
+                    run.last_ids[seq] = chunk[-1][0]
+                    await queue.put((seq, chunk))
+
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        except BaseException:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+
+        await self._finish(run)
+
+    async def _batch_worker(self, run: _CampaignRun, queue: asyncio.Queue, limiter: _RateLimiter):
+        """取出 chunk → batch 寄送 → checkpoint"""
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            if run.stop_reason:
+                continue  # 停止後只清空佇列，未寄送的收件人下次續傳
+
+            seq, chunk = item
+            try:
+                results = await self._send_chunk(run, chunk, limiter)
+                status = await self._checkpoint(run, chunk, results, run.complete(seq))
+            except Exception as e:
+                run.stop_reason = 'failed'
+                run.error = str(e) or type(e).__name__
+                logger.error(f"❌ Newsletter campaign {run.campaign_id} batch failed: {run.error}")
+                continue
+
+            if status != 'sending' and not run.stop_reason:
+                run.stop_reason = 'paused'
+                logger.info(f"⏸️ Newsletter campaign {run.campaign_id} paused")
+
+    async def _send_chunk(
+        self,
+        run: _CampaignRun,
+        chunk: List[Recipient],
+        limiter: _RateLimiter
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """寄送一個 batch；暫時性錯誤以指數退避重試"""
+        messages = []
+        for _, email in chunk:
+            unsubscribe_url = email_service.newsletter_unsubscribe_url(email)
+            messages.append({
+                "to": [email],
+                "subject": run.subject,
+                "html": email_service.personalize_campaign(run.rendered_html, email),
+                "headers": {
+                    "List-Unsubscribe": f"<{unsubscribe_url}>",
+                    "List-Unsubscribe-Post": "List-Unsubscribe=One-Click",
+                },
+            })
+
+        # 同一批收件人重試時使用相同 key，Resend 不會重複寄出
+        idempotency_key = f"newsletter-{run.campaign_id}-{chunk[0][0]}-{chunk[-1][0]}-{len(chunk)}"
+
+        attempt = 0
+        while True:
+            await limiter.wait()
+            try:
+                return await email_service.send_batch(messages, idempotency_key=idempotency_key)
+            except PermanentEmailError:
+                raise
+            except Exception as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                delay = min(60, 2 ** attempt)
+                logger.warning(
+                    f"⚠️ Newsletter batch failed (attempt {attempt}/{self.max_retries}), "
+                    f"retrying in {delay}s: {e}"
+                )
+                await asyncio.sleep(delay)
+
+    async def _checkpoint(
+        self,
+        run: _CampaignRun,
+        chunk: List[Recipient],
+        results: List[Tuple[Optional[str], Optional[str]]],
+        watermark: Optional[int]
+    ) -> str:
+        """寫入收件人結果與 campaign 進度，回傳 campaign 目前狀態（用於偵測暫停）"""
+        failed = sum(1 for _, error in results if error)
+
+        async with db.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    """
+                    INSERT INTO newsletter_campaign_recipients (
+                        campaign_id, subscriber_id, email, status, provider_message_id, error
+                    )
+                    SELECT $1, r.subscriber_id, r.email,
+                           CASE WHEN r.error IS NULL THEN 'sent' ELSE 'failed' END,
+                           r.message_id, r.error
+                    FROM unnest($2::int[], $3::text[], $4::text[], $5::text[])
+                         AS r(subscriber_id, email, message_id, error)
+                    ON CONFLICT (campaign_id, subscriber_id) DO NOTHING
+                    """,
+                    run.campaign_id,
+                    [subscriber_id for subscriber_id, _ in chunk],
+                    [email for _, email in chunk],
+                    [message_id for message_id, _ in results],
+                    [error for _, error in results]
+                )
+                return await conn.fetchval(
+                    """
+                    UPDATE newsletter_campaigns
+                    SET sent_count = sent_count + $2, failed_count = failed_count + $3,
+                        last_subscriber_id = GREATEST(last_subscriber_id, COALESCE($4, 0)),
+                        updated_at = NOW()
+                    WHERE id = $1
+                    RETURNING status
+                    """,
+                    run.campaign_id, len(chunk) - failed, failed, watermark
+                )
+
+    async def _finish(self, run: _CampaignRun):
+        """更新最終狀態（暫停時維持 paused）"""
+        async with db.pool.acquire() as conn:
+            if run.stop_reason == 'failed':
+                await conn.execute(
+                    """
+                    UPDATE newsletter_campaigns
+                    SET status = 'failed', last_error = $2, updated_at = NOW()
+                    WHERE id = $1 AND status = 'sending'
+                    """,
+                    run.campaign_id, (run.error or '')[:2000]
+                )
+            elif run.stop_reason is None:
+                row = await conn.fetchrow(
+                    """
+                    UPDATE newsletter_campaigns
+                    SET status = 'completed', completed_at = NOW(), updated_at = NOW()
+                    WHERE id = $1 AND status = 'sending'
+                    RETURNING sent_count, failed_count
+                    """,
+                    run.campaign_id
+                )
+                if row:
+                    logger.info(
+                        f"✅ Newsletter campaign {run.campaign_id} completed: "
+                        f"{row['sent_count']} sent, {row['failed_count']} failed"
+                    )
+
+
+# 全域實例
+newsletter_broadcast = NewsletterBroadcaster(
+    batch_size=settings.NEWSLETTER_BATCH_SIZE,
+    concurrency=settings.NEWSLETTER_SEND_CONCURRENCY,
+    requests_per_second=settings.NEWSLETTER_REQUESTS_PER_SECOND,
+    max_retries=settings.NEWSLETTER_BATCH_MAX_RETRIES,
+)
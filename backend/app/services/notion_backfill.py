@@ -0,0 +1,232 @@
+"""
+Notion 資料庫批次回填 / 對帳（reconciliation）
+
+不必再逐頁觸發 webhook：
+1. ✅ 分頁讀取 Notion content database（databases.query）
+2. ✅ 與 blog_posts 比對 notion_page_id / notion_last_edited_time，只挑出新增或有變更的頁面
+3. ✅ 同步一律排入 notion_sync_queue（與 webhook 共用 job，同一頁面不會同時同步），等待 job 完成
+4. ✅ 進度（掃描數、待同步數、完成 / 失敗數）可隨時查詢
+5. ✅ 只回填已上線的 Status（Published / Updated）：同步會發布頁面，草稿等狀態不能批次回填
+
+入口：POST /api/admin/blog/notion-backfill，或 backend/backfill_notion.py（CLI）
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from ..config import settings
+from ..core.database import db
+from .notion_gateway import notion_gateway, parse_notion_time
+from .notion_sync_queue import notion_sync_queue
+
+logger = logging.getLogger(__name__)
+
+# 可回填的 Notion Status：只有已上線的頁面（同步會把頁面發布到網站，
+# Draft 等其他狀態交給 webhook 流程，由編輯決定何時發布）
+DEFAULT_STATUSES = ("Published", "Updated")
+
+MAX_RECORDED_ERRORS = 20
+
+# 等待 sync job 完成的輪詢間隔（秒）
+JOB_POLL_INTERVAL = 2.0
+
+
+class NotionBackfillProgress:
+    """回填進度"""
+
+    def __init__(self, dry_run: bool = False):
+        self.state = "scanning"  # scanning / syncing / done / failed
+        self.dry_run = dry_run
+        self.started_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.scanned = 0
+        self.changed = 0
+        self.synced = 0
+        self.failed = 0
+        self.actions: Dict[str, int] = {}
+        self.errors: List[Dict[str, str]] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "dry_run": self.dry_run,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "scanned": self.scanned,
+            "changed": self.changed,
+            "synced": self.synced,
+            "failed": self.failed,
+            "remaining": max(0, self.changed - self.synced - self.failed),
+            "actions": self.actions,
+            "errors": self.errors,
+        }
+
+
+class NotionBackfill:
+    """Notion 資料庫回填（同一 process 同時只跑一個）"""
+
+    def __init__(self):
+        self.progress: Optional[NotionBackfillProgress] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, **options) -> NotionBackfillProgress:
+        """在背景執行 run()（Admin endpoint 使用）"""
+        if self.running:
+            raise RuntimeError("Notion backfill is already running")
+        validate_statuses(options.get("statuses", DEFAULT_STATUSES))
+
+        self.progress = NotionBackfillProgress(dry_run=options.get("dry_run", False))
+        self._task = asyncio.create_task(
+            self.run(progress=self.progress, **options), name="notion-backfill"
+        )
+        # 錯誤已記錄在 progress，避免 "Task exception was never retrieved"
+        self._task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return self.progress
+
+    async def run(
+        self,
+        statuses: Sequence[str] = DEFAULT_STATUSES,
+        dry_run: bool = False,
+        progress: Optional[NotionBackfillProgress] = None,
+        on_page_done: Optional[Callable[[str, Optional[dict], Optional[str]], None]] = None
+    ) -> NotionBackfillProgress:
+        """
+        掃描有變更的頁面，排入 notion_sync_queue 並等待完成
+
+        同步由 notion_sync_queue 的 worker 執行（同時同步的頁面數 = NOTION_SYNC_WORKERS）
+
+        Args:
+            statuses: 要回填的 Notion Status（必須是 DEFAULT_STATUSES 的子集）
+            dry_run: 只比對、不同步
+            on_page_done: 每頁完成時呼叫 (page_id, 結果, 錯誤訊息)，CLI 用來顯示進度
+        """
+        statuses = validate_statuses(statuses)
+        progress = progress or NotionBackfillProgress(dry_run=dry_run)
+        self.progress = progress
+
+        try:
+            changed = await self._find_changed_pages(statuses, progress)
+            progress.changed = len(changed)
+            logger.info(f"🔎 Notion backfill: {progress.scanned} pages scanned, {len(changed)} to sync")
+
+            if dry_run:
+                progress.actions = {"would_sync": len(changed)}
+            else:
+                progress.state = "syncing"
+                await self._sync_pages(changed, progress, on_page_done)
+
+            progress.state = "done"
+            logger.info(
+                f"✅ Notion backfill finished: {progress.synced} synced, {progress.failed} failed "
+                f"({progress.actions})"
+            )
+        except Exception as e:
+            progress.state = "failed"
+            progress.errors.append({"page_id": "", "error": str(e)})
+            logger.error(f"❌ Notion backfill failed: {e}")
+            raise
+        finally:
+            progress.finished_at = datetime.utcnow()
+
+        return progress
+
+    async def _find_changed_pages(self, statuses: Sequence[str], progress: NotionBackfillProgress) -> List[str]:
+        """分頁讀取 Notion 資料庫，回傳需要同步的 page id（依 Notion 回傳順序）"""
+        async with db.pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT notion_page_id, notion_last_edited_time, status
+                FROM blog_posts
+                WHERE notion_page_id IS NOT NULL
+                """
+            )
+        synced = {row['notion_page_id']: row for row in rows}
+
+        query_filter = {"or": [{"property": "Status", "select": {"equals": s}} for s in statuses]}
+
+        changed: List[str] = []
+        cursor: Optional[str] = None
+        while True:
+            response = await notion_gateway.query_database(
+                settings.NOTION_DATABASE_ID,
+                start_cursor=cursor,
+                filter=query_filter
+            )
+
+            for page in response.get('results', []):
+                progress.scanned += 1
+                row = synced.get(page['id'])
+                edited_at = parse_notion_time(page.get('last_edited_time'))
+
+                if (
+                    row is None
+                    or row['status'] != 'published'
+                    or row['notion_last_edited_time'] is None
+                    or (edited_at and edited_at > row['notion_last_edited_time'])
+                ):
+                    changed.append(page['id'])
+
+            if not response.get('has_more') or not response.get('next_cursor'):
+                break
+            cursor = response['next_cursor']
+
+        return changed
+
+    async def _sync_pages(
+        self,
+        page_ids: List[str],
+        progress: NotionBackfillProgress,
+        on_page_done
+    ):
+        """排入 sync job（與 webhook 的 job 去重），輪詢直到所有 job 結束"""
+        pending: Dict[int, str] = {}
+        for page_id in page_ids:
+            job, _ = await notion_sync_queue.enqueue(page_id)
+            pending[job['id']] = page_id
+
+        while pending:
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+            jobs = {job['id']: job for job in await notion_sync_queue.get_jobs(list(pending))}
+
+            for job_id, page_id in list(pending.items()):
+                job = jobs.get(job_id)
+                if job is not None and job['status'] not in ('succeeded', 'failed'):
+                    continue
+                del pending[job_id]
+
+                result, error = None, None
+                if job is not None and job['status'] == 'succeeded':
+                    result = job['result'] or {}
+                    progress.synced += 1
+                    action = result.get('_sync_action', 'synced')
+                    progress.actions[action] = progress.actions.get(action, 0) + 1
+                else:
+                    error = job['last_error'] if job is not None else "Sync job not found"
+                    progress.failed += 1
+                    if len(progress.errors) < MAX_RECORDED_ERRORS:
+                        progress.errors.append({"page_id": page_id, "error": error})
+                    logger.warning(f"⚠️ Notion backfill failed for {page_id}: {error}")
+
+                if on_page_done:
+                    on_page_done(page_id, result, error)
+
+
+def validate_statuses(statuses: Sequence[str]) -> List[str]:
+    """回填的 Status 只能是已上線的狀態（同步會發布頁面）"""
+    statuses = list(statuses)
+    invalid = [s for s in statuses if s not in DEFAULT_STATUSES]
+    if not statuses or invalid:
+        raise ValueError(
+            f"Backfill statuses must be a non-empty subset of {', '.join(DEFAULT_STATUSES)}"
+            + (f" (got {', '.join(invalid)})" if invalid else "")
+        )
+    return statuses
+
+
+# 全域實例
+notion_backfill = NotionBackfill()
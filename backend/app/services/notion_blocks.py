@@ -0,0 +1,122 @@
+"""
+Notion block 讀取（分頁 + 巢狀 children）
+
+Notion 的 blocks.children.list 一次最多回傳 100 個 block，且不包含巢狀內容
+（toggle、清單子項目、columns 等）。本模組：
+1. ✅ 依 next_cursor 讀完所有分頁（讀目前這頁時就先預取下一頁）
+2. ✅ has_children 的 block 並行遞迴讀取 children（以 semaphore 限制同時請求數）
+3. ✅ 以 async iterator 依文件順序逐一產出頂層 block，HTML 轉換可邊讀邊處理
+4. ✅ block_hash：block 內容（含 children）的穩定 hash，增量同步用來判斷是否需要重新轉換
+5. ✅ page_hash：properties + 頂層 block hash，判斷整個頁面是否有變更
+
+產出的 block 若有 children，放在 block['children']（list，已遞迴展開）。
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from ..config import settings
+from .notion_images import source_image_key
+
+logger = logging.getLogger(__name__)
+
+# (block_id, start_cursor) → Notion blocks.children.list 回應
+ListChildren = Callable[[str, Optional[str]], Awaitable[dict]]
+
+# 這些 block 的 children 是另一個頁面 / 資料庫，不展開
+SKIP_CHILDREN_TYPES = frozenset({"child_page", "child_database"})
+
+# 不影響輸出內容的 metadata（每次讀取或編輯都可能變動）
+_VOLATILE_KEYS = frozenset({
+    "id", "created_time", "last_edited_time", "created_by", "last_edited_by",
+    "parent", "request_id", "expiry_time",
+})
+
+
+class NotionBlockFetcher:
+    """Notion block 串流讀取器"""
+
+    def __init__(self, list_children: ListChildren, max_concurrency: Optional[int] = None):
+        self._list_children = list_children
+        self._semaphore = asyncio.Semaphore(max_concurrency or settings.NOTION_BLOCK_CONCURRENCY)
+        self.request_count = 0
+
+    async def iter_children(self, block_id: str) -> AsyncIterator[dict]:
+        """依文件順序逐一產出 block_id 底下的 block（children 已展開）"""
+        next_page: Optional[asyncio.Future] = asyncio.ensure_future(self._fetch_page(block_id, None))
+        child_tasks: Dict[str, asyncio.Future] = {}
+
+        try:
+            while next_page is not None:
+                response = await next_page
+                next_page = None
+
+                # 預取下一頁
+                if response.get('has_more') and response.get('next_cursor'):
+                    next_page = asyncio.ensure_future(self._fetch_page(block_id, response['next_cursor']))
+
+                results = response.get('results', [])
+
+                # 這一頁所有巢狀 block 同時開始讀取
+                child_tasks = {
+                    block['id']: asyncio.ensure_future(self.fetch_all(block['id']))
+                    for block in results
+                    if block.get('has_children') and block.get('type') not in SKIP_CHILDREN_TYPES
+                }
+
+                for block in results:
+                    task = child_tasks.pop(block['id'], None)
+                    if task is not None:
+                        block['children'] = await task
+                    yield block
+        finally:
+            # 呼叫端提早停止或出錯時，取消尚未完成的請求
+            for task in [next_page, *child_tasks.values()]:
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def fetch_all(self, block_id: str) -> List[dict]:
+        """讀取 block_id 底下所有 block（children 已展開）"""
+        return [block async for block in self.iter_children(block_id)]
+
+    async def _fetch_page(self, block_id: str, start_cursor: Optional[str]) -> dict:
+        """讀取一頁（受並行數上限控制）"""
+        async with self._semaphore:
+            self.request_count += 1
+            return await self._list_children(block_id, start_cursor)
+
+
+def block_hash(block: dict) -> str:
+    """block 內容（含 children）的 hash；檔案 URL 的簽章不列入計算"""
+    normalized = json.dumps(_normalize(block), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+def page_hash(properties: dict, block_hashes: List[str], ignore: Sequence[str] = ()) -> str:
+    """
+    頁面內容（properties + 依序的頂層 block hash）的 hash
+
+    Notion 的 last_edited_time 只到分鐘，同一分鐘內的編輯要靠內容 hash 判斷；
+    ignore 為同步時由後端自己寫回的 properties（例如 Status），不列入計算
+    """
+    content = {
+        "properties": _normalize({key: value for key, value in properties.items() if key not in ignore}),
+        "blocks": block_hashes,
+    }
+    normalized = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+def _normalize(value: Any) -> Any:
+    """移除 metadata、去掉 pre-signed URL 的簽章"""
+    if isinstance(value, dict):
+        return {
+            key: source_image_key(item) if key == "url" and isinstance(item, str) else _normalize(item)
+            for key, item in value.items()
+            if key not in _VOLATILE_KEYS
+        }
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    return value
@@ -0,0 +1,282 @@
+"""
+Notion API Gateway（所有 Notion 呼叫的單一入口）
+
+1. ✅ 共用一個 keep-alive httpx.AsyncClient（不再每次呼叫都建立新連線）
+2. ✅ 限速：平均不超過 NOTION_RATE_LIMIT_PER_SECOND（Notion 限制約 3 req/s）
+3. ✅ 429 依 Retry-After 等待重試；5xx / 409 / 網路錯誤以指數退避重試
+   （建立頁面等非冪等的 POST 只重試 429 與尚未送出請求的連線錯誤，避免重複建立）
+4. ✅ 相同的 GET 請求同時進行時合併為一次（request coalescing）
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, Optional
+
+import httpx
+
+from ..config import settings
+from ..core.outbound_metrics import outbound_timer
+
+logger = logging.getLogger(__name__)
+
+NOTION_API_URL = "https://api.notion.com/v1"
+NOTION_VERSION = "2022-06-28"
+
+# 可重試的狀態碼（409 = Notion 的 conflict_error，官方建議重試）
+RETRYABLE_STATUS = frozenset({409, 429, 500, 502, 503, 504})
+
+# 非冪等請求只重試這些：429 代表請求被拒絕、未被處理
+NON_IDEMPOTENT_RETRYABLE_STATUS = frozenset({429})
+
+# 請求尚未送出的錯誤（非冪等請求也可以安全重試）；讀取逾時等錯誤時 Notion 可能已處理請求
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class NotionAPIError(Exception):
+    """Notion API 回傳錯誤"""
+
+    def __init__(self, status_code: int, message: str, code: str = ""):
+        super().__init__(f"Notion API error {status_code} ({code}): {message}")
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+
+
+def parse_notion_time(value: Optional[str]) -> Optional[datetime]:
+    """Notion ISO 時間（UTC）→ naive datetime（資料庫 TIMESTAMP 無時區）"""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+class NotionGateway:
+    """非同步 Notion API client"""
+
+    def __init__(
+        self,
+        api_key: str,
+        requests_per_second: float = 3.0,
+        max_retries: int = 5,
+        timeout: float = 30.0
+    ):
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._rate_lock = asyncio.Lock()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+        # 統計
+        self.request_count = 0
+        self.retry_count = 0
+        self.coalesced_count = 0
+
+    # ==================== 常用 API ====================
+
+    async def retrieve_page(self, page_id: str) -> dict:
+        """讀取頁面（含 properties）"""
+        return await self.request("GET", f"/pages/{page_id}")
+
+    async def create_page(self, page_data: dict) -> dict:
+        """建立頁面"""
+        return await self.request("POST", "/pages", json=page_data)
+
+    async def update_page(self, page_id: str, properties: dict) -> dict:
+        """更新頁面 properties"""
+        return await self.request("PATCH", f"/pages/{page_id}", json={"properties": properties})
+
+    async def list_block_children(
+        self,
+        block_id: str,
+        start_cursor: Optional[str] = None,
+        page_size: int = 100
+    ) -> dict:
+        """讀取一頁 block children（可直接當作 NotionBlockFetcher 的 list_children）"""
+        params: Dict[str, Any] = {"page_size": page_size}
+        if start_cursor:
+            params["start_cursor"] = start_cursor
+        return await self.request("GET", f"/blocks/{block_id}/children", params=params)
+
+    async def query_database(
+        self,
+        database_id: str,
+        start_cursor: Optional[str] = None,
+        filter: Optional[dict] = None,
+        page_size: int = 100
+    ) -> dict:
+        """查詢資料庫的一頁 pages"""
+        body: Dict[str, Any] = {"page_size": page_size}
+        if start_cursor:
+            body["start_cursor"] = start_cursor
+        if filter:
+            body["filter"] = filter
+        return await self.request("POST", f"/databases/{database_id}/query", json=body)
+
+    # ==================== 核心 ====================
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict] = None,
+        json: Optional[dict] = None
+    ) -> dict:
+        """送出請求（GET 會合併同時進行的相同請求）"""
+        if method != "GET":
+            return await self._request_with_retry(method, path, params, json)
+
+        key = (path, tuple(sorted((params or {}).items())))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._request_with_retry(method, path, params, None))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced_count += 1
+
+        # shield：其中一個呼叫端被取消時，不影響其他等待同一結果的呼叫端
+        return await asyncio.shield(task)
+
+    async def _request_with_retry(
+        self,
+        method: str,
+        path: str,
+        params: Optional[dict],
+        json: Optional[dict]
+    ) -> dict:
+        """限速 + 重試"""
+        client = self._get_client()
+        idempotent = self._is_idempotent(method, path)
+        retryable_status = RETRYABLE_STATUS if idempotent else NON_IDEMPOTENT_RETRYABLE_STATUS
+
+        for attempt in range(self.max_retries + 1):
+            await self._throttle()
+            self.request_count += 1
+
+            try:
+                with outbound_timer("notion", self._operation(method, path)) as timer:
+                    response = await client.request(method, path, params=params, json=json)
+                    timer.outcome = response.status_code
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries or not (idempotent or isinstance(e, NOT_SENT_ERRORS)):
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"⚠️ Notion {method} {path} 連線錯誤，{delay:.1f}s 後重試: {e}")
+                await self._sleep_before_retry(delay)
+                continue
+
+            if response.status_code < 400:
+                return response.json()
+
+            if response.status_code in retryable_status and attempt < self.max_retries:
+                delay = self._retry_after(response) or self._backoff(attempt)
+                logger.warning(
+                    f"⚠️ Notion {method} {path} HTTP {response.status_code}，{delay:.1f}s 後重試"
+                )
+                await self._sleep_before_retry(delay)
+                continue
+
+            raise self._error(response)
+
+        # 最後一次嘗試一定會 return 或 raise，不會執行到這裡
+        raise NotionAPIError(0, "retries exhausted")
+
+    async def _throttle(self):
+        """平均請求間隔不小於 1 / requests_per_second"""
+        if not self._interval:
+            return
+
+        async with self._rate_lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            wait = self._next_slot - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+                now = loop.time()
+            self._next_slot = max(now, self._next_slot) + self._interval
+
+    async def _sleep_before_retry(self, delay: float):
+        """等待重試，並讓之後的請求也延後（429 代表整個 integration 被限速）"""
+        self.retry_count += 1
+        loop = asyncio.get_running_loop()
+        self._next_slot = max(self._next_slot, loop.time() + delay)
+        await asyncio.sleep(delay)
+
+    @staticmethod
+    def _is_idempotent(method: str, path: str) -> bool:
+        """POST 只有 databases.query（唯讀）可以重送；POST /pages 重送會建立重複頁面"""
+        return method != "POST" or path.rstrip('/').endswith('/query')
+
+    @staticmethod
+    def _operation(method: str, path: str) -> str:
+        """metrics 用的操作名稱（只取資源類型，不含 id）：GET /blocks"""
+        return f"{method} /{path.lstrip('/').split('/', 1)[0]}"
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """指數退避（含 jitter），最多 30 秒"""
+        return min(30.0, 0.5 * (2 ** attempt)) * (0.5 + random.random() / 2)
+
+    @staticmethod
+    def _retry_after(response: httpx.Response) -> Optional[float]:
+        """解析 Retry-After（秒）"""
+        value = response.headers.get("retry-after")
+        try:
+            return max(0.0, float(value)) if value else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _error(response: httpx.Response) -> NotionAPIError:
+        """將錯誤回應轉為 NotionAPIError"""
+        try:
+            body = response.json()
+            return NotionAPIError(response.status_code, body.get("message", response.text), body.get("code", ""))
+        except ValueError:
+            return NotionAPIError(response.status_code, response.text)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """共用的 keep-alive client（第一次使用時建立）"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=NOTION_API_URL,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Notion-Version": NOTION_VERSION,
+                    "Content-Type": "application/json"
+                },
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=60)
+            )
+        return self._client
+
+    async def close(self):
+        """關閉連線（應用程式關閉時呼叫）"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        """統計資料"""
+        return {
+            "requests": self.request_count,
+            "retries": self.retry_count,
+            "coalesced": self.coalesced_count,
+            "inflight": len(self._inflight),
+        }
+
+
+# 全域實例
+notion_gateway = NotionGateway(
+    api_key=settings.NOTION_API_KEY,
+    requests_per_second=settings.NOTION_RATE_LIMIT_PER_SECOND,
+    max_retries=settings.NOTION_MAX_RETRIES,
+    timeout=settings.NOTION_TIMEOUT,
+)
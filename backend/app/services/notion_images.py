@@ -0,0 +1,179 @@
+"""
+Notion 圖片匯入（Notion 圖片 URL 會過期，需下載後上傳到 R2）
+
+流程：
+1. 呼叫端先收集整篇文章的所有圖片（封面 + 內文）
+2. 查 notion_image_map：之前已上傳過的來源圖片直接使用既有 R2 URL（不重新下載）
+3. 其餘圖片共用一個 httpx client，以 semaphore 限制並行數同時下載
+4. 下載成功的圖片以 r2_storage.upload_many 並行上傳，並記錄到 notion_image_map
+5. 依輸入順序回傳最終 URL（失敗的圖片保留原始 URL）
+
+同步時間取決於最慢的一張圖，而不是所有圖片耗時的總和。
+"""
+import asyncio
+import logging
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from ..config import settings
+from ..core.database import db
+from ..core.outbound_metrics import outbound_timer
+from .r2_storage import r2_storage
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+    'image/webp': 'webp'
+}
+
+
+class NotionImage(NamedTuple):
+    """待匯入的圖片"""
+    url: str
+    folder: str  # R2 資料夾（blog-covers / blog-images）
+    filename_stem: str  # 不含副檔名，副檔名依下載的 content-type 決定
+
+
+async def ingest_images(
+    images: Sequence[NotionImage],
+    client: Optional[httpx.AsyncClient] = None
+) -> List[str]:
+    """
+    下載並上傳所有圖片，回傳與輸入同順序的最終 URL
+
+    Args:
+        images: 待匯入的圖片
+        client: 共用的 httpx client（未提供時建立一個，整批共用）
+    """
+    if not images:
+        return []
+
+    if client is None:
+        async with httpx.AsyncClient(timeout=settings.NOTION_IMAGE_TIMEOUT, follow_redirects=True) as own_client:
+            return await ingest_images(images, own_client)
+
+    final_urls = [image.url for image in images]  # 失敗時 fallback 原始 URL
+    source_keys = [source_image_key(image.url) for image in images]
+
+    # 已上傳過的圖片直接使用既有 R2 URL
+    known = await _lookup_uploaded(set(source_keys))
+    todo = []
+    for index, key in enumerate(source_keys):
+        if key in known:
+            final_urls[index] = known[key]
+        else:
+            todo.append(index)
+
+    if not todo:
+        logger.info(f"✅ 圖片皆已在 R2（{len(images)} 張，未重新下載）")
+        return final_urls
+
+    semaphore = asyncio.Semaphore(settings.NOTION_IMAGE_CONCURRENCY)
+
+    async def download(image: NotionImage) -> Optional[Tuple[bytes, str]]:
+        async with semaphore:
+            try:
+                with outbound_timer("notion_files", "download") as timer:
+                    response = await client.get(image.url)
+                    timer.outcome = response.status_code
+            except Exception as e:
+                logger.warning(f"⚠️ 圖片下載失敗: {e} ({image.url[:80]})")
+                return None
+
+        if response.status_code != 200:
+            logger.warning(f"⚠️ 下載圖片失敗 {response.status_code}: {image.url[:80]}")
+            return None
+
+        content_type = response.headers.get('content-type', 'image/jpeg').split(';')[0].strip()
+        return response.content, content_type
+
+    # 同一張圖在文章中出現多次時只下載一次
+    unique_todo: Dict[str, int] = {}
+    for index in todo:
+        unique_todo.setdefault(source_keys[index], index)
+
+    downloads = await asyncio.gather(*(download(images[index]) for index in unique_todo.values()))
+
+    pending = []  # (圖片索引, upload_file 參數)
+    for index, downloaded in zip(unique_todo.values(), downloads):
+        if downloaded is None:
+            continue
+        image = images[index]
+        content, content_type = downloaded
+        ext = CONTENT_TYPE_EXTENSIONS.get(content_type, 'jpg')
+        pending.append((index, {
+            "file_content": content,
+            "filename": f"{image.filename_stem}.{ext}",
+            "folder": image.folder,
+            "content_type": content_type
+        }))
+
+    results = await r2_storage.upload_many([item for _, item in pending])
+
+    uploaded: Dict[str, dict] = {}
+    for (index, item), result in zip(pending, results):
+        if isinstance(result, Exception):
+            logger.warning(f"⚠️ 圖片上傳失敗: {result} ({item['filename']})")
+            continue
+        uploaded[source_keys[index]] = result
+
+    for index in todo:
+        result = uploaded.get(source_keys[index])
+        if result is not None:
+            final_urls[index] = result['url']
+
+    await _record_uploaded(uploaded)
+
+    logger.info(
+        f"✅ 圖片已上傳到 R2: {len(uploaded)}/{len(unique_todo)}"
+        f"（{len(images) - len(todo)} 張已存在，略過下載）"
+    )
+    return final_urls
+
+
+def source_image_key(url: str) -> str:
+    """
+    來源圖片的穩定 key
+
+    Notion 檔案 URL 是 S3 pre-signed URL，每次讀取簽章（X-Amz-*）都不同，
+    去掉簽章參數後的 URL 才能代表同一個檔案
+    """
+    parts = urlsplit(url)
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    kept = [(k, v) for k, v in params if not k.lower().startswith('x-amz-')]
+    if len(kept) == len(params):
+        return url
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(kept), ''))
+
+
+async def _lookup_uploaded(source_keys: set) -> Dict[str, str]:
+    """查詢已上傳的來源圖片 → R2 URL"""
+    if not source_keys:
+        return {}
+    async with db.pool.acquire() as conn:
+        rows = await conn.fetch(
+            "SELECT source_key, r2_url FROM notion_image_map WHERE source_key = ANY($1::text[])",
+            list(source_keys)
+        )
+    return {row['source_key']: row['r2_url'] for row in rows}
+
+
+async def _record_uploaded(uploaded: Dict[str, dict]):
+    """記錄來源圖片 → R2 key / URL"""
+    if not uploaded:
+        return
+    async with db.pool.acquire() as conn:
+        await conn.executemany(
+            """
+            INSERT INTO notion_image_map (source_key, r2_key, r2_url)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (source_key) DO UPDATE
+            SET r2_key = EXCLUDED.r2_key, r2_url = EXCLUDED.r2_url
+            """,
+            [(key, result['key'], result['url']) for key, result in uploaded.items()]
+        )
@@ -0,0 +1,294 @@
+"""
+Notion 同步 Job Queue（Postgres 持久化 + in-process worker pool）
+
+Webhook 只負責把 job 寫入 notion_sync_jobs 並立即回傳 job id；
+實際同步（下載圖片、上傳 R2、寫入資料庫、更新 Notion 狀態）由背景 worker 執行：
+1. ✅ FOR UPDATE SKIP LOCKED 取 job，多個 worker / 多個 process 不會重複執行
+2. ✅ 每個頁面最多一個 queued job：尚未開始的 job 合併 N8N 重送 / 連續編輯；
+   頁面同步中再收到 webhook 時排入新 job，避免同步期間的編輯被併入已讀取舊內容的 job
+3. ✅ 失敗以指數退避重試，超過 NOTION_SYNC_MAX_ATTEMPTS 標記為 failed
+4. ✅ worker 中途當掉（running 太久）的 job 會被重新領取
+"""
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import asyncpg
+from fastapi.encoders import jsonable_encoder
+
+from ..config import settings
+from ..core.database import db
+
+logger = logging.getLogger(__name__)
+
+# 同步處理函數：notion_page_id → 結果（寫入 job.result）
+JobHandler = Callable[[str], Awaitable[dict]]
+
+JOB_COLUMNS = """
+    id, notion_page_id, last_edited_time, status, attempts, max_attempts,
+    run_after, locked_at, last_error, result, created_at, updated_at, finished_at
+"""
+
+
+class NotionSyncQueue:
+    """Notion 同步 job queue"""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_attempts: int = 5,
+        poll_interval: float = 5.0,
+        stale_after_seconds: int = 900
+    ):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.stale_after_seconds = stale_after_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._handler: Optional[JobHandler] = None
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    def set_handler(self, handler: JobHandler):
+        """設定同步處理函數（main.py 啟動時設定）"""
+        self._handler = handler
+
+    # ==================== Producer ====================
+
+    async def enqueue(
+        self,
+        notion_page_id: str,
+        last_edited_time: Optional[datetime] = None
+    ) -> Tuple[dict, bool]:
+        """
+        建立 job；該頁面已有尚未開始的（queued）job 時併入該 job
+
+        只與 queued job 去重：running 的 job 已讀取頁面內容，之後的編輯需要新的 job；
+        回傳的 job 一定是本次建立或併入的 job，不會是先前已完成的 job。
+
+        Returns:
+            (job, 是否新建立)
+        """
+        last_edited_time = _to_naive_utc(last_edited_time)
+
+        async with db.pool.acquire() as conn:
+            # 去重由 partial unique index 保證（見 migrations/0016_notion_sync_jobs_queued_dedupe）
+            # xmax = 0 → 新插入的 row；否則為併入既有 queued job
+            row = await conn.fetchrow(
+                f"""
+                INSERT INTO notion_sync_jobs (notion_page_id, last_edited_time, max_attempts)
+                VALUES ($1, $2, $3)
+                ON CONFLICT (notion_page_id) WHERE status = 'queued'
+                DO UPDATE SET
+                    last_edited_time = GREATEST(notion_sync_jobs.last_edited_time, EXCLUDED.last_edited_time),
+                    updated_at = NOW()
+                RETURNING {JOB_COLUMNS}, (xmax = 0) AS created
+                """,
+                notion_page_id, last_edited_time, self.max_attempts
+            )
+
+        job = dict(row)
+        created = job.pop('created')
+        self._wakeup.set()
+        return job, created
+
+    async def get_job(self, job_id: int) -> Optional[dict]:
+        """查詢 job"""
+        async with db.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                f"SELECT {JOB_COLUMNS} FROM notion_sync_jobs WHERE id = $1",
+                job_id
+            )
+        return dict(row) if row else None
+
+    async def get_jobs(self, job_ids: List[int]) -> List[dict]:
+        """一次查詢多個 job"""
+        async with db.pool.acquire() as conn:
+            rows = await conn.fetch(
+                f"SELECT {JOB_COLUMNS} FROM notion_sync_jobs WHERE id = ANY($1::int[])",
+                job_ids
+            )
+        return [dict(row) for row in rows]
+
+    async def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[dict]:
+        """最近的 jobs（Admin 檢視用）"""
+        async with db.pool.acquire() as conn:
+            rows = await conn.fetch(
+                f"""
+                SELECT {JOB_COLUMNS} FROM notion_sync_jobs
+                WHERE ($1::text IS NULL OR status = $1)
+                ORDER BY id DESC
+                LIMIT $2
+                """,
+                status, limit
+            )
+        return [dict(row) for row in rows]
+
+    async def wait_for(self, job_id: int, timeout: float) -> Optional[dict]:
+        """等待 job 結束（succeeded / failed）或逾時，回傳最新狀態"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        while True:
+            job = await self.get_job(job_id)
+            if job is None or job['status'] in ('succeeded', 'failed'):
+                return job
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return job
+            await asyncio.sleep(min(1.0, remaining))
+
+    # ==================== Workers ====================
+
+    def start(self):
+        """啟動 worker pool"""
+        if self._tasks:
+            return
+        if self._handler is None:
+            raise RuntimeError("NotionSyncQueue handler is not set")
+
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(n), name=f"notion-sync-worker-{n}")
+            for n in range(self.workers)
+        ]
+        logger.info(f"🔁 Notion sync queue started ({self.workers} workers)")
+
+    async def stop(self):
+        """停止 worker pool（執行中的 job 會被取消，之後由 stale 機制重新領取）"""
+        self._stopping = True
+        self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker_loop(self, n: int):
+        """持續領取並執行 job"""
+        while not self._stopping:
+            try:
+                job = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Notion sync worker {n} failed to claim job: {e}")
+                job = None
+
+            if job is None:
+                # 沒有 job：等待新 job 通知或下一次輪詢
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._run(job)
+
+    async def _claim(self) -> Optional[asyncpg.Record]:
+        """領取一個可執行的 job（同一頁面同時只會有一個 job 在執行）"""
+        async with db.pool.acquire() as conn:
+            return await conn.fetchrow(
+                f"""
+                UPDATE notion_sync_jobs
+                SET status = 'running', attempts = attempts + 1,
+                    locked_at = NOW(), locked_by = $1, updated_at = NOW()
+                WHERE id = (
+                    SELECT j.id FROM notion_sync_jobs j
+                    WHERE (
+                        (j.status = 'queued' AND j.run_after <= NOW())
+                        OR (j.status = 'running' AND j.locked_at < NOW() - make_interval(secs => $2))
+                    )
+                    AND NOT EXISTS (
+                        SELECT 1 FROM notion_sync_jobs r
+                        WHERE r.notion_page_id = j.notion_page_id
+                          AND r.status = 'running'
+                          AND r.id <> j.id
+                          AND r.locked_at >= NOW() - make_interval(secs => $2)
+                    )
+                    ORDER BY j.run_after, j.id
+                    FOR UPDATE SKIP LOCKED
+                    LIMIT 1
+                )
+                RETURNING {JOB_COLUMNS}
+                """,
+                self.worker_id, float(self.stale_after_seconds)
+            )
+
+    async def _run(self, job: asyncpg.Record):
+        """執行 job 並記錄結果"""
+        job_id = job['id']
+        logger.info(
+            f"🔄 Notion sync job {job_id} started: {job['notion_page_id']} "
+            f"(attempt {job['attempts']}/{job['max_attempts']})"
+        )
+
+        try:
+            result = await self._handler(job['notion_page_id'])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._fail(job, e)
+            return
+
+        async with db.pool.acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE notion_sync_jobs
+                SET status = 'succeeded', result = $2, last_error = NULL,
+                    locked_at = NULL, locked_by = NULL, finished_at = NOW(), updated_at = NOW()
+                WHERE id = $1
+                """,
+                job_id, jsonable_encoder(result)
+            )
+        logger.info(f"✅ Notion sync job {job_id} succeeded: {result.get('_sync_action', '')}")
+
+    async def _fail(self, job: asyncpg.Record, error: Exception):
+        """失敗：還有次數則退避後重試，否則標記 failed"""
+        detail = getattr(error, 'detail', None) or str(error) or type(error).__name__
+        final = job['attempts'] >= job['max_attempts']
+        delay = min(1800, 30 * (2 ** (job['attempts'] - 1)))
+
+        update = """
+            UPDATE notion_sync_jobs
+            SET status = $2, last_error = $3,
+                run_after = NOW() + make_interval(secs => $4),
+                locked_at = NULL, locked_by = NULL,
+                finished_at = CASE WHEN $2 = 'failed' THEN NOW() ELSE NULL END,
+                updated_at = NOW()
+            WHERE id = $1
+        """
+        async with db.pool.acquire() as conn:
+            try:
+                await conn.execute(update, job['id'], 'failed' if final else 'queued', str(detail)[:2000], float(delay))
+            except asyncpg.UniqueViolationError:
+                # 執行期間已有新的 queued job（會同步最新內容），不再重試這個 job
+                final = True
+                detail = f"{detail} (superseded by a newer queued job)"
+                await conn.execute(update, job['id'], 'failed', str(detail)[:2000], 0.0)
+
+        if final:
+            logger.error(f"❌ Notion sync job {job['id']} failed permanently: {detail}")
+        else:
+            logger.warning(f"⚠️ Notion sync job {job['id']} failed, retrying in {delay}s: {detail}")
+
+
+def _to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """資料庫 TIMESTAMP 無時區，統一存 UTC"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# 全域實例
+notion_sync_queue = NotionSyncQueue(
+    workers=settings.NOTION_SYNC_WORKERS,
+    max_attempts=settings.NOTION_SYNC_MAX_ATTEMPTS,
+    poll_interval=settings.NOTION_SYNC_POLL_INTERVAL,
+    stale_after_seconds=settings.NOTION_SYNC_STALE_AFTER_SECONDS,
+)
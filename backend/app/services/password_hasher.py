@@ -0,0 +1,143 @@
+"""
+密碼雜湊服務（bcrypt 在 thread pool 執行）
+
+bcrypt 每次運算需 100ms 以上，直接在 async handler 呼叫會卡住整個 event loop，
+同一個 worker 上所有請求都會跟著停頓。本服務：
+1. ✅ 在有上限的 thread pool 執行（bcrypt 運算期間會釋放 GIL）
+2. ✅ 排隊上限：超過時丟出 PasswordHasherBusy（API 回 503），避免登入洪水拖垮 worker
+3. ✅ 統計：運算次數、平均耗時、排隊時間、目前排隊數
+4. ✅ cost factor（BCRYPT_ROUNDS）調整後，登入成功時自動 rehash
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from ..config import settings
+from ..utils.security import hash_password, verify_password, password_needs_rehash
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasherBusy(Exception):
+    """排隊中的密碼運算已達上限"""
+    pass
+
+
+class PasswordHasher:
+    """非同步 bcrypt 服務"""
+
+    def __init__(self, workers: int = 2, max_pending: int = 32, rounds: int = 12):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+
+        # 統計
+        self.hash_count = 0
+        self.verify_count = 0
+        self.rehash_count = 0
+        self.rejected_count = 0
+        self._run_seconds = 0.0
+        self._wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        """產生密碼 hash"""
+        hashed = await self._run(hash_password, password, self.rounds)
+        self.hash_count += 1
+        return hashed
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """驗證密碼"""
+        try:
+            ok = await self._run(verify_password, password, hashed_password)
+        except ValueError:
+            # 格式錯誤的 hash（例如 OAuth 帳號的佔位值）視為驗證失敗
+            ok = False
+        self.verify_count += 1
+        return ok
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        驗證密碼，並在 cost factor 過期時產生新 hash
+
+        Returns:
+            (是否通過, 新 hash 或 None)；呼叫端負責寫回資料庫
+        """
+        if not await self.verify(password, hashed_password):
+            return False, None
+
+        if not password_needs_rehash(hashed_password, self.rounds):
+            return True, None
+
+        self.rehash_count += 1
+        return True, await self.hash(password)
+
+    async def _run(self, func, *args) -> Any:
+        """在 thread pool 執行（超過排隊上限時直接拒絕）"""
+        if self._pending >= self.max_pending:
+            self.rejected_count += 1
+            raise PasswordHasherBusy("Too many pending password operations")
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="password-hasher"
+            )
+
+        loop = asyncio.get_running_loop()
+        submitted_at = time.perf_counter()
+
+        def timed():
+            started_at = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished_at = time.perf_counter()
+                self._record(started_at - submitted_at, finished_at - started_at)
+
+        self._pending += 1
+        try:
+            return await loop.run_in_executor(self._executor, timed)
+        finally:
+            self._pending -= 1
+
+    def _record(self, wait_seconds: float, run_seconds: float):
+        """記錄排隊與運算時間（在 worker thread 中呼叫；float 累加在 GIL 下足夠精確）"""
+        self._wait_seconds += wait_seconds
+        self._run_seconds += run_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def shutdown(self):
+        """關閉 thread pool（應用程式關閉時呼叫）"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """統計資料（給 /health 或除錯使用）"""
+        operations = self.hash_count + self.verify_count
+        return {
+            "rounds": self.rounds,
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "hash_count": self.hash_count,
+            "verify_count": self.verify_count,
+            "rehash_count": self.rehash_count,
+            "rejected_count": self.rejected_count,
+            "avg_run_ms": round(self._run_seconds / operations * 1000, 1) if operations else 0,
+            "avg_wait_ms": round(self._wait_seconds / operations * 1000, 1) if operations else 0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 1),
+        }
+
+
+# 全域實例
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    rounds=settings.BCRYPT_ROUNDS,
+)
@@ -0,0 +1,173 @@
+"""
+PR Package 目錄快照（定價頁最熱的 API）
+
+每個 (status, audience) 組合只在第一次請求時查詢並序列化一次，
+之後直接回傳已序列化的 bytes；pr_packages / pr_package_categories
+被 Admin 修改時（db.notify_content_change）才整批丟棄重建。
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import asyncpg
+from pydantic import TypeAdapter
+
+from ..core.database import db, ALL_TABLES
+from ..models.pr_package_frontend import PRPackageCategoryFrontend
+
+logger = logging.getLogger(__name__)
+
+# 快照依賴的資料表
+SNAPSHOT_TABLES = frozenset({"pr_packages", "pr_package_categories"})
+
+# 允許的篩選值（快照以此為 key，未知值一律拒絕，避免快取無限增長）
+SNAPSHOT_STATUSES = frozenset({"active", "inactive", "all"})
+SNAPSHOT_AUDIENCES = frozenset({None, "crypto", "ai", "both"})
+
+_catalog_adapter = TypeAdapter(List[PRPackageCategoryFrontend])
+
+
+class PRCatalogSnapshot:
+    """已序列化的目錄快照"""
+
+    __slots__ = ("body", "etag", "package_count")
+
+    def __init__(self, body: bytes, package_count: int):
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self.package_count = package_count
+
+
+class PRCatalogSnapshotStore:
+    """PR Package 目錄快照存放區"""
+
+    def __init__(self):
+        self._snapshots: Dict[Tuple[str, Optional[str]], PRCatalogSnapshot] = {}
+        self._locks: Dict[Tuple[str, Optional[str]], asyncio.Lock] = {}
+        self._generation = 0
+
+    async def get(self, status: str = "active", audience: Optional[str] = None) -> PRCatalogSnapshot:
+        """取得快照（不存在時建立）"""
+        if status not in SNAPSHOT_STATUSES or audience not in SNAPSHOT_AUDIENCES:
+            raise ValueError(f"Unknown PR catalog filter: status={status!r} audience={audience!r}")
+
+        key = (status, audience)
+        snapshot = self._snapshots.get(key)
+        if snapshot is not None:
+            return snapshot
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None:
+                return snapshot
+
+            generation = self._generation
+            async with db.pool.acquire() as conn:
+                snapshot = await self._build(conn, status, audience)
+
+            # 建立期間若有 Admin 修改，這份快照可能已過期，只回傳不保存
+            if generation == self._generation:
+                self._snapshots[key] = snapshot
+                logger.info(
+                    f"📦 PR catalog snapshot built: status={status} audience={audience} "
+                    f"({snapshot.package_count} packages, {len(snapshot.body)} bytes)"
+                )
+            return snapshot
+
+    def invalidate(self, *tables: str):
+        """內容變更 handler：只在相關資料表變更時丟棄所有快照"""
+        if ALL_TABLES in tables or SNAPSHOT_TABLES.intersection(tables):
+            self._generation += 1
+            self._snapshots.clear()
+
+    async def _build(self, conn: asyncpg.Connection, status: str, audience: Optional[str]) -> PRCatalogSnapshot:
+        """查詢 packages + categories（同一條連線），組成前端格式並序列化"""
+        conditions = []
+        params: list = []
+
+        if status != "all":
+            params.append(status)
+            conditions.append(f"status = ${len(params)}")
+
+        if audience is not None:
+            # packages whose audience matches OR is 'both'
+            params.append(audience)
+            conditions.append(f"(audience = ${len(params)} OR audience = 'both')")
+
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        rows = await conn.fetch(
+            f"""
+            SELECT slug, name, price, description, features, badge,
+                   guaranteed_publications, media_logos, detailed_info,
+                   audience, category_id
+            FROM pr_packages
+            {where_clause}
+            ORDER BY category_order, display_order, id
+            """,
+            *params
+        )
+        category_rows = await conn.fetch(
+            """
+            SELECT category_id, title, badges
+            FROM pr_package_categories
+            ORDER BY display_order, id
+            """
+        )
+
+        packages_by_category: Dict[str, list] = {}
+        for row in rows:
+            packages_by_category.setdefault(row['category_id'], []).append(_to_frontend_package(row))
+
+        categories = []
+        for cat_row in category_rows:
+            category_id = cat_row['category_id']
+
+            # 如果該分類有 packages，才加入結果
+            if category_id in packages_by_category:
+                categories.append({
+                    "id": category_id,
+                    "title": cat_row['title'],
+                    "badges": _load_json(cat_row['badges']),
+                    "packages": packages_by_category[category_id]
+                })
+
+        # 只在建立快照時驗證一次 response model
+        validated = _catalog_adapter.validate_python(categories)
+        return PRCatalogSnapshot(_catalog_adapter.dump_json(validated), len(rows))
+
+
+def _load_json(value):
+    """asyncpg 可能回傳 JSONB 字串"""
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _to_frontend_package(row) -> dict:
+    """轉換欄位名稱為 camelCase（匹配前端）"""
+    detailed_info = _load_json(row['detailed_info'])
+    if detailed_info:
+        detailed_info = dict(detailed_info)
+        # 處理 detailedInfo 的 cta_text → ctaText
+        if 'cta_text' in detailed_info:
+            detailed_info['ctaText'] = detailed_info.pop('cta_text')
+
+    return {
+        "id": row['slug'],
+        "slug": row['slug'],
+        "name": row['name'],
+        "price": row['price'],
+        "description": row['description'],
+        "features": _load_json(row['features']),
+        "badge": row['badge'],
+        "guaranteedPublications": row['guaranteed_publications'],
+        "mediaLogos": _load_json(row['media_logos']),
+        "detailedInfo": detailed_info or None,
+        "audience": row['audience'] or 'crypto',
+    }
+
+
+# 全域實例
+pr_catalog_snapshots = PRCatalogSnapshotStore()
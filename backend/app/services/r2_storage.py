@@ -1,23 +1,97 @@
 """
 Cloudflare R2 存儲服務
+
+boto3 是同步 client，所有網路呼叫都在專用 thread pool 執行，不阻塞 event loop：
+1. ✅ 連線池大小、重試（adaptive）、timeout 可由 Settings 調整
+2. ✅ Semaphore 限制同時進行的 R2 請求數
+3. ✅ upload_many：多個檔案並行上傳，結果依輸入順序回傳
+4. ✅ 檔案物件以 multipart 分段串流上傳，記憶體用量取決於分段大小而不是檔案大小
+5. ✅ Content-addressed：依 SHA-256 決定 key，相同內容只存一份，重複上傳不再送出 PUT
 """
+import asyncio
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+import hashlib
 import logging
-import uuid
+import re
 import mimetypes
-from typing import Optional, List, BinaryIO
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Optional, List, Union
 from datetime import datetime
 
 from ..config import settings
+from ..core.outbound_metrics import outbound_timer
 
 logger = logging.getLogger(__name__)
 
+# 上傳內容：bytes 或可 seek 的檔案物件（例如 SpooledTemporaryFile）
+FileContent = Union[bytes, BinaryIO]
+
+# 超過這個大小才把 hash 計算丟到 thread（小檔案直接算比切換 thread 快）
+HASH_IN_THREAD_THRESHOLD = 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_CONTENT_KEY_PATTERN = re.compile(r"(?:^|/)[0-9a-f]{2}/([0-9a-f]{64})(?:\.[A-Za-z0-9]+)?$")
+
+
+def content_hash(file_content: FileContent) -> str:
+    """
+    SHA-256（hex）
+    
+    bytes 直接計算；檔案物件以固定大小的 chunk 串流讀取，
+    不會在記憶體中另外複製一份完整內容。計算完畢後檔案位置會回到開頭。
+    """
+    if isinstance(file_content, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(file_content).hexdigest()
+    
+    digest = hashlib.sha256()
+    file_content.seek(0)
+    while chunk := file_content.read(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    file_content.seek(0)
+    return digest.hexdigest()
+
+
+def content_size(file_content: FileContent) -> int:
+    """內容大小（檔案物件不讀取內容）"""
+    if isinstance(file_content, (bytes, bytearray, memoryview)):
+        return len(file_content)
+    
+    size = file_content.seek(0, 2)
+    file_content.seek(0)
+    return size
+
+
+def content_hash_from_key(file_key: str) -> Optional[str]:
+    """content-addressed key → SHA-256；其他 key 回傳 None"""
+    match = _CONTENT_KEY_PATTERN.search(file_key)
+    return match.group(1) if match else None
+
 
 class R2StorageService:
     """Cloudflare R2 存儲服務"""
     
     def __init__(self):
         """初始化 R2 客戶端"""
+        # boto3 client 是 thread-safe，多個 worker thread 共用同一個 client（與其連線池）
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.R2_MAX_CONCURRENCY,
+            thread_name_prefix="r2-storage"
+        )
+        self._semaphore = asyncio.Semaphore(settings.R2_MAX_CONCURRENCY)
+        
+        # 已確認存在於 R2 的 content-addressed key（避免重複 HEAD）
+        self._known_keys: set = set()
+        
+        self._transfer_config = TransferConfig(
+            multipart_threshold=settings.R2_MULTIPART_CHUNK_SIZE,
+            multipart_chunksize=settings.R2_MULTIPART_CHUNK_SIZE,
+            max_concurrency=settings.R2_MULTIPART_CONCURRENCY
+        )
+        
         # 檢查必要的環境變數
         if not settings.R2_ACCOUNT_ID or not settings.R2_ACCESS_KEY_ID or not settings.R2_SECRET_ACCESS_KEY:
             logger.warning("⚠️ R2 credentials not set - storage features disabled")
@@ -36,7 +110,14 @@ class R2StorageService:
                 endpoint_url=self.endpoint_url,
                 aws_access_key_id=settings.R2_ACCESS_KEY_ID,
                 aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
-                region_name='auto'
+                region_name='auto',
+                config=Config(
+                    max_pool_connections=settings.R2_MAX_POOL_CONNECTIONS,
+                    retries={'max_attempts': settings.R2_MAX_RETRIES, 'mode': 'adaptive'},
+                    connect_timeout=settings.R2_CONNECT_TIMEOUT,
+                    read_timeout=settings.R2_READ_TIMEOUT,
+                    tcp_keepalive=True
+                )
             )
             logger.info(f"📦 R2 Storage Service initialized - Bucket: {self.bucket_name}")
         except Exception as e:
@@ -44,93 +125,230 @@ class R2StorageService:
             self.enabled = False
             self.s3_client = None
     
-    def upload_file(
+    async def run(self, method: str, **kwargs) -> Any:
+        """
+        在 thread pool 執行任意 S3 client 方法（受並行數上限控制）
+        
+        例如：await r2_storage.run('head_object', Bucket=..., Key=...)
+        """
+        if not self.enabled or not self.s3_client:
+            raise Exception("R2 Storage is not enabled. Please set R2 credentials.")
+        
+        return await self._in_executor(method, partial(getattr(self.s3_client, method), **kwargs))
+    
+    async def _in_executor(self, operation: str, func: Callable[[], Any]) -> Any:
+        """在 thread pool 執行 S3 呼叫（受並行數上限控制，記錄耗時）"""
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            with outbound_timer("r2", operation) as timer:
+                try:
+                    return await loop.run_in_executor(self._executor, func)
+                except ClientError as e:
+                    # 例如 head_object 的 404（exists() 的正常情況）與真正的錯誤分開
+                    timer.outcome = e.response.get('ResponseMetadata', {}).get('HTTPStatusCode') or "error"
+                    raise
+    
+    async def upload_file(
         self,
-        file_content: bytes,
+        file_content: FileContent,
         filename: str,
         folder: str = "uploads",
-        content_type: Optional[str] = None
+        content_type: Optional[str] = None,
+        key: Optional[str] = None,
+        digest: Optional[str] = None
     ) -> dict:
         """
         上傳檔案到 R2
         
+        預設使用 content-addressed key（{R2_CONTENT_PREFIX}/ab/<sha256>.ext）：
+        相同內容的檔案只會存一份，物件已存在時不再上傳。
+        
         如果 R2 未啟用，拋出錯誤
         
         Args:
-            file_content: 檔案二進制內容
+            file_content: 檔案二進制內容，或可 seek 的檔案物件
             filename: 原始檔名
-            folder: 存儲資料夾（例如：blog, pricing, pr-packages）
+            folder: 邏輯資料夾（例如：blog, pricing, pr-packages），記錄在 metadata；
+                    content-addressed key 不含資料夾，不同資料夾的相同檔案共用一個物件
             content_type: MIME 類型（如果不提供會自動偵測）
+            key: 指定 R2 key（例如資料夾的 .keep），不做 content addressing
+            digest: 呼叫端已計算好的 SHA-256（避免重複計算）
         
         Returns:
             dict: {
                 'key': 檔案在 R2 的 key,
                 'url': 公開訪問 URL,
                 'size': 檔案大小,
-                'content_type': MIME 類型
+                'content_type': MIME 類型,
+                'content_hash': SHA-256（指定 key 時為 None）,
+                'deduplicated': 物件已存在、未重新上傳
             }
         """
         if not self.enabled or not self.s3_client:
             raise Exception("R2 Storage is not enabled. Please set R2 credentials.")
         
         try:
-            # 生成唯一的檔名（保留原始副檔名）
-            file_ext = filename.rsplit('.', 1)[-1] if '.' in filename else ''
-            unique_id = str(uuid.uuid4())
-            file_key = f"{folder}/{unique_id}.{file_ext}" if file_ext else f"{folder}/{unique_id}"
+            file_ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+            size = content_size(file_content)
             
             # 偵測 content type
             if not content_type:
                 content_type, _ = mimetypes.guess_type(filename)
                 content_type = content_type or 'application/octet-stream'
             
-            # 上傳到 R2
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=file_key,
-                Body=file_content,
-                ContentType=content_type,
-                Metadata={
+            if key:
+                file_key = key
+            else:
+                if digest is None:
+                    digest = await self.hash_content(file_content)
+                file_key = self.content_key(digest, file_ext)
+            
+            deduplicated = digest is not None and await self.exists(file_key)
+            
+            if not deduplicated:
+                metadata = {
                     'original_filename': filename,
+                    'folder': folder,
                     'uploaded_at': datetime.now().isoformat()
                 }
-            )
-            
-            # 生成公開 URL
-            if self.public_url:
-                public_url = f"https://{self.public_url}/{file_key}"
+                
+                # 上傳到 R2
+                if isinstance(file_content, (bytes, bytearray, memoryview)):
+                    await self.run(
+                        'put_object',
+                        Bucket=self.bucket_name,
+                        Key=file_key,
+                        Body=file_content,
+                        ContentType=content_type,
+                        Metadata=metadata
+                    )
+                else:
+                    # 檔案物件：超過 R2_MULTIPART_CHUNK_SIZE 時自動分段上傳（multipart upload），
+                    # 每次只讀取一個分段，失敗時 boto3 會中止（abort）未完成的 multipart upload
+                    file_content.seek(0)
+                    await self.run(
+                        'upload_fileobj',
+                        Fileobj=file_content,
+                        Bucket=self.bucket_name,
+                        Key=file_key,
+                        ExtraArgs={'ContentType': content_type, 'Metadata': metadata},
+                        Config=self._transfer_config
+                    )
+                if digest is not None:
+                    self._known_keys.add(file_key)
+                logger.info(f"✅ File uploaded: {file_key} ({size} bytes)")
             else:
-                # 使用 R2 S3 API URL（需要 bucket 有公開訪問權限）
-                public_url = f"{self.endpoint_url}/{self.bucket_name}/{file_key}"
-            
-            logger.info(f"✅ File uploaded: {file_key} ({len(file_content)} bytes)")
+                logger.info(f"♻️ File already in R2, upload skipped: {file_key}")
             
             return {
                 'key': file_key,
-                'url': public_url,
-                'size': len(file_content),
+                'url': self.get_file_url(file_key),
+                'size': size,
                 'content_type': content_type,
-                'original_filename': filename
+                'original_filename': filename,
+                'content_hash': digest,
+                'deduplicated': deduplicated
             }
             
         except Exception as e:
             logger.error(f"❌ Failed to upload file: {e}")
             raise
     
-    def delete_file(self, file_key: str) -> bool:
+    async def hash_content(self, file_content: FileContent) -> str:
+        """SHA-256（大檔案在 thread 計算，不阻塞 event loop）"""
+        if content_size(file_content) > HASH_IN_THREAD_THRESHOLD:
+            return await asyncio.to_thread(content_hash, file_content)
+        return content_hash(file_content)
+    
+    def content_key(self, digest: str, file_ext: str = '') -> str:
+        """SHA-256 → R2 key（前兩碼分目錄，避免單一 prefix 下物件過多）"""
+        name = f"{digest}.{file_ext}" if file_ext else digest
+        return f"{settings.R2_CONTENT_PREFIX}/{digest[:2]}/{name}"
+    
+    async def exists(self, file_key: str) -> bool:
+        """物件是否存在（確認存在的 key 會被記住）"""
+        if file_key in self._known_keys:
+            return True
+        
+        try:
+            await self.run('head_object', Bucket=self.bucket_name, Key=file_key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+        
+        self._known_keys.add(file_key)
+        return True
+    
+    async def upload_many(
+        self,
+        files: Iterable[Dict[str, Any]],
+        folder: str = "uploads"
+    ) -> List[Union[dict, Exception]]:
+        """
+        並行上傳多個檔案（並行數由 R2_MAX_CONCURRENCY 限制）
+        
+        Args:
+            files: 每個項目為 upload_file 的參數 dict
+                   （file_content, filename，可選 folder, content_type）
+            folder: 項目未指定 folder 時使用
+        
+        Returns:
+            與輸入同順序的結果；失敗的項目為 Exception（不會中斷其他上傳）
+        """
+        tasks = [
+            self.upload_file(**{"folder": folder, **item})
+            for item in files
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        failed = sum(1 for result in results if isinstance(result, Exception))
+        if results:
+            logger.info(f"📦 Batch upload: {len(results) - failed}/{len(results)} files uploaded")
+        return list(results)
+    
+    async def get_file(self, file_key: str) -> bytes:
+        """下載檔案內容（連同讀取 body 都在 thread pool 執行）"""
+        if not self.enabled or not self.s3_client:
+            raise Exception("R2 Storage is not enabled. Please set R2 credentials.")
+        
+        def read_object() -> bytes:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=file_key)
+            return response['Body'].read()
+        
+        return await self._in_executor('get_object', read_object)
+    
+    async def get_file_range(self, file_key: str, start: int, end: int) -> bytes:
+        """下載檔案的一段內容（HTTP Range，含 end）"""
+        if not self.enabled or not self.s3_client:
+            raise Exception("R2 Storage is not enabled. Please set R2 credentials.")
+        
+        def read_range() -> bytes:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=file_key,
+                Range=f"bytes={start}-{end}"
+            )
+            return response['Body'].read()
+        
+        return await self._in_executor('get_object_range', read_range)
+    
+    async def delete_file(self, file_key: str) -> bool:
         """刪除檔案"""
         try:
-            self.s3_client.delete_object(
+            await self.run(
+                'delete_object',
                 Bucket=self.bucket_name,
                 Key=file_key
             )
+            self._known_keys.discard(file_key)
             logger.info(f"✅ File deleted: {file_key}")
             return True
         except Exception as e:
             logger.error(f"❌ Failed to delete file {file_key}: {e}")
             return False
     
-    def list_files(
+    async def list_files(
         self,
         folder: Optional[str] = None,
         limit: int = 100
@@ -154,20 +372,14 @@ class R2StorageService:
             if folder:
                 params['Prefix'] = f"{folder}/"
             
-            response = self.s3_client.list_objects_v2(**params)
+            response = await self.run('list_objects_v2', **params)
             
             files = []
             if 'Contents' in response:
                 for obj in response['Contents']:
-                    # 生成公開 URL
-                    if self.public_url:
-                        url = f"https://{self.public_url}/{obj['Key']}"
-                    else:
-                        url = f"{self.endpoint_url}/{self.bucket_name}/{obj['Key']}"
-                    
                     files.append({
                         'key': obj['Key'],
-                        'url': url,
+                        'url': self.get_file_url(obj['Key']),
                         'size': obj['Size'],
                         'last_modified': obj['LastModified'].isoformat(),
                         'filename': obj['Key'].split('/')[-1]
@@ -186,6 +398,15 @@ class R2StorageService:
             return f"https://{self.public_url}/{file_key}"
         else:
             return f"{self.endpoint_url}/{self.bucket_name}/{file_key}"
+    
+    def key_from_url(self, url: str) -> Optional[str]:
+        """公開 URL → R2 key（不是本 bucket 的 URL 時回傳 None）"""
+        if not self.enabled:
+            return None
+        prefix = self.get_file_url('')
+        if url.startswith(prefix) and len(url) > len(prefix):
+            return url[len(prefix):].split('?', 1)[0]
+        return None
 
 
 # 全域實例
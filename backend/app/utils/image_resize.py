@@ -0,0 +1,89 @@
+"""
+圖片縮圖運算（在 process pool 執行）
+
+本模組只依賴 Pillow：process pool 使用 spawn 啟動子程序，
+子程序只需 import 這個檔案，不會載入 settings / 資料庫 / R2 client。
+"""
+import io
+from typing import List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageOps
+
+# format → (Pillow format, 副檔名, content-type)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "webp", "image/webp"),
+    "jpeg": ("JPEG", "jpg", "image/jpeg"),
+    "avif": ("AVIF", "avif", "image/avif"),
+}
+
+# (寬, 高, format, 內容)
+RenderedVariant = Tuple[int, int, str, bytes]
+
+
+def probe_size(header: bytes) -> Optional[Tuple[int, int]]:
+    """從檔案開頭的部分內容讀取圖片尺寸（只解析 header；讀不到時回傳 None）"""
+    try:
+        with Image.open(io.BytesIO(header)) as image:
+            return image.size
+    except Exception:
+        return None
+
+
+def render_variants(
+    content: bytes,
+    widths: Sequence[int],
+    formats: Sequence[str],
+    quality: int = 80
+) -> List[RenderedVariant]:
+    """
+    產生縮小版本（只縮小、不放大；動畫圖片不處理）
+
+    Returns:
+        每個 (寬度 × format) 一筆；原圖比所有寬度都小時回傳空 list
+    """
+    with Image.open(io.BytesIO(content)) as image:
+        if getattr(image, "is_animated", False):
+            return []
+
+        src_width, src_height = image.size
+        targets = sorted({w for w in widths if 0 < w < src_width}, reverse=True)
+        if not targets:
+            return []
+
+        # JPEG 可在解碼時直接縮小（draft），大幅減少解碼成本與記憶體
+        image.draft("RGB", (targets[0], round(src_height * targets[0] / src_width)))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+
+        # exif_transpose 可能旋轉 90°，以實際尺寸重新計算
+        src_width, src_height = image.size
+
+        results: List[RenderedVariant] = []
+        current = image
+        for width in targets:
+            if width >= src_width:
+                continue
+            height = max(1, round(src_height * width / src_width))
+            # 由大到小依序縮，每次都從上一個較大的版本縮小，成本較低
+            current = current.resize((width, height), Image.LANCZOS)
+
+            for fmt in formats:
+                pil_format = VARIANT_FORMATS[fmt][0]
+                output = current
+                if pil_format == "JPEG" and output.mode == "RGBA":
+                    # JPEG 不支援透明，鋪白底
+                    background = Image.new("RGB", output.size, (255, 255, 255))
+                    background.paste(output, mask=output.getchannel("A"))
+                    output = background
+
+                buffer = io.BytesIO()
+                save_options = {"quality": quality}
+                if pil_format == "JPEG":
+                    save_options.update(optimize=True, progressive=True)
+                elif pil_format == "WEBP":
+                    save_options.update(method=4)
+                output.save(buffer, pil_format, **save_options)
+                results.append((width, height, fmt, buffer.getvalue()))
+
+        return results
@@ -0,0 +1,103 @@
+"""
+Keyset（cursor）分頁工具
+
+LIMIT/OFFSET 越往後翻越慢（要先掃過前面所有資料），COUNT(*) 也要重跑整個篩選。
+Cursor 模式改用「上一頁最後一筆的 (排序欄位, id)」當起點，配合複合索引，
+每一頁的成本只與 page_size 有關。
+
+Cursor token 對前端是不透明字串（base64url JSON），內含 kind 避免不同列表的 cursor 混用。
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import asyncpg
+from fastapi import HTTPException
+
+CURSOR_VERSION = 1
+
+# total 計算方式：exact = COUNT(*)、estimated = 查詢計畫估計值、none = 不計算
+TOTAL_MODE_PATTERN = "^(exact|estimated|none)$"
+
+
+def resolve_total_mode(total_mode: Optional[str], cursor_mode: bool) -> str:
+    """未指定 total_mode 時：offset 分頁預設 exact；cursor 分頁預設 none（每頁不重跑 COUNT(*)）"""
+    if total_mode:
+        return total_mode
+    return "none" if cursor_mode else "exact"
+
+
+def encode_cursor(kind: str, sort_value: Optional[datetime], row_id: int) -> str:
+    """將最後一筆的 (排序欄位, id) 編碼成 cursor token"""
+    payload = {
+        "v": CURSOR_VERSION,
+        "k": kind,
+        "s": sort_value.isoformat() if sort_value is not None else None,
+        "i": row_id,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, kind: str) -> Tuple[Optional[datetime], int]:
+    """解析 cursor token，格式錯誤或 kind 不符時回 400"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        if payload.get("v") != CURSOR_VERSION or payload.get("k") != kind:
+            raise ValueError("cursor kind mismatch")
+        sort_value = datetime.fromisoformat(payload["s"]) if payload["s"] is not None else None
+        return sort_value, int(payload["i"])
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_condition(
+    sort_column: str,
+    id_column: str,
+    sort_value: Optional[datetime],
+    row_id: int,
+    first_param: int
+) -> Tuple[str, List]:
+    """
+    產生「排在 cursor 之後」的 WHERE 條件（排序為 sort_column DESC NULLS LAST, id DESC）
+
+    回傳 (SQL 條件, 參數)；參數編號從 first_param 開始
+    """
+    if sort_value is None:
+        # 已進入 sort_column 為 NULL 的尾段，只剩 id 可比較
+        return f"({sort_column} IS NULL AND {id_column} < ${first_param})", [row_id]
+
+    # row comparison 可直接使用 (sort_column DESC, id DESC) 複合索引
+    return (
+        f"(({sort_column}, {id_column}) < (${first_param}, ${first_param + 1}) "
+        f"OR {sort_column} IS NULL)",
+        [sort_value, row_id]
+    )
+
+
+async def count_total(
+    conn: asyncpg.Connection,
+    from_clause: str,
+    params: List,
+    mode: str = "exact"
+) -> Optional[int]:
+    """
+    計算符合條件的總筆數
+
+    Args:
+        from_clause: "FROM ... WHERE ..." 片段
+        mode: exact = COUNT(*)；estimated = EXPLAIN 的估計列數（不掃表）；none = 回傳 None
+    """
+    if mode == "none":
+        return None
+
+    if mode == "estimated":
+        plan = await conn.fetchval(f"EXPLAIN (FORMAT JSON) SELECT 1 {from_clause}", *params)
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    return await conn.fetchval(f"SELECT COUNT(*) {from_clause}", *params)
@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
 from typing import Optional
+import hashlib
+import hmac
 from jose import JWTError, jwt
 import bcrypt
 from fastapi import Depends, HTTPException, status
@@ -12,10 +14,12 @@ security = HTTPBearer()
 
 
 # ==================== 密碼處理 ====================
-def hash_password(password: str) -> str:
-    """將明文密碼加密"""
+# 注意：bcrypt 是 CPU 密集運算（每次 100ms 以上），async handler 中請使用
+# services/password_hasher.password_hasher（在 thread pool 執行），不要直接呼叫以下函數
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """將明文密碼加密（rounds 預設為 settings.BCRYPT_ROUNDS）"""
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
@@ -27,6 +31,15 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+def password_needs_rehash(hashed_password: str, rounds: Optional[int] = None) -> bool:
+    """hash 的 cost factor 與目前設定不同時回傳 True（格式：$2b$12$...）"""
+    try:
+        current_rounds = int(hashed_password.split('$')[2])
+    except (IndexError, ValueError):
+        return True
+    return current_rounds != (rounds or settings.BCRYPT_ROUNDS)
+
+
 # ==================== JWT Token ====================
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """創建 Access Token（短期）"""
@@ -80,6 +93,18 @@ def verify_token(token: str) -> TokenData:
         )
 
 
+# ==================== Newsletter 退訂簽章 ====================
+def create_unsubscribe_token(email: str) -> str:
+    """退訂連結的簽章（不設期限，舊郵件中的連結仍可退訂）"""
+    message = f"newsletter-unsubscribe:{email.strip().lower()}".encode('utf-8')
+    return hmac.new(settings.SECRET_KEY.encode('utf-8'), message, hashlib.sha256).hexdigest()
+
+
+def verify_unsubscribe_token(email: str, token: str) -> bool:
+    """驗證退訂連結的簽章"""
+    return hmac.compare_digest(create_unsubscribe_token(email), token)
+
+
 # ==================== 依賴注入：獲取當前用戶 ====================
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
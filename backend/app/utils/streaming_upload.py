@@ -0,0 +1,169 @@
+"""
+串流接收 multipart/form-data 上傳
+
+FastAPI 的 UploadFile 會先把整個 request body 解析完（檔案寫入 spool）才呼叫 endpoint，
+檔案大小只能事後檢查。這裡直接讀 request.stream()，邊收邊處理：
+1. ✅ Content-Length 超過上限時不讀 body 直接拒絕（413）
+2. ✅ 串流過程中超過上限立即中止（413），不再繼續接收
+3. ✅ 副檔名在檔案 part 的 header 收到時就檢查，不合法不必等整個檔案傳完
+4. ✅ 收檔的同時計算 SHA-256，不需要再讀一次檔案
+5. ✅ 檔案寫入 SpooledTemporaryFile（超過 UPLOAD_SPOOL_MAX_MEMORY 轉存磁碟），記憶體用量固定
+"""
+import hashlib
+from tempfile import SpooledTemporaryFile
+from typing import Dict, Iterable, Optional
+
+from fastapi import HTTPException, Request
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from ..config import settings
+
+# multipart boundary / part headers / 文字欄位的額外容許量
+MULTIPART_OVERHEAD = 64 * 1024
+MAX_FIELD_SIZE = 64 * 1024
+
+
+class StreamedUpload:
+    """串流接收完成的上傳（檔案 + 文字欄位）"""
+
+    def __init__(self):
+        self.fields: Dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.file = SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_MAX_MEMORY)
+        self.size = 0
+        self.content_hash: Optional[str] = None
+
+    def close(self):
+        self.file.close()
+
+
+async def receive_upload(
+    request: Request,
+    max_file_size: int,
+    file_field: str = "file",
+    allowed_extensions: Optional[Iterable[str]] = None
+) -> StreamedUpload:
+    """
+    串流讀取 multipart/form-data，回傳檔案（已回到開頭）與其他欄位
+
+    Args:
+        max_file_size: 檔案大小上限（bytes）
+        file_field: 檔案欄位名稱
+        allowed_extensions: 允許的副檔名（例如 {'.jpg', '.png'}），None = 不限制
+
+    Raises:
+        HTTPException: 400（格式錯誤 / 缺少檔案 / 副檔名不支援）、413（檔案太大）
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="需要 multipart/form-data 上傳")
+
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"檔案太大。最大允許大小：{max_file_size / 1024 / 1024}MB"
+    )
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_file_size + MULTIPART_OVERHEAD:
+        raise too_large
+
+    allowed = {ext.lower() for ext in allowed_extensions} if allowed_extensions is not None else None
+    upload = StreamedUpload()
+    digest = hashlib.sha256()
+
+    # 目前 part 的狀態
+    part: Dict[str, object] = {}
+    header_field = bytearray()
+    header_value = bytearray()
+    field_bytes = 0
+
+    def on_part_begin():
+        part.clear()
+        part["headers"] = {}
+        part["data"] = bytearray()
+
+    def on_header_field(data: bytes, start: int, end: int):
+        header_field.extend(data[start:end])
+
+    def on_header_value(data: bytes, start: int, end: int):
+        header_value.extend(data[start:end])
+
+    def on_header_end():
+        part["headers"][bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished():
+        _, options = parse_options_header(part["headers"].get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("utf-8", "replace")
+        part["name"] = name
+
+        if b"filename" not in options:
+            part["is_file"] = False
+            return
+
+        if name != file_field or upload.filename is not None:
+            raise HTTPException(status_code=400, detail="一次只能上傳一個檔案")
+
+        filename = options[b"filename"].decode("utf-8", "replace")
+        ext = f".{filename.rsplit('.', 1)[-1].lower()}" if "." in filename else ""
+        if allowed is not None and ext not in allowed:
+            raise HTTPException(
+                status_code=400,
+                detail=f"不支援的檔案格式。允許的格式：{', '.join(sorted(allowed))}"
+            )
+
+        part["is_file"] = True
+        upload.filename = filename
+        upload.content_type = part["headers"].get(b"content-type", b"").decode("latin-1") or None
+
+    def on_part_data(data: bytes, start: int, end: int):
+        nonlocal field_bytes
+        chunk = data[start:end]
+
+        if part.get("is_file"):
+            upload.size += len(chunk)
+            if upload.size > max_file_size:
+                raise too_large
+            digest.update(chunk)
+            upload.file.write(chunk)
+        else:
+            field_bytes += len(chunk)
+            if field_bytes > MAX_FIELD_SIZE:
+                raise HTTPException(status_code=400, detail="表單欄位太大")
+            part["data"].extend(chunk)
+
+    def on_part_end():
+        if not part.get("is_file"):
+            upload.fields[part.get("name", "")] = part["data"].decode("utf-8", "replace")
+
+    parser = MultipartParser(boundary, callbacks={
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+        parser.finalize()
+    except HTTPException:
+        upload.close()
+        raise
+    except Exception:
+        upload.close()
+        raise HTTPException(status_code=400, detail="無法解析上傳內容")
+
+    if upload.filename is None:
+        upload.close()
+        raise HTTPException(status_code=400, detail="缺少上傳檔案")
+
+    upload.content_hash = digest.hexdigest()
+    upload.file.seek(0)
+    return upload
@@ -0,0 +1,52 @@
+"""
+補建 / 重建 Blog 全文搜尋索引（blog_search_index）
+
+用法：
+    python backfill_blog_search.py            # 只補建缺少索引的文章
+    python backfill_blog_search.py --rebuild  # 重建所有文章
+"""
+import argparse
+import asyncio
+import asyncpg
+import logging
+import os
+from dotenv import load_dotenv
+
+from app.services.blog_search import backfill_search_index
+
+# 載入環境變數
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+
+async def main(rebuild: bool, batch_size: int):
+    database_url = os.getenv("DATABASE_URL", "postgresql://JL@localhost:5432/vortixpr")
+    
+    print(f"🔗 連接資料庫...")
+    print(f"   URL: {database_url[:30]}..." if len(database_url) > 30 else f"   URL: {database_url}")
+    
+    conn = await asyncpg.connect(database_url)
+    
+    try:
+        exists = await conn.fetchval("SELECT to_regclass('blog_search_index') IS NOT NULL")
+        if not exists:
+            print("❌ blog_search_index 不存在，請先啟動一次 API 以建立資料表與 trigger")
+            return
+        
+        print(f"\n🔎 {'重建' if rebuild else '補建'}搜尋索引（每批 {batch_size} 篇）...")
+        processed = await backfill_search_index(conn, batch_size=batch_size, rebuild=rebuild)
+        
+        total = await conn.fetchval("SELECT COUNT(*) FROM blog_search_index")
+        print(f"\n✅ 完成！處理 {processed} 篇文章，索引共 {total} 篇")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="補建 Blog 全文搜尋索引")
+    parser.add_argument("--rebuild", action="store_true", help="重建所有文章的索引")
+    parser.add_argument("--batch-size", type=int, default=200, help="每批處理的文章數")
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.rebuild, args.batch_size))
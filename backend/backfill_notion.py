@@ -0,0 +1,86 @@
+"""
+批次回填 / 對帳 Notion content database → blog_posts
+
+只同步新增或 last_edited_time 有變更的頁面（與 webhook 使用相同的同步 job queue）。
+同步會發布頁面，因此只能回填已上線的 Status（Published / Updated）。
+
+用法：
+    python backfill_notion.py                       # 回填 Published / Updated 的頁面
+    python backfill_notion.py --dry-run             # 只列出需要同步的數量
+    python backfill_notion.py --status Published --concurrency 5
+"""
+import argparse
+import asyncio
+import logging
+from dotenv import load_dotenv
+
+# 載入環境變數（必須在 import app 之前）
+load_dotenv()
+
+from app.config import settings
+from app.core.database import db
+from app.api.blog_admin import run_notion_sync
+from app.services.notion_backfill import notion_backfill, DEFAULT_STATUSES
+from app.services.image_variants import image_variants
+from app.services.notion_gateway import notion_gateway
+from app.services.notion_sync_queue import notion_sync_queue
+
+logging.basicConfig(level=logging.WARNING, format='%(message)s')
+
+
+async def main(args):
+    if not settings.NOTION_DATABASE_ID:
+        print("❌ NOTION_DATABASE_ID 未設定")
+        return
+    
+    print(f"🔗 連接資料庫...")
+    db.database_url = settings.DATABASE_URL
+    await db.connect()
+    
+    # 本 process 也啟動同步 worker（API server 的 worker 也會領取同一批 job；同一頁面不會同時同步）
+    if not args.dry_run:
+        notion_sync_queue.workers = args.concurrency
+        notion_sync_queue.set_handler(run_notion_sync)
+        notion_sync_queue.start()
+    
+    statuses = args.status or list(DEFAULT_STATUSES)
+    print(f"\n🔎 掃描 Notion 資料庫（Status: {', '.join(statuses)}）...")
+    
+    def on_page_done(page_id, result, error):
+        progress = notion_backfill.progress
+        done = progress.synced + progress.failed
+        if error:
+            print(f"   [{done}/{progress.changed}] ❌ {page_id}: {error}")
+        else:
+            print(f"   [{done}/{progress.changed}] ✅ {result.get('_sync_action')}: {result.get('title', page_id)}")
+    
+    try:
+        progress = await notion_backfill.run(
+            statuses=statuses,
+            dry_run=args.dry_run,
+            on_page_done=on_page_done
+        )
+        
+        print(f"\n📊 掃描 {progress.scanned} 頁，需要同步 {progress.changed} 頁")
+        if not args.dry_run:
+            print(f"✅ 完成！成功 {progress.synced} 頁，失敗 {progress.failed} 頁 {progress.actions}")
+    finally:
+        await notion_sync_queue.stop()
+        # 同步時排程的封面縮圖在背景產生，結束前等待完成
+        await image_variants.join()
+        image_variants.shutdown()
+        await notion_gateway.close()
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="批次回填 Notion 資料庫")
+    parser.add_argument("--dry-run", action="store_true", help="只比對，不同步")
+    parser.add_argument("--concurrency", type=int, default=3, help="本 process 的同步 worker 數")
+    parser.add_argument(
+        "--status", action="append", choices=DEFAULT_STATUSES,
+        help="要回填的 Notion Status（可重複指定；只能是已上線的狀態）"
+    )
+    args = parser.parse_args()
+    
+    asyncio.run(main(args))
@@ -0,0 +1,154 @@
+"""
+Email 模板渲染 benchmark（不需要資料庫 / Resend）
+
+比較：
+1. 冷啟動編譯：沒有 bytecode cache vs. 已有 bytecode cache
+2. 每次渲染：原本的 get_template + render（檢查 mtime、不 memo） vs. EmailTemplateRenderer
+3. 群發：渲染一次 + 逐一替換收件人欄位
+
+用法：
+    python benchmark_email_templates.py
+    python benchmark_email_templates.py --iterations 5000 --recipients 50000
+"""
+import argparse
+import tempfile
+import time
+from typing import Callable
+
+from dotenv import load_dotenv
+
+# 載入環境變數（app.config 需要）
+load_dotenv()
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape  # noqa: E402
+
+from app.services.email_service import email_service  # noqa: E402
+from app.services.email_templates import EmailTemplateRenderer, TEMPLATE_DIR  # noqa: E402
+
+CONTEXTS = {
+    'newsletter/welcome.html': {
+        'email': 'subscriber@example.com',
+        'blog_url': 'https://vortixpr.com/blog',
+        'unsubscribe_url': email_service.newsletter_unsubscribe_url('subscriber@example.com'),
+    },
+    'contact/notification.html': {
+        'name': 'John Smith',
+        'email': 'john.smith@example.com',
+        'company': 'Tech Innovations Inc.',
+        'phone': '+1 (555) 123-4567',
+        'message': 'Hi, I am interested in your PR services for our upcoming product launch.',
+        'admin_url': 'https://vortixpr.com/admin',
+    },
+    'invitation/invite.html': {
+        'inviter_name': 'admin',
+        'invitation_url': 'https://vortixpr.com/register?invitation=abc',
+        'role_label': 'User',
+    },
+}
+
+
+
+
+def recipient_context(name: str, context: dict, i: int) -> dict:
+    """第 i 位收件人的 context：改變模板實際引用的收件人欄位（否則 memo 仍會命中）"""
+    email = f"user{i}@example.com"
+    if name == 'newsletter/welcome.html':
+        return {**context, 'email': email, 'unsubscribe_url': email_service.newsletter_unsubscribe_url(email)}
+    if name == 'invitation/invite.html':
+        return {**context, 'invitation_url': f"https://vortixpr.com/register?invitation=token{i}"}
+    return {**context, 'email': email}
+
+
+def timed(label: str, iterations: int, fn: Callable[[int], object]) -> float:
+    """執行 fn(i) iterations 次，印出每次平均時間"""
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(f"   {label:<48} {elapsed / iterations * 1e6:>10.1f} µs/op   ({iterations / elapsed:,.0f} ops/s)")
+    return elapsed
+
+
+def bench_cold_start():
+    print("\n🧊 冷啟動（編譯所有模板）")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        EmailTemplateRenderer(cache_dir=cache_dir).precompile()
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        EmailTemplateRenderer(cache_dir=cache_dir).precompile()
+        warm = time.perf_counter() - start
+
+    print(f"   {'沒有 bytecode cache':<48} {cold * 1e3:>10.2f} ms")
+    print(f"   {'已有 bytecode cache':<48} {warm * 1e3:>10.2f} ms   ({cold / warm:.1f}x)")
+
+
+def bench_render(iterations: int):
+    print(f"\n🔥 每次渲染（{iterations} 次）")
+
+    # 原本的做法：每次 get_template（auto_reload 檢查 mtime）+ 完整渲染
+    baseline_env = Environment(
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
+        autoescape=select_autoescape(['html', 'xml'])
+    )
+    with tempfile.TemporaryDirectory() as cache_dir:
+        renderer = EmailTemplateRenderer(cache_dir=cache_dir)
+        renderer.precompile()
+
+        for name, context in CONTEXTS.items():
+            print(f"   [{name}]")
+            before = timed(
+                "get_template + render",
+                iterations,
+                lambda i: baseline_env.get_template(name).render(**context)
+            )
+            # 收件人不同（memo 無法命中）：只省下 get_template；context 先建好，不計入時間
+            recipients = [recipient_context(name, context, i) for i in range(iterations)]
+            after = timed(
+                "EmailTemplateRenderer（每次不同收件人）",
+                iterations,
+                lambda i: renderer.render(name, **recipients[i])
+            )
+            # context 相同（memo 命中，例如 Admin 預覽 / 歡迎信）
+            memo = timed(
+                "EmailTemplateRenderer（相同 context）",
+                iterations,
+                lambda i: renderer.render(name, **context)
+            )
+            print(f"   → {before / after:.1f}x / {before / memo:.1f}x")
+
+        print(f"   renderer stats: {renderer.stats()}")
+
+
+def bench_campaign(recipients: int):
+    print(f"\n📨 群發（{recipients:,} 位收件人）")
+    content = "<p>" + "Latest PR industry trends and media strategies. " * 40 + "</p>"
+
+    start = time.perf_counter()
+    for i in range(min(recipients, 2000)):
+        email_service.templates.get_template('newsletter/campaign.html').render(
+            subject="Monthly Update", content_html=content,
+            email=f"user{i}@example.com",
+            unsubscribe_url=email_service.newsletter_unsubscribe_url(f"user{i}@example.com")
+        )
+    per_render = (time.perf_counter() - start) / min(recipients, 2000)
+    print(f"   {'每位收件人完整渲染（估計）':<48} {per_render * recipients:>10.2f} s")
+
+    start = time.perf_counter()
+    rendered = email_service.render_campaign("Monthly Update", content)
+    for i in range(recipients):
+        email_service.personalize_campaign(rendered, f"user{i}@example.com")
+    elapsed = time.perf_counter() - start
+    print(f"   {'渲染一次 + 替換收件人欄位':<48} {elapsed:>10.2f} s   ({per_render * recipients / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Email 模板渲染 benchmark")
+    parser.add_argument("--iterations", type=int, default=2000, help="每個模板的渲染次數")
+    parser.add_argument("--recipients", type=int, default=50000, help="群發收件人數")
+    args = parser.parse_args()
+
+    bench_cold_start()
+    bench_render(args.iterations)
+    bench_campaign(args.recipients)
@@ -0,0 +1,64 @@
+"""
+執行 / 查看 schema migration（app/migrations）
+
+API 啟動時也會自動執行；部署流程可先單獨執行，讓 worker 啟動時直接走快速路徑。
+
+用法：
+    python migrate.py           # 套用尚未執行的 migration
+    python migrate.py --status  # 列出各 migration 是否已套用
+"""
+import argparse
+import asyncio
+import asyncpg
+import logging
+import os
+from dotenv import load_dotenv
+
+from app.core.database import _init_connection
+from app.core.migrations import discover_migrations, run_migrations
+
+# 載入環境變數
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+
+async def main(status_only: bool):
+    database_url = os.getenv("DATABASE_URL", "postgresql://JL@localhost:5432/vortixpr")
+    
+    print(f"🔗 連接資料庫...")
+    print(f"   URL: {database_url[:30]}..." if len(database_url) > 30 else f"   URL: {database_url}")
+    
+    conn = await asyncpg.connect(database_url)
+    await _init_connection(conn)  # 與 API 的連線池相同（JSONB codec）
+    
+    try:
+        if not status_only:
+            applied = await run_migrations(conn)
+            print(f"\n✅ 完成！本次套用 {applied} 個 migration")
+        
+        exists = await conn.fetchval("SELECT to_regclass('schema_migrations') IS NOT NULL")
+        records = {}
+        if exists:
+            records = {
+                row['version']: row
+                for row in await conn.fetch("SELECT version, applied_at, duration_ms FROM schema_migrations")
+            }
+        
+        print("\n📋 Migrations：")
+        for migration in discover_migrations():
+            record = records.get(migration.version)
+            if record:
+                print(f"   ✅ {migration.version:04d}_{migration.name}  ({record['applied_at']:%Y-%m-%d %H:%M}, {record['duration_ms']} ms)")
+            else:
+                print(f"   ⏳ {migration.version:04d}_{migration.name}")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="執行 schema migration")
+    parser.add_argument("--status", action="store_true", help="只列出狀態，不執行")
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.status))
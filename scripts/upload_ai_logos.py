@@ -14,6 +14,7 @@ Run from backend dir:
     cd backend && uv run python ../scripts/upload_ai_logos.py
 """
 
+import asyncio
 import json
 import re
 import sys
@@ -192,7 +193,7 @@ def fetch_google_favicon(domain: str) -> tuple[bytes, str] | None:
     return resp.content, "png"
 
 
-def upload_batch(brands: list[tuple[str, str, str]], folder: str) -> dict[str, str]:
+async def upload_batch(brands: list[tuple[str, str, str]], folder: str) -> dict[str, str]:
     results: dict[str, str] = {}
     for display_name, article, fallback_domain in brands:
         print(f"\n[{display_name}]  article={article!r}")
@@ -211,7 +212,7 @@ def upload_batch(brands: list[tuple[str, str, str]], folder: str) -> dict[str, s
             continue
         content, ext = downloaded
         try:
-            uploaded = r2_storage.upload_file(
+            uploaded = await r2_storage.upload_file(
                 file_content=content,
                 filename=f"{slugify(display_name)}.{ext}",
                 folder=folder,
@@ -220,12 +221,12 @@ def upload_batch(brands: list[tuple[str, str, str]], folder: str) -> dict[str, s
             print(f"  ✗ upload failed: {exc}")
             continue
         url = uploaded["url"]
-        print(f"  ✓ {url}")
+        print(f"  ✓ {url}" + ("  (already in R2, upload skipped)" if uploaded["deduplicated"] else ""))
         results[display_name] = url
     return results
 
 
-def main() -> None:
+async def main() -> None:
     if not r2_storage.enabled:
         print("R2 not enabled — check R2_* env vars in backend/.env")
         sys.exit(1)
@@ -233,12 +234,12 @@ def main() -> None:
     print("=" * 60)
     print("AI MEDIA PUBLICATIONS")
     print("=" * 60)
-    media_results = upload_batch(MEDIA_PUBLICATIONS, "ai-media-logos")
+    media_results = await upload_batch(MEDIA_PUBLICATIONS, "ai-media-logos")
 
     print("\n" + "=" * 60)
     print("AI CLIENT BRANDS")
     print("=" * 60)
-    client_results = upload_batch(AI_CLIENT_BRANDS, "ai-clients")
+    client_results = await upload_batch(AI_CLIENT_BRANDS, "ai-clients")
 
     output = {"media": media_results, "clients": client_results}
     output_path = REPO_ROOT / "scripts" / "ai_logo_urls.json"
@@ -249,4 +250,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,4 +1,5 @@
 """One-shot: upload the Vortix horizontal white logo to R2 for use as the AI hero center image."""
+import asyncio
 import sys
 from pathlib import Path
 
@@ -9,9 +10,9 @@ from app.services.r2_storage import r2_storage  # noqa: E402
 
 asset = REPO_ROOT / "frontend/src/assets/VortixLogo White_Horizontal.png"
 content = asset.read_bytes()
-result = r2_storage.upload_file(
+result = asyncio.run(r2_storage.upload_file(
     file_content=content,
     filename="vortix-horizontal-white.png",
     folder="brand",
-)
+))
 print(result["url"])